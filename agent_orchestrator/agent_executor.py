@@ -0,0 +1,123 @@
+import time
+import logging
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeout
+
+logger = logging.getLogger(__name__)
+
+# What to do with an agent that times out or raises:
+#   "placeholder" - return the agent's fallback decision (default)
+#   "omit"        - leave the agent out of the response
+#   "fail"        - raise AgentFailure and fail the whole request
+PARTIAL_RESULT_POLICIES = ("placeholder", "omit", "fail")
+
+
+class AgentFailure(Exception):
+    pass
+
+
+class AgentExecutor:
+    """
+    Runs independent agents concurrently on the same masked text and
+    retrieved context, so a request costs max(agents) instead of sum(agents).
+
+    Each agent has its own timeout and partial-result policy. A timed-out
+    agent keeps running in its worker thread (threads cannot be killed),
+    but the response no longer waits for it.
+    """
+    def __init__(self, agents, timeouts=None, policies=None, default_timeout=5.0,
+                 default_policy="placeholder", max_workers=None):
+        self.agents = dict(agents)
+        self.timeouts = {name: default_timeout for name in self.agents}
+        self.timeouts.update(timeouts or {})
+        self.policies = {name: default_policy for name in self.agents}
+        self.policies.update(policies or {})
+
+        for name, policy in self.policies.items():
+            if policy not in PARTIAL_RESULT_POLICIES:
+                raise ValueError(f"Unknown partial-result policy '{policy}' for agent '{name}'")
+
+        # Headroom for agents still finishing after a timeout
+        self.pool = ThreadPoolExecutor(max_workers=max_workers or 4 * len(self.agents),
+                                       thread_name_prefix="agent")
+
+    def _call(self, name, agent, trace, context):
+        if trace is None:
+            return agent.evaluate(**context)
+        with trace.span(f"agent.{name}"):
+            return agent.evaluate(**context)
+
+    def run(self, trace=None, **context):
+        """
+        Calls agent.evaluate(**context) on every agent in parallel.
+        Returns (results, status): results maps agent name to its decision,
+        status maps agent name to "ok", "timeout" or "error".
+        """
+        start = time.monotonic()
+        futures = {
+            name: self.pool.submit(self._call, name, agent, trace, context)
+            for name, agent in self.agents.items()
+        }
+
+        results, status = {}, {}
+        # Collect in deadline order so one wait never hides another's timeout
+        for name in sorted(futures, key=lambda n: self.timeouts[n]):
+            remaining = max(0.0, start + self.timeouts[name] - time.monotonic())
+            try:
+                results[name] = futures[name].result(timeout=remaining)
+                status[name] = "ok"
+                continue
+            except FutureTimeout:
+                futures[name].cancel()
+                status[name] = "timeout"
+                reason = f"{name} agent did not answer within {self.timeouts[name]}s"
+            except Exception as e:
+                status[name] = "error"
+                reason = f"{name} agent failed: {type(e).__name__}: {e}"
+
+            logger.warning("[AgentExecutor] %s", reason)
+            policy = self.policies[name]
+            if policy == "fail":
+                raise AgentFailure(reason)
+            if policy == "placeholder":
+                results[name] = self.fallback(name, reason)
+
+        return results, status
+
+    def fallback(self, name, reason):
+        agent = self.agents[name]
+        if hasattr(agent, "fallback_decision"):
+            return agent.fallback_decision(reason)
+        return {"status": "UNAVAILABLE", "reason": reason, "confidence": 0.0}
+
+    def shutdown(self):
+        self.pool.shutdown(wait=False, cancel_futures=True)
+
+
+def benchmark():
+    """
+    Three agents of 0.1s, 0.2s and 0.3s plus one 2s agent with a 0.5s timeout:
+    sequential calls would take 2.6s, the executor answers in ~0.5s.
+    """
+    class SleepAgent:
+        def __init__(self, seconds):
+            self.seconds = seconds
+
+        def evaluate(self, request_text, policy_context):
+            time.sleep(self.seconds)
+            return {"status": "OK", "slept": self.seconds}
+
+    agents = {f"agent_{s}": SleepAgent(s) for s in (0.1, 0.2, 0.3, 2.0)}
+    executor = AgentExecutor(agents, timeouts={"agent_2.0": 0.5}, default_timeout=1.0)
+
+    start = time.perf_counter()
+    results, status = executor.run(request_text="test", policy_context=[])
+    elapsed = time.perf_counter() - start
+
+    print(f"Sum of agent latencies: {sum(a.seconds for a in agents.values()):.1f}s")
+    print(f"Concurrent response:    {elapsed:.2f}s  status={status}")
+    executor.shutdown()
+
+
+# --- Self-Test Block ---
+if __name__ == "__main__":
+    benchmark()
@@ -0,0 +1,263 @@
+import os
+import sys
+import json
+import time
+import hashlib
+import tempfile
+import threading
+from urllib.parse import urlparse
+from concurrent.futures import Future, ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+# --- CONFIGURATION ---
+# LLM_BACKEND is "openai" (any OpenAI-compatible server, incl. Ollama's /v1)
+# or "ollama" (native /api/generate). Nothing is configured -> template mode.
+CACHE_DIR = "data/llm_cache"
+OPENAI_HOST = "api.openai.com"
+DEFAULT_MODELS = {"openai": "gpt-4o-mini", "ollama": "llama3"}
+
+
+class LLMError(Exception):
+    pass
+
+
+class LLMClient:
+    """
+    Backend-agnostic LLM client for the orchestrator and agents.
+
+    - One pooled keep-alive HTTP session shared by all threads.
+    - A semaphore caps concurrent requests to the backend.
+    - Identical in-flight prompts are coalesced into a single request.
+    - Completed responses are cached on disk by prompt hash.
+    - stream() yields tokens as the server produces them.
+    """
+    def __init__(self, base_url, model=None, backend="openai", api_key=None, max_concurrency=4,
+                 pool_size=16, timeout=60, cache_dir=CACHE_DIR):
+        if backend not in DEFAULT_MODELS:
+            raise ValueError(f"Unknown LLM backend '{backend}'")
+        self.base_url = base_url.rstrip("/")
+        self.backend = backend
+        self.model = model or DEFAULT_MODELS[backend]
+        self.timeout = timeout
+        self.cache_dir = cache_dir
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size)
+        self.session.mount("http://", adapter)
+        self.session.mount("https://", adapter)
+        if api_key:
+            self.session.headers["Authorization"] = f"Bearer {api_key}"
+
+        self._limiter = threading.BoundedSemaphore(max_concurrency)
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+        self.stats = {"requests": 0, "cache_hits": 0, "coalesced": 0}
+        self._stats_lock = threading.Lock()
+
+    def _count(self, name):
+        with self._stats_lock:
+            self.stats[name] += 1
+
+    @classmethod
+    def from_env(cls):
+        """
+        Builds a client from LLM_BASE_URL / LLM_MODEL / LLM_BACKEND (or
+        LLM_PROVIDER) / LLM_API_KEY, or returns None if no LLM is configured.
+        OpenAI itself is only used when LLM_BACKEND=openai is set explicitly
+        and no LLM_BASE_URL is given; OPENAI_API_KEY is sent to no other host.
+        """
+        backend = os.getenv("LLM_BACKEND") or os.getenv("LLM_PROVIDER")
+        base_url = os.getenv("LLM_BASE_URL")
+        if base_url:
+            api_key = os.getenv("LLM_API_KEY")
+            if urlparse(base_url).hostname == OPENAI_HOST:
+                api_key = api_key or os.getenv("OPENAI_API_KEY")
+        elif backend == "openai" and os.getenv("OPENAI_API_KEY"):
+            base_url, api_key = f"https://{OPENAI_HOST}", os.getenv("OPENAI_API_KEY")
+        else:
+            return None
+        return cls(base_url, model=os.getenv("LLM_MODEL"), backend=backend or "openai", api_key=api_key)
+
+    # --- Cache ---
+
+    def cache_key(self, prompt, system, temperature):
+        payload = json.dumps([self.backend, self.model, system, prompt, temperature])
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    def _cache_path(self, key):
+        return os.path.join(self.cache_dir, key[:2], f"{key}.json")
+
+    def _cache_get(self, key):
+        path = self._cache_path(key)
+        if not os.path.exists(path):
+            return None
+        with open(path, encoding="utf-8") as f:
+            return json.load(f)["text"]
+
+    def _cache_put(self, key, text):
+        path = self._cache_path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), suffix=".tmp")
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump({"model": self.model, "text": text}, f)
+        os.replace(tmp_path, path)
+
+    # --- Requests ---
+
+    def _request(self, prompt, system, temperature, stream):
+        if self.backend == "openai":
+            messages = [{"role": "system", "content": system}] if system else []
+            messages.append({"role": "user", "content": prompt})
+            url = f"{self.base_url}/v1/chat/completions"
+            body = {"model": self.model, "messages": messages,
+                    "temperature": temperature, "stream": stream}
+        else:
+            url = f"{self.base_url}/api/generate"
+            body = {"model": self.model, "prompt": prompt, "stream": stream,
+                    "options": {"temperature": temperature}}
+            if system:
+                body["system"] = system
+
+        response = self.session.post(url, json=body, timeout=self.timeout, stream=stream)
+        if response.status_code != 200:
+            raise LLMError(f"{self.backend} backend returned HTTP {response.status_code}: "
+                           f"{response.text[:200]}")
+        return response
+
+    def _parse_tokens(self, response):
+        for line in response.iter_lines(decode_unicode=True):
+            if not line:
+                continue
+            if self.backend == "openai":
+                if not line.startswith("data:"):
+                    continue
+                data = line[5:].strip()
+                if data == "[DONE]":
+                    return
+                token = json.loads(data)["choices"][0].get("delta", {}).get("content")
+            else:
+                chunk = json.loads(line)
+                if chunk.get("done"):
+                    return
+                token = chunk.get("response")
+            if token:
+                yield token
+
+    def _fetch(self, prompt, system, temperature):
+        with self._limiter:
+            self._count("requests")
+            response = self._request(prompt, system, temperature, stream=False)
+        try:
+            data = response.json()
+            if self.backend == "openai":
+                return data["choices"][0]["message"]["content"]
+            return data["response"]
+        except (ValueError, KeyError, IndexError, TypeError) as e:
+            raise LLMError(f"{self.backend} backend returned a malformed response: {response.text[:200]}") from e
+
+    def complete(self, prompt, system=None, temperature=0.0, use_cache=True):
+        """
+        Returns the full completion text.
+        """
+        key = self.cache_key(prompt, system, temperature)
+        if use_cache:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self._count("cache_hits")
+                return cached
+
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            owner = future is None
+            if owner:
+                future = self._inflight[key] = Future()
+
+        if not owner:
+            self._count("coalesced")
+            return future.result()
+
+        try:
+            text = self._fetch(prompt, system, temperature)
+            if use_cache:
+                self._cache_put(key, text)
+            future.set_result(text)
+            return text
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._inflight_lock:
+                self._inflight.pop(key, None)
+
+    def stream(self, prompt, system=None, temperature=0.0, use_cache=True):
+        """
+        Yields tokens as they arrive. A cached answer is yielded in one piece;
+        a fully streamed answer is written to the cache at the end.
+        """
+        key = self.cache_key(prompt, system, temperature)
+        if use_cache:
+            cached = self._cache_get(key)
+            if cached is not None:
+                self._count("cache_hits")
+                yield cached
+                return
+
+        tokens = []
+        with self._limiter:
+            self._count("requests")
+            response = self._request(prompt, system, temperature, stream=True)
+            with response:
+                for token in self._parse_tokens(response):
+                    tokens.append(token)
+                    yield token
+
+        if use_cache:
+            self._cache_put(key, "".join(tokens))
+
+    def close(self):
+        self.session.close()
+
+
+def benchmark(n_requests=200, n_unique=50, threads=16, backend="openai"):
+    """
+    Runs the client against the local stand-in server: a cold pass with
+    duplicate prompts in flight, then a warm pass served from the disk cache.
+    """
+    from agent_orchestrator.mock_llm_server import start_mock_server
+
+    server, base_url = start_mock_server(latency=0.05, token_delay=0.002)
+    prompts = [f"Summarise policy clause {i % n_unique}" for i in range(n_requests)]
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        client = LLMClient(base_url, backend=backend, max_concurrency=8, cache_dir=cache_dir)
+
+        for label in ("cold", "warm"):
+            before = dict(client.stats)
+            start = time.perf_counter()
+            with ThreadPoolExecutor(max_workers=threads) as pool:
+                list(pool.map(client.complete, prompts))
+            elapsed = time.perf_counter() - start
+            delta = {k: client.stats[k] - before[k] for k in client.stats}
+            print(f"[{label}] {n_requests / elapsed:8.1f} req/s | backend calls {delta['requests']:3d} | "
+                  f"cache hits {delta['cache_hits']:3d} | coalesced {delta['coalesced']:3d}")
+
+        start = time.perf_counter()
+        stream = client.stream("Explain the housing subsidy eligibility rules", use_cache=False)
+        next(stream)
+        first_token = time.perf_counter() - start
+        rest = list(stream)
+        print(f"[stream] first token after {first_token * 1000:.0f} ms, "
+              f"{len(rest) + 1} tokens in {(time.perf_counter() - start) * 1000:.0f} ms")
+
+        print(f"TCP connections opened on the server: {server.connections} "
+              f"for {client.stats['requests']} backend calls")
+        client.close()
+
+    server.shutdown()
+
+
+if __name__ == "__main__":
+    sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+    benchmark(backend=sys.argv[1] if len(sys.argv) > 1 else "openai")
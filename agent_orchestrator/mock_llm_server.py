@@ -0,0 +1,113 @@
+import sys
+import json
+import time
+import threading
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for an OpenAI-compatible (/v1/chat/completions) or Ollama
+# (/api/generate) endpoint, so the LLM client can be exercised offline.
+
+
+def mock_answer(prompt):
+    return f"Mock policy answer for: {prompt.strip()[-80:]}"
+
+
+class MockLLMHandler(BaseHTTPRequestHandler):
+    # HTTP/1.1 so clients can keep connections alive between requests
+    protocol_version = "HTTP/1.1"
+
+    def setup(self):
+        super().setup()
+        with self.server.lock:
+            self.server.connections += 1
+
+    def log_message(self, format, *args):
+        pass
+
+    def _read_json(self):
+        length = int(self.headers.get("Content-Length", 0))
+        return json.loads(self.rfile.read(length) or b"{}")
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def _send_stream(self, content_type, chunks):
+        self.send_response(200)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Transfer-Encoding", "chunked")
+        self.end_headers()
+        for chunk in chunks:
+            data = chunk.encode("utf-8")
+            self.wfile.write(f"{len(data):x}\r\n".encode() + data + b"\r\n")
+            self.wfile.flush()
+            time.sleep(self.server.token_delay)
+        self.wfile.write(b"0\r\n\r\n")
+
+    def do_POST(self):
+        request = self._read_json()
+        with self.server.lock:
+            self.server.requests += 1
+        time.sleep(self.server.latency)
+
+        if self.path == "/v1/chat/completions":
+            prompt = request.get("messages", [{}])[-1].get("content", "")
+            tokens = [word + " " for word in mock_answer(prompt).split()]
+            model = request.get("model", "mock")
+            if request.get("stream"):
+                chunks = [
+                    "data: " + json.dumps({"model": model, "choices": [
+                        {"index": 0, "delta": {"content": token}}]}) + "\n\n"
+                    for token in tokens
+                ] + ["data: [DONE]\n\n"]
+                self._send_stream("text/event-stream", chunks)
+            else:
+                self._send_json({"model": model, "choices": [
+                    {"index": 0, "message": {"role": "assistant", "content": "".join(tokens)},
+                     "finish_reason": "stop"}]})
+
+        elif self.path == "/api/generate":
+            tokens = [word + " " for word in mock_answer(request.get("prompt", "")).split()]
+            model = request.get("model", "mock")
+            if request.get("stream", True):
+                chunks = [json.dumps({"model": model, "response": t, "done": False}) + "\n"
+                          for t in tokens]
+                chunks.append(json.dumps({"model": model, "response": "", "done": True}) + "\n")
+                self._send_stream("application/x-ndjson", chunks)
+            else:
+                self._send_json({"model": model, "response": "".join(tokens), "done": True})
+
+        else:
+            self._send_json({"error": f"Unknown path {self.path}"}, status=404)
+
+
+def start_mock_server(host="127.0.0.1", port=0, latency=0.05, token_delay=0.002):
+    """
+    Starts the server on a background thread. port=0 picks a free port.
+    Returns (server, base_url); call server.shutdown() to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), MockLLMHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.token_delay = token_delay
+    server.lock = threading.Lock()
+    server.connections = 0
+    server.requests = 0
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 11435
+    server, base_url = start_mock_server(port=port)
+    print(f">>> Mock LLM server on {base_url} (OpenAI: /v1/chat/completions, Ollama: /api/generate)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -1,79 +1,147 @@
 import sys
 import json
+import logging
 import datetime
 from specialized_agents.compliance_agent import ComplianceAgent
+from specialized_agents.risk_agent import RiskAgent
 
 # Add parent directory to path so we can import our other modules
 sys.path.append(".")
 
 from data_governance.pii_masking import PIIMasker
+from data_governance.audit_log import AuditLog
 from knowledge_base.vector_store import PolicyKnowledgeBase
+from agent_orchestrator.tracing import Tracer
+from agent_orchestrator.agent_executor import AgentExecutor
+from agent_orchestrator.llm_client import LLMClient, LLMError
+
+# Per-agent time budget (seconds). Agents that miss it answer with their
+# fallback decision instead of holding up the response.
+AGENT_TIMEOUTS = {"compliance": 10.0, "risk": 2.0}
+
+ANSWER_PROMPT = (
+    "You are a government policy assistant. Answer the citizen's request using only "
+    "the policies provided. Cite the policy you rely on and say so if none applies."
+)
+
+# Per-request progress goes through logging (DEBUG) instead of print(),
+# so the hot path does not block on stdout unless debugging is enabled.
+logger = logging.getLogger(__name__)
 
 class AIOrchestrator:
     """
     The 'Brain' of the system [Chapter 4.1].
     Coordinates: User Input -> PII Masking -> Intent Classification -> RAG Search -> Final Answer.
     """
-    def __init__(self):
+    def __init__(self, knowledge_base=None, audit_log=None):
         print(">>> Initializing AI Gov Orchestrator...")
         
         # 1. Initialize the Guardrails (Privacy)
         self.privacy_guard = PIIMasker()
         
         # 2. Initialize the Memory (RAG)
-        self.knowledge_base = PolicyKnowledgeBase()
+        self.knowledge_base = knowledge_base or PolicyKnowledgeBase()
         
         # 3. Log the startup
         self.session_id = str(datetime.datetime.now().timestamp())
 
-        # 4. Initialize the Compliance Agent
-        self.compliance_agent = ComplianceAgent()
+        # 4. Shared LLM client (None -> offline template/mock mode)
+        self.llm = LLMClient.from_env()
+        logger.debug("LLM backend: %s", f"{self.llm.backend} ({self.llm.model})" if self.llm else "template")
+
+        # 5. Initialize the Specialist Agents (run concurrently per request)
+        self.compliance_agent = ComplianceAgent(llm=self.llm, knowledge_base=self.knowledge_base)
+        self.risk_agent = RiskAgent()
+        self.agents = AgentExecutor(
+            {"compliance": self.compliance_agent, "risk": self.risk_agent},
+            timeouts=AGENT_TIMEOUTS
+        )
+
+        # 6. Per-step latency histograms (served by /api/metrics)
+        self.tracer = Tracer()
+
+        # 7. Governance audit trail, written in the background (data/audit/)
+        self.audit_log = audit_log or AuditLog()
 
     def process_request(self, user_input):
         """
         Main pipeline logic.
+        Every step is timed as a span of this request's trace.
         """
-        print(f"\n--- Processing Request: {self.session_id} ---")
+        trace = self.tracer.start_trace()
+        logger.debug("Processing request %s (session %s)", trace.request_id, self.session_id)
 
-        # Step A: PII Masking (Safety First)
-        # We don't want to send real names/phones to the LLM or logs
-        clean_text = self.privacy_guard.mask_text(user_input)
-        print(f"[Privacy] Masked Input: {clean_text}")
+        with trace.span("total"):
+            # Step A: PII Masking (Safety First)
+            # We don't want to send real names/phones to the LLM or logs
+            with trace.span("masking"):
+                clean_text = self.privacy_guard.mask_text(user_input)
+            logger.debug("[Privacy] Masked Input: %s", clean_text)
 
-        # Step B: Policy Retrieval (RAG)
-        # Use the masked text to find relevant laws
-        print("[RAG] Searching for relevant policies...")
-        relevant_policies = self.knowledge_base.query_policy(clean_text)
-        
-        # Extract the text from the search results
-        context_docs = relevant_policies['documents'][0] if relevant_policies['documents'] else []
-        
-        print(f"[RAG] Found {len(context_docs)} relevant policy documents.")
+            # Step B: Policy Retrieval (RAG)
+            # Use the masked text to find relevant laws
+            with trace.span("retrieval"):
+                relevant_policies = self.knowledge_base.query_policy(clean_text)
+
+            # Extract the text from the search results
+            context_docs = relevant_policies['documents'][0] if relevant_policies['documents'] else []
+            context_meta = relevant_policies['metadatas'][0] if relevant_policies.get('metadatas') else []
+            policy_ids = [meta.get('source') for meta in context_meta if meta]
+            logger.debug("[RAG] Found %d relevant policy documents.", len(context_docs))
+
+            # Step C: Delegate to the Specialist Agents
+            # The Orchestrator shouldn't guess; it asks the experts, all at once.
+            with trace.span("agents"):
+                decisions, agent_status = self.agents.run(
+                    trace=trace,
+                    request_text=clean_text,
+                    policy_context=context_docs,
+                    policy_ids=policy_ids
+                )
+
+            # Step D: Audit Trail (queued; the writer thread does the I/O)
+            with trace.span("audit"):
+                self.audit_log.record({
+                    "request_id": trace.request_id,
+                    "session_id": self.session_id,
+                    "masked_input": clean_text,
+                    "policy_ids": policy_ids,
+                    "compliance_decision": decisions.get("compliance"),
+                    "risk_assessment": decisions.get("risk"),
+                    "agent_status": agent_status,
+                })
 
-        # Step C: Delegate to Compliance Agent
-        # The Orchestrator shouldn't guess; it asks the expert.
-        print("[Orchestrator] Delegating to Compliance Agent...")
-        
-        agent_decision = self.compliance_agent.evaluate(
-            request_text=clean_text,
-            policy_context=context_docs
-        )
-        
         return {
+            "request_id": trace.request_id,
             "original_input": user_input,
             "masked_input": clean_text,
             "policies_used": context_docs,
-            "expert_decision": agent_decision
+            "expert_decision": decisions.get("compliance"),
+            "risk_assessment": decisions.get("risk"),
+            "agent_status": agent_status,
+            "timings_ms": trace.timings_ms()
         }
 
     def generate_llm_response(self, user_query, context):
         """
-        MOCK LLM INTERFACE.
-        For now, returns a logic-based response so you can run it offline without API keys.
+        Answers the (masked) query from the retrieved policies.
+        Uses the configured LLM (see LLMClient.from_env); without one, or if the
+        call fails, returns a logic-based response so it runs offline without API keys.
         """
         if not context:
             return "I could not find any specific government policies related to your query."
-        
+
+        if self.llm is not None:
+            policies = "\n\n".join(f"[Policy {i + 1}]\n{doc}" for i, doc in enumerate(context))
+            try:
+                return self.llm.complete(
+                    f"Policies:\n{policies}\n\nCitizen request: {user_query}",
+                    system=ANSWER_PROMPT
+                )
+            except (LLMError, OSError, ValueError, KeyError) as e:
+                # ValueError includes json.JSONDecodeError
+                logger.warning("LLM call failed, using template answer: %s", e)
+
         # Simple template-based response
         return (
             f"Based on the following policies: '{context[0]}', "
@@ -84,6 +152,7 @@ class AIOrchestrator:
 # --- Self-Test Block ---
 if __name__ == "__main__":
     # This allows you to run the orchestrator directly to test it
+    logging.basicConfig(level=logging.DEBUG, format="%(message)s")
     orchestrator = AIOrchestrator()
     
     # Simulate a user
@@ -0,0 +1,358 @@
+import os
+import sys
+import ast
+import json
+import time
+import hashlib
+import subprocess
+import inspect
+import datetime
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from agent_orchestrator.profiling import StageProfile, add_throughput, write_profile_summary
+
+# --- CONFIGURATION ---
+CACHE_FILE = "data/processed/pipeline_cache.json"
+REPORT_FILE = "data/processed/pipeline_run_report.json"
+PROFILE_DIR = "data/processed/profiles"
+
+
+class Stage:
+    """
+    One node of the pipeline DAG.
+    `run` is either a callable, executed in a pool thread, or the path of a
+    script, executed as `python path *args` in its own interpreter. Scripts
+    are not run in-process: runpy swaps the process-wide sys.modules
+    ['__main__'] and sys.argv, which parallel stages would clobber.
+    `items` is an optional callable returning how many items the stage
+    processed (rows, PDFs, ...), used for the throughput column.
+    """
+    def __init__(self, name, run, title=None, inputs=(), outputs=(), after=(), always_run=False,
+                 items=None, args=()):
+        if args and callable(run):
+            raise ValueError(f"Stage '{name}': args only apply to script stages")
+        self.name = name
+        self.run = run
+        self.args = list(args)
+        self.title = title or name
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.after = list(after)
+        self.always_run = always_run
+        self.items = items
+
+    def execute(self, profile_path=None):
+        """
+        Runs the stage. Returns the child's resource usage for a script
+        stage, None for a callable.
+        """
+        if callable(self.run):
+            self.run()
+            return None
+        return run_script(self.run, self.args, profile_path)
+
+    def code_fingerprint(self):
+        if callable(self.run):
+            try:
+                return inspect.getsource(self.run)
+            except (OSError, TypeError):
+                return getattr(self.run, "__qualname__", repr(self.run))
+        return code_digest(self.run) + "".join(f" {arg}" for arg in self.args)
+
+
+def run_script(path, args=(), profile_path=None):
+    """
+    Runs `python path *args` and waits for it. Returns the child's CPU time
+    and peak RSS; a non-zero exit status is turned into a RuntimeError.
+    With profile_path the child runs under cProfile and dumps its stats there.
+    """
+    command = [sys.executable]
+    if profile_path:
+        os.makedirs(os.path.dirname(profile_path), exist_ok=True)
+        command += ["-m", "cProfile", "-o", profile_path]
+    process = subprocess.Popen(command + [path, *args])
+    _, status, usage = os.wait4(process.pid, 0)
+    process.returncode = os.waitstatus_to_exitcode(status)
+    if process.returncode != 0:
+        raise RuntimeError(f"{path} exited with status {process.returncode}")
+    return {"cpu_time_s": round(usage.ru_utime + usage.ru_stime, 4),
+            "peak_rss_mb": round(usage.ru_maxrss / 1024, 1)}   # ru_maxrss is in KiB on Linux
+
+
+def local_imports(path, roots):
+    """
+    Files of the modules that `path` imports (anywhere in the file, including
+    inside functions) which live below one of `roots`, plus the __init__.py
+    of each package on the way. Third-party and stdlib modules are ignored.
+    """
+    with open(path, "rb") as f:
+        tree = ast.parse(f.read(), filename=path)
+
+    modules = []
+    for node in ast.walk(tree):
+        if isinstance(node, ast.Import):
+            modules += [(alias.name, roots) for alias in node.names]
+        elif isinstance(node, ast.ImportFrom):
+            base_roots = roots
+            if node.level:
+                # Relative import: resolved against the importing file
+                base = os.path.dirname(os.path.abspath(path))
+                for _ in range(node.level - 1):
+                    base = os.path.dirname(base)
+                base_roots = [base]
+            if node.module:
+                modules.append((node.module, base_roots))
+            # `from package import module` imports a module, not a name
+            prefix = f"{node.module}." if node.module else ""
+            modules += [(prefix + alias.name, base_roots) for alias in node.names]
+
+    files = set()
+    for name, search in modules:
+        parts = name.split(".")
+        for root in search:
+            for i in range(1, len(parts) + 1):
+                base = os.path.join(root, *parts[:i])
+                for candidate in (base + ".py", os.path.join(base, "__init__.py")):
+                    if os.path.isfile(candidate):
+                        files.add(os.path.abspath(candidate))
+    return files
+
+
+def code_digest(path, roots=None):
+    """
+    Digest of a script and of every local module it imports, transitively,
+    so editing a helper module invalidates the stages whose scripts use it.
+    Modules are looked up from the working directory (the project root)
+    and from the script's own directory. Imports inside functions count
+    too, so the digest errs on the side of rerunning a stage.
+    """
+    roots = roots or [os.getcwd(), os.path.dirname(os.path.abspath(path))]
+    seen = set()
+    pending = [os.path.abspath(path)]
+    while pending:
+        current = pending.pop()
+        if current in seen:
+            continue
+        seen.add(current)
+        pending.extend(local_imports(current, roots) - seen)
+
+    h = hashlib.sha256()
+    for current in sorted(seen):
+        h.update(f"{os.path.relpath(current)}={file_digest(current)}\n".encode())
+    return h.hexdigest()
+
+
+def file_digest(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for block in iter(lambda: f.read(1 << 20), b""):
+            h.update(block)
+    return h.hexdigest()
+
+
+def path_fingerprint(path):
+    """
+    Cheap make-style fingerprint: size and mtime of a file, or of every
+    file below a directory.
+    """
+    if not os.path.exists(path):
+        return "missing"
+    if os.path.isfile(path):
+        st = os.stat(path)
+        return f"{st.st_size}:{st.st_mtime_ns}"
+
+    entries = []
+    for root, _, files in os.walk(path):
+        for name in sorted(files):
+            full = os.path.join(root, name)
+            st = os.stat(full)
+            entries.append(f"{os.path.relpath(full, path)}:{st.st_size}:{st.st_mtime_ns}")
+    return hashlib.sha256("\n".join(sorted(entries)).encode()).hexdigest()
+
+
+class PipelineRunner:
+    """
+    Runs Stage objects in dependency order. Stages whose dependencies are
+    finished run in parallel on a thread pool, and a stage whose code and
+    input fingerprints match the last successful run is skipped.
+    With profile=True every executed stage also gets a cProfile dump.
+    """
+    def __init__(self, stages, cache_file=CACHE_FILE, report_file=REPORT_FILE, max_workers=4,
+                 profile=False, profile_dir=PROFILE_DIR):
+        self.stages = {stage.name: stage for stage in stages}
+        self.cache_file = cache_file
+        self.report_file = report_file
+        self.max_workers = max_workers
+        self.profile = profile
+        self.profile_dir = profile_dir
+        self.previous_report = None
+
+        for stage in stages:
+            unknown = [dep for dep in stage.after if dep not in self.stages]
+            if unknown:
+                raise ValueError(f"Stage '{stage.name}' depends on unknown stages: {unknown}")
+        self._check_acyclic()
+
+    def _check_acyclic(self):
+        state = {}
+
+        def visit(name, path):
+            if state.get(name) == "done":
+                return
+            if state.get(name) == "visiting":
+                raise ValueError(f"Pipeline has a cycle: {' -> '.join(path + [name])}")
+            state[name] = "visiting"
+            for dep in self.stages[name].after:
+                visit(dep, path + [name])
+            state[name] = "done"
+
+        for name in self.stages:
+            visit(name, [])
+
+    def fingerprint(self, stage, fingerprints):
+        # Chaining the upstream fingerprints means a change anywhere
+        # upstream also invalidates stages that declare no input files
+        h = hashlib.sha256()
+        h.update(stage.code_fingerprint().encode())
+        for path in stage.inputs:
+            h.update(f"{path}={path_fingerprint(path)}".encode())
+        for dep in stage.after:
+            h.update(f"{dep}={fingerprints[dep]}".encode())
+        return h.hexdigest()
+
+    def load_cache(self):
+        if os.path.exists(self.cache_file):
+            with open(self.cache_file, encoding="utf-8") as f:
+                return json.load(f)
+        return {}
+
+    def save_cache(self, cache):
+        os.makedirs(os.path.dirname(self.cache_file) or ".", exist_ok=True)
+        tmp_path = self.cache_file + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(cache, f, indent=2)
+        os.replace(tmp_path, self.cache_file)
+
+    def is_up_to_date(self, stage, fingerprint, cache):
+        return (
+            not stage.always_run
+            and cache.get(stage.name) == fingerprint
+            and all(os.path.exists(path) for path in stage.outputs)
+        )
+
+    def _run_stage(self, stage, run_start, profile_dir):
+        record = {"stage": stage.name, "title": stage.title,
+                  "start_offset_s": round(time.perf_counter() - run_start, 4)}
+        child_usage = None
+        # A script is profiled inside its own process, not in this thread
+        script_profile = None
+        if profile_dir and not callable(stage.run):
+            script_profile = os.path.join(profile_dir, f"{stage.name}.prof")
+        with StageProfile(stage.name, None if script_profile else profile_dir) as profile:
+            try:
+                child_usage = stage.execute(script_profile)
+                record["status"] = "success"
+            except Exception as e:
+                record["status"] = "failed"
+                record["error"] = f"{type(e).__name__}: {e}"
+        record.update(profile.result)
+        if child_usage:
+            # The thread only waited; the work was done by the child process
+            record.update(child_usage)
+        if script_profile and os.path.exists(script_profile):
+            write_profile_summary(script_profile, script_profile[:-len(".prof")] + ".txt")
+            record["profile"] = script_profile
+
+        items = None
+        if stage.items is not None and record["status"] == "success":
+            try:
+                items = stage.items()
+            except Exception:
+                pass
+        return add_throughput(record, items)
+
+    def run(self, force=False):
+        """
+        Executes the DAG and writes the run report. Returns the report dict;
+        report["success"] is False if any stage failed or was blocked.
+        """
+        cache = {} if force else self.load_cache()
+        new_cache = dict(cache)
+        results = {}
+        fingerprints = {}
+        futures = {}
+        run_start = time.perf_counter()
+        started_at = datetime.datetime.now().isoformat(timespec="seconds")
+        profile_dir = None
+        if self.profile:
+            profile_dir = os.path.join(self.profile_dir, started_at.replace(":", "-"))
+
+        def ready(stage):
+            return all(results.get(dep, {}).get("status") in ("success", "skipped")
+                       for dep in stage.after)
+
+        def blocked(stage):
+            return any(results.get(dep, {}).get("status") in ("failed", "blocked")
+                       for dep in stage.after)
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            while True:
+                progressed = False
+                for name, stage in self.stages.items():
+                    if name in results or name in futures.values():
+                        continue
+                    if blocked(stage):
+                        results[name] = {"stage": name, "title": stage.title, "status": "blocked",
+                                         "wall_time_s": 0.0}
+                        print(f"   [Blocked] {stage.title} (an upstream stage failed)")
+                        progressed = True
+                    elif ready(stage):
+                        fingerprint = self.fingerprint(stage, fingerprints)
+                        fingerprints[name] = fingerprint
+                        if self.is_up_to_date(stage, fingerprint, cache):
+                            results[name] = {"stage": name, "title": stage.title, "status": "skipped",
+                                             "wall_time_s": 0.0}
+                            print(f"   [Cached] {stage.title} is up to date, skipping.")
+                        else:
+                            print(f"\n\033[0;36m>>> {stage.title}\033[0m")
+                            futures[pool.submit(self._run_stage, stage, run_start, profile_dir)] = name
+                        progressed = True
+
+                if progressed:
+                    continue
+                if not futures:
+                    break
+
+                done, _ = wait(list(futures), return_when=FIRST_COMPLETED)
+                for future in done:
+                    name = futures.pop(future)
+                    record = future.result()
+                    results[name] = record
+                    if record["status"] == "success":
+                        new_cache[name] = fingerprints[name]
+                    else:
+                        new_cache.pop(name, None)
+                        print(f"\n\033[0;31m❌ {record['title']} failed: {record['error']}\033[0m")
+
+        self.save_cache(new_cache)
+
+        report = {
+            "started_at": started_at,
+            "total_wall_time_s": round(time.perf_counter() - run_start, 4),
+            "success": all(r["status"] in ("success", "skipped") for r in results.values()),
+            "profile_dir": profile_dir,
+            "stages": [results[name] for name in self.stages],
+        }
+        self.write_report(report)
+        return report
+
+    def write_report(self, report):
+        # Keep the last report around so the summary can show regressions
+        if os.path.exists(self.report_file):
+            with open(self.report_file, encoding="utf-8") as f:
+                self.previous_report = json.load(f)
+
+        os.makedirs(os.path.dirname(self.report_file) or ".", exist_ok=True)
+        with open(self.report_file, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2)
+        print(f"   [Report] Run report written to {self.report_file}")
@@ -0,0 +1,171 @@
+import os
+import sys
+import time
+import pstats
+import cProfile
+import threading
+
+try:
+    import resource
+except ImportError:  # Windows
+    resource = None
+
+# How often the RSS sampler looks at the process while a stage runs
+RSS_SAMPLE_INTERVAL = 0.05
+
+
+def current_rss_bytes():
+    """
+    Resident set size of this process. Reads /proc on Linux and falls back
+    to the high-water mark from getrusage elsewhere.
+    """
+    try:
+        with open("/proc/self/statm") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        pass
+    if resource is None:
+        return 0
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # ru_maxrss is in KiB on Linux and in bytes on macOS
+    return peak if sys.platform == "darwin" else peak * 1024
+
+
+class StageProfile:
+    """
+    Context manager that measures one pipeline stage: wall time, CPU time
+    of the running thread, peak RSS while it runs and, in detailed mode,
+    a cProfile dump (.prof plus a readable top-functions .txt).
+
+    Callable stages run in-process and possibly in parallel, so RSS is the
+    peak of the whole process during the stage's window, not the stage
+    alone. Script stages report their own process's figures instead.
+    """
+    def __init__(self, name, profile_dir=None):
+        self.name = name
+        self.profile_dir = profile_dir
+        self.result = {}
+        self._profiler = None
+        self._stop = threading.Event()
+
+    def _sample_rss(self):
+        while not self._stop.wait(RSS_SAMPLE_INTERVAL):
+            self._peak_rss = max(self._peak_rss, current_rss_bytes())
+
+    def __enter__(self):
+        self._peak_rss = current_rss_bytes()
+        self._sampler = threading.Thread(target=self._sample_rss, daemon=True)
+        self._sampler.start()
+
+        if self.profile_dir:
+            self._profiler = cProfile.Profile()
+            try:
+                self._profiler.enable()
+            except ValueError:
+                # Another profiler is already active on this interpreter
+                self._profiler = None
+
+        self._wall_start = time.perf_counter()
+        self._cpu_start = time.thread_time()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        wall = time.perf_counter() - self._wall_start
+        cpu = time.thread_time() - self._cpu_start
+
+        if self._profiler is not None:
+            self._profiler.disable()
+
+        self._stop.set()
+        self._sampler.join()
+        self._peak_rss = max(self._peak_rss, current_rss_bytes())
+
+        self.result = {
+            "wall_time_s": round(wall, 4),
+            "cpu_time_s": round(cpu, 4),
+            "peak_rss_mb": round(self._peak_rss / 2**20, 1),
+        }
+
+        if self._profiler is not None:
+            self.result["profile"] = self._dump_profile()
+
+        return False
+
+    def _dump_profile(self):
+        os.makedirs(self.profile_dir, exist_ok=True)
+        path = os.path.join(self.profile_dir, f"{self.name}.prof")
+        self._profiler.dump_stats(path)
+
+        write_profile_summary(self._profiler, os.path.join(self.profile_dir, f"{self.name}.txt"))
+        return path
+
+
+def write_profile_summary(source, filepath, top=30):
+    """
+    Writes the readable top-functions listing of a cProfile run (a Profile
+    object or the path of a .prof dump).
+    """
+    with open(filepath, "w") as f:
+        pstats.Stats(source, stream=f).sort_stats("cumulative").print_stats(top)
+
+
+def add_throughput(record, items):
+    """
+    Adds the item count and items/second to a stage record.
+    """
+    record["items"] = items
+    if items is not None and record.get("wall_time_s"):
+        record["throughput_per_s"] = round(items / record["wall_time_s"], 2)
+    return record
+
+
+# --- Item counters for Stage(items=...) ---
+
+def count_rows(path, header=True):
+    if not os.path.exists(path):
+        return 0
+    with open(path, "rb") as f:
+        lines = sum(1 for _ in f)
+    return max(lines - (1 if header else 0), 0)
+
+
+def count_files(folder, suffix=""):
+    if not os.path.isdir(folder):
+        return 0
+    return sum(1 for name in os.listdir(folder) if name.lower().endswith(suffix))
+
+
+# --- Human summary ---
+
+def format_summary(report, previous=None):
+    """
+    Renders a run report as a table. When the previous report is given,
+    a 'vs last' column shows the wall-time change per stage so regressions
+    on the same corpus stand out.
+    """
+    previous_times = {}
+    if previous:
+        previous_times = {r["stage"]: r.get("wall_time_s") for r in previous.get("stages", [])
+                          if r.get("status") == "success"}
+
+    lines = [
+        f"   {'Stage':<35} {'Status':<8} {'Wall':>8} {'CPU':>8} {'PeakRSS':>9} "
+        f"{'Items':>7} {'Items/s':>9} {'vs last':>8}"
+    ]
+    for r in report["stages"]:
+        items = r.get("items")
+        throughput = r.get("throughput_per_s")
+        change = ""
+        before = previous_times.get(r["stage"])
+        if r.get("status") == "success" and before:
+            change = f"{(r['wall_time_s'] - before) / before:+.0%}"
+
+        lines.append(
+            f"   {r['title'][:35]:<35} {r['status']:<8} {r['wall_time_s']:>7.2f}s "
+            f"{r.get('cpu_time_s', 0):>7.2f}s {r.get('peak_rss_mb', 0):>7.1f}MB "
+            f"{'' if items is None else items:>7} {'' if throughput is None else throughput:>9} "
+            f"{change:>8}"
+        )
+
+    lines.append(f"   {'Total':<35} {'':<8} {report['total_wall_time_s']:>7.2f}s")
+    return "\n".join(lines)
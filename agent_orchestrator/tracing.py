@@ -0,0 +1,203 @@
+import sys
+import time
+import uuid
+import threading
+
+# Sub-buckets per power of two. 2**5 = 32 gives ~3% relative precision,
+# like an HDR histogram with 1.5 significant digits.
+SUB_BUCKET_BITS = 5
+SUB_BUCKET_COUNT = 1 << SUB_BUCKET_BITS
+
+# Prometheus bucket boundaries: every power of two from ~1µs to ~69s.
+# They coincide with histogram bucket edges, so the counts are exact.
+PROMETHEUS_BOUNDS_NS = [1 << k for k in range(10, 37)]
+PROMETHEUS_QUANTILES = (0.5, 0.9, 0.99, 0.999)
+
+_now_ns = time.perf_counter_ns
+
+
+def bucket_index(value_ns):
+    """
+    Log-linear bucket: exact below 2*SUB_BUCKET_COUNT ns, then
+    SUB_BUCKET_COUNT equal-width buckets per power of two.
+    """
+    if value_ns < 2 * SUB_BUCKET_COUNT:
+        return max(value_ns, 0)
+    shift = value_ns.bit_length() - SUB_BUCKET_BITS - 1
+    return (shift + 1) * SUB_BUCKET_COUNT + (value_ns >> shift) - SUB_BUCKET_COUNT
+
+
+def bucket_bounds(index):
+    """
+    Returns [lower, upper) in nanoseconds for a bucket index.
+    """
+    if index < 2 * SUB_BUCKET_COUNT:
+        return index, index + 1
+    shift = index // SUB_BUCKET_COUNT - 1
+    mantissa = index % SUB_BUCKET_COUNT + SUB_BUCKET_COUNT
+    return mantissa << shift, (mantissa + 1) << shift
+
+
+class LatencyHistogram:
+    """
+    In-process HDR-style latency histogram. Recording is one index
+    computation (bucket_index, inlined) and a locked increment; memory is
+    fixed (~2k counters).
+    """
+    def __init__(self):
+        self.counts = [0] * ((64 - SUB_BUCKET_BITS) * SUB_BUCKET_COUNT)
+        self.total_count = 0
+        self.total_ns = 0
+        self.max_ns = 0
+        self._lock = threading.Lock()
+
+    def record(self, value_ns):
+        if value_ns < 2 * SUB_BUCKET_COUNT:
+            index = max(value_ns, 0)
+        else:
+            shift = value_ns.bit_length() - SUB_BUCKET_BITS - 1
+            index = (shift + 1) * SUB_BUCKET_COUNT + (value_ns >> shift) - SUB_BUCKET_COUNT
+        with self._lock:
+            self.counts[index] += 1
+            self.total_count += 1
+            self.total_ns += value_ns
+            if value_ns > self.max_ns:
+                self.max_ns = value_ns
+
+    def quantile(self, q):
+        """
+        Highest value equivalent to the q-quantile (within bucket precision).
+        """
+        if not self.total_count:
+            return 0
+        rank = max(1, int(q * self.total_count + 0.5))
+        seen = 0
+        for index, count in enumerate(self.counts):
+            seen += count
+            if seen >= rank:
+                return min(bucket_bounds(index)[1] - 1, self.max_ns)
+        return self.max_ns
+
+    def count_below(self, bound_ns):
+        return sum(self.counts[:bucket_index(bound_ns)])
+
+
+class Trace:
+    """
+    Span timings for one request. Use `with trace.span("name"):`.
+    """
+    def __init__(self, tracer, request_id):
+        self.tracer = tracer
+        self.request_id = request_id
+        self.spans_ns = {}
+
+    def span(self, name):
+        return _Span(self, name)
+
+    def timings_ms(self):
+        return {name: round(ns / 1e6, 3) for name, ns in self.spans_ns.items()}
+
+
+class _Span:
+    __slots__ = ("trace", "name", "start")
+
+    def __init__(self, trace, name):
+        self.trace = trace
+        self.name = name
+
+    def __enter__(self):
+        self.start = _now_ns()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        elapsed = _now_ns() - self.start
+        trace = self.trace
+        trace.spans_ns[self.name] = elapsed
+        histogram = trace.tracer.histograms.get(self.name) or trace.tracer.histogram(self.name)
+        histogram.record(elapsed)
+        return False
+
+
+class Tracer:
+    """
+    Hands out per-request traces and keeps one histogram per span name.
+    """
+    def __init__(self, namespace="aigov_orchestrator"):
+        self.namespace = namespace
+        self.histograms = {}
+        self.requests_total = 0
+        self._lock = threading.Lock()
+
+    def start_trace(self, request_id=None):
+        with self._lock:
+            self.requests_total += 1
+        return Trace(self, request_id or uuid.uuid4().hex)
+
+    def histogram(self, name):
+        histogram = self.histograms.get(name)
+        if histogram is None:
+            with self._lock:
+                histogram = self.histograms.setdefault(name, LatencyHistogram())
+        return histogram
+
+    def render_prometheus(self):
+        """
+        Prometheus text exposition (format 0.0.4): one histogram family
+        with a `span` label, plus pre-computed quantiles as gauges.
+        """
+        name = f"{self.namespace}_span_duration_seconds"
+        lines = [
+            f"# HELP {self.namespace}_requests_total Requests traced by the orchestrator.",
+            f"# TYPE {self.namespace}_requests_total counter",
+            f"{self.namespace}_requests_total {self.requests_total}",
+            f"# HELP {name} Latency of each orchestrator step.",
+            f"# TYPE {name} histogram",
+        ]
+        for span, histogram in sorted(self.histograms.items()):
+            for bound in PROMETHEUS_BOUNDS_NS:
+                lines.append(f'{name}_bucket{{span="{span}",le="{bound / 1e9:.9g}"}} '
+                             f'{histogram.count_below(bound)}')
+            lines.append(f'{name}_bucket{{span="{span}",le="+Inf"}} {histogram.total_count}')
+            lines.append(f'{name}_sum{{span="{span}"}} {histogram.total_ns / 1e9:.9f}')
+            lines.append(f'{name}_count{{span="{span}"}} {histogram.total_count}')
+
+        quantile_name = f"{self.namespace}_span_duration_quantile_seconds"
+        lines.append(f"# HELP {quantile_name} Span latency quantiles from the in-process histogram.")
+        lines.append(f"# TYPE {quantile_name} gauge")
+        for span, histogram in sorted(self.histograms.items()):
+            for q in PROMETHEUS_QUANTILES:
+                lines.append(f'{quantile_name}{{span="{span}",quantile="{q}"}} '
+                             f'{histogram.quantile(q) / 1e9:.9f}')
+
+        return "\n".join(lines) + "\n"
+
+
+def benchmark_span_overhead(n=200_000):
+    """
+    Measures the cost of an empty span (enter, exit, histogram record).
+    """
+    tracer = Tracer()
+    trace = tracer.start_trace()
+
+    start = time.perf_counter_ns()
+    for _ in range(n):
+        with trace.span("noop"):
+            pass
+    per_span = (time.perf_counter_ns() - start) / n
+
+    print(f"Span overhead: {per_span:.0f} ns/span over {n:,} spans "
+          f"(p99 recorded span: {tracer.histogram('noop').quantile(0.99)} ns)")
+    return per_span
+
+
+# --- Self-Test Block ---
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark_span_overhead()
+    else:
+        tracer = Tracer()
+        for ms in (1, 2, 5, 20):
+            trace = tracer.start_trace()
+            with trace.span("sleep"):
+                time.sleep(ms / 1000)
+        print(tracer.render_prometheus())
@@ -0,0 +1,306 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+The audit_log.py module keeps the governance record of every orchestrator
+decision (masked input, retrieved policy IDs, compliance decision) off the
+request's hot path. record() only appends to a bounded in-memory buffer; a
+background thread drains it in batches into append-only, gzip-compressed
+JSONL segments, rotated by size and age and fsynced at most once per
+FSYNC_INTERVAL rather than once per record.
+
+When the buffer is full, the policy decides what gives:
+    drop_oldest  keep the newest records (default; never blocks a request)
+    drop_newest  keep the oldest records
+    block        wait up to BLOCK_TIMEOUT for the writer, then drop the record
+Dropped records are counted in AuditLog.stats, so a gap in the trail is visible.
+"""
+
+import os
+import sys
+import json
+import time
+import zlib
+import gzip
+import glob
+import atexit
+import logging
+import argparse
+import datetime
+import tempfile
+import threading
+from collections import deque
+
+
+# --- CONFIGURATION ---
+AUDIT_DIR = os.getenv("AUDIT_LOG_DIR", "data/audit")
+FULL_POLICY = os.getenv("AUDIT_LOG_POLICY", "drop_oldest")
+POLICIES = ("drop_oldest", "drop_newest", "block")
+CAPACITY = 10_000               # records held in memory
+BATCH_SIZE = 512                # records per write
+FLUSH_INTERVAL = 0.25           # seconds a record may wait for a batch to fill
+FSYNC_INTERVAL = 1.0            # seconds between fsyncs (the durability window)
+BLOCK_TIMEOUT = 0.05            # seconds the "block" policy waits for space
+SEGMENT_BYTES = 64 * 1024 ** 2  # uncompressed bytes per segment
+SEGMENT_SECONDS = 3600          # age at which a segment is closed
+
+logger = logging.getLogger(__name__)
+
+
+class AuditLog:
+    """
+    Bounded ring buffer drained by a background batch writer.
+    """
+    def __init__(self, directory=AUDIT_DIR, capacity=CAPACITY, policy=FULL_POLICY, batch_size=BATCH_SIZE,
+                 flush_interval=FLUSH_INTERVAL, fsync_interval=FSYNC_INTERVAL, segment_bytes=SEGMENT_BYTES,
+                 segment_seconds=SEGMENT_SECONDS, block_timeout=BLOCK_TIMEOUT):
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown audit buffer policy '{policy}' (expected one of {POLICIES})")
+        self.directory = directory
+        self.capacity = capacity
+        self.policy = policy
+        self.batch_size = min(batch_size, capacity)
+        self.flush_interval = flush_interval
+        self.fsync_interval = fsync_interval
+        self.segment_bytes = segment_bytes
+        self.segment_seconds = segment_seconds
+        self.block_timeout = block_timeout
+
+        self.buffer = deque()
+        self.cond = threading.Condition()
+        self.closed = False
+        self.stats = {"recorded": 0, "dropped": 0, "written": 0, "batches": 0,
+                       "fsyncs": 0, "segments": 0, "errors": 0}
+
+        self._raw = self._gzip = None
+        self._segment_seq = 0
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+        os.makedirs(directory, exist_ok=True)
+        self.writer = threading.Thread(target=self._run, name="audit-writer", daemon=True)
+        self.writer.start()
+        atexit.register(self.close)
+
+    # --- Hot path ---
+
+    def record(self, event):
+        """
+        Queues one audit event (a JSON-serialisable dict, not mutated
+        afterwards). Returns False if the buffer policy dropped it.
+        """
+        entry = {"ts": time.time(), **event}
+        with self.cond:
+            if self.closed:
+                return False
+            if len(self.buffer) >= self.capacity:
+                if self.policy == "drop_oldest":
+                    self.buffer.popleft()
+                    self.stats["dropped"] += 1
+                else:
+                    if self.policy == "block":
+                        self.cond.wait_for(lambda: len(self.buffer) < self.capacity or self.closed,
+                                           self.block_timeout)
+                    if len(self.buffer) >= self.capacity or self.closed:
+                        self.stats["dropped"] += 1
+                        return False
+            self.buffer.append(entry)
+            self.stats["recorded"] += 1
+            if len(self.buffer) == self.batch_size:
+                self.cond.notify_all()
+        return True
+
+    # --- Writer thread ---
+
+    def _run(self):
+        while True:
+            with self.cond:
+                self.cond.wait_for(lambda: len(self.buffer) >= self.batch_size or self.closed,
+                                   self.flush_interval)
+                batch = list(self.buffer)
+                self.buffer.clear()
+                closing = self.closed
+                # Wake record() callers waiting under the "block" policy
+                self.cond.notify_all()
+
+            if batch:
+                self._write(batch)
+            if closing:
+                self._close_segment()
+                return
+            if self._unsynced and time.monotonic() - self._last_fsync >= self.fsync_interval:
+                self._sync()
+
+    def _write(self, batch):
+        data = "".join(json.dumps(entry, default=str) + "\n" for entry in batch).encode("utf-8")
+        try:
+            if self._gzip is None or self._segment_size + len(data) > self.segment_bytes \
+                    or time.monotonic() - self._segment_opened >= self.segment_seconds:
+                self._close_segment()
+                self._open_segment()
+            self._gzip.write(data)
+            self._segment_size += len(data)
+            self._unsynced = True
+            self.stats["written"] += len(batch)
+            self.stats["batches"] += 1
+        except OSError as e:
+            self.stats["errors"] += 1
+            logger.error("Audit log write failed, %d records lost: %s", len(batch), e)
+
+    def _open_segment(self):
+        stamp = datetime.datetime.now().strftime("%Y%m%d-%H%M%S")
+        self._segment_seq += 1
+        # pid: several API workers can share one audit directory
+        path = os.path.join(self.directory, f"audit-{stamp}-{os.getpid()}-{self._segment_seq:04d}.jsonl.gz")
+        self._raw = open(path, "ab")
+        self._gzip = gzip.GzipFile(fileobj=self._raw, mode="ab")
+        self._segment_size = 0
+        self._segment_opened = time.monotonic()
+        self.stats["segments"] += 1
+
+    def _sync(self):
+        try:
+            # Sync flush: everything written so far decompresses, even if
+            # the process dies before the segment is closed
+            self._gzip.flush(zlib.Z_SYNC_FLUSH)
+            self._raw.flush()
+            os.fsync(self._raw.fileno())
+            self.stats["fsyncs"] += 1
+        except OSError as e:
+            self.stats["errors"] += 1
+            logger.error("Audit log fsync failed: %s", e)
+        self._last_fsync = time.monotonic()
+        self._unsynced = False
+
+    def _close_segment(self):
+        if self._gzip is None:
+            return
+        self._sync()
+        try:
+            self._gzip.close()
+            self._raw.close()
+        except OSError as e:
+            self.stats["errors"] += 1
+            logger.error("Audit log segment close failed: %s", e)
+        self._raw = self._gzip = None
+
+    # --- Control ---
+
+    def close(self, timeout=10):
+        """
+        Drains the buffer, closes the current segment and stops the writer.
+        """
+        with self.cond:
+            if self.closed:
+                return
+            self.closed = True
+            self.cond.notify_all()
+        self.writer.join(timeout)
+
+    def pending(self):
+        return len(self.buffer)
+
+
+def read_segments(directory=AUDIT_DIR):
+    """
+    Yields the audit records of every segment, oldest first. A segment left
+    open by a crashed process is read up to its last flushed batch.
+    """
+    for path in sorted(glob.glob(os.path.join(directory, "audit-*.jsonl.gz")), key=os.path.getmtime):
+        with open(path, "rb") as f:
+            data = f.read()
+        text = b""
+        while data:
+            # One gzip member per append session (wbits=31: gzip header)
+            decompressor = zlib.decompressobj(31)
+            text += decompressor.decompress(data)
+            data = decompressor.unused_data
+            if not decompressor.eof:
+                break
+        for line in text.decode("utf-8", errors="replace").splitlines():
+            try:
+                yield json.loads(line)
+            except json.JSONDecodeError:
+                pass  # partial last line of a crashed segment
+
+
+# -------------------------------
+# Benchmark
+# -------------------------------
+
+def benchmark(rate=5000, seconds=3.0):
+    """
+    Added latency per request: record() on the async log against a
+    synchronous write + fsync per record, then a paced run at `rate`
+    records/s through the async log.
+    """
+    event = {
+        "request_id": "0" * 32,
+        "masked_input": "My name is <PERSON>, phone <PHONE_NUMBER>. I want to apply for a housing subsidy.",
+        "policy_ids": ["Housing_Subsidy_Act_2024.pdf", "Urban_Rental_Support_Policy.pdf"],
+        "decision": {"approved": True, "reason": "Income below threshold", "decided_by": "rules"},
+    }
+
+    def percentiles(samples_ns):
+        samples_ns = sorted(samples_ns)
+        pick = lambda q: samples_ns[min(int(q * len(samples_ns)), len(samples_ns) - 1)] / 1000
+        return f"p50 {pick(0.5):8.1f} µs | p99 {pick(0.99):8.1f} µs | max {samples_ns[-1] / 1000:9.1f} µs"
+
+    with tempfile.TemporaryDirectory() as workdir:
+        n_sync = 500
+        path = os.path.join(workdir, "sync.jsonl")
+        latencies = []
+        with open(path, "a", encoding="utf-8") as f:
+            for _ in range(n_sync):
+                start = time.perf_counter_ns()
+                f.write(json.dumps({"ts": time.time(), **event}) + "\n")
+                f.flush()
+                os.fsync(f.fileno())
+                latencies.append(time.perf_counter_ns() - start)
+        print(f"sync write+fsync     {percentiles(latencies)}  ({n_sync} records)")
+
+        audit = AuditLog(os.path.join(workdir, "burst"))
+        latencies = []
+        for _ in range(20_000):
+            start = time.perf_counter_ns()
+            audit.record(event)
+            latencies.append(time.perf_counter_ns() - start)
+        audit.close()
+        stats = audit.stats
+        print(f"async unpaced burst  {percentiles(latencies)}  (20,000 records, "
+              f"dropped {stats['dropped']}, written {stats['written']}, fsyncs {stats['fsyncs']})")
+
+        audit = AuditLog(os.path.join(workdir, "paced"))
+        latencies = []
+        interval = 1 / rate
+        start_run = next_at = time.perf_counter()
+        while time.perf_counter() - start_run < seconds:
+            start = time.perf_counter_ns()
+            audit.record(event)
+            latencies.append(time.perf_counter_ns() - start)
+            next_at += interval
+            while time.perf_counter() < next_at:
+                pass
+        achieved = len(latencies) / (time.perf_counter() - start_run)
+        audit.close()
+        stats = audit.stats
+        size = sum(os.path.getsize(p) for p in glob.glob(os.path.join(workdir, "paced", "*")))
+        read_back = sum(1 for _ in read_segments(os.path.join(workdir, "paced")))
+        print(f"async {achieved:,.0f} req/s     {percentiles(latencies)}  (dropped {stats['dropped']}, "
+              f"fsyncs {stats['fsyncs']}, {size / len(latencies):.0f} B/record on disk, read back {read_back})")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Asynchronous audit log for orchestrator decisions")
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--rate", type=int, default=5000, help="Records per second in the paced run")
+    parser.add_argument("--tail", type=int, metavar="N", help="Print the last N audit records")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        benchmark(rate=args.rate)
+    elif args.tail:
+        for entry in deque(read_segments(), maxlen=args.tail):
+            print(json.dumps(entry))
+    else:
+        parser.print_help()
+        sys.exit(1)
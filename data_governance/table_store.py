@@ -0,0 +1,215 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+The table_store.py module is the columnar hand-off format between pipeline
+stages. Tables are Arrow IPC files validated against a typed schema per stage
+and read back through a memory map, so later stages only touch the pages
+(and columns) they actually use. Excel is an optional final export only.
+"""
+
+import os
+import sys
+import time
+import tempfile
+
+import numpy as np
+import pandas as pd
+import pyarrow as pa
+import pyarrow.compute as pc
+
+
+# --- CONFIGURATION ---
+PROCESSED_DIR = 'data/processed'
+
+# Typed schema per stage. Listed columns are required and cast to their type;
+# any additional columns are stored with their inferred type.
+STAGES = {
+    'search_results_processed': {
+        'schema': pa.schema([
+            ('title', pa.string()),
+            ('link', pa.string()),
+            ('file_link', pa.string()),
+            ('result_type', pa.string()),
+            ('cited_by_count', pa.int64()),
+            ('publication_info_summary', pa.string()),
+            ('publication', pa.string()),
+            ('match_title', pa.int8()),
+        ]),
+        'legacy_excel': 'search_results_processed.xlsx',
+    },
+    'search_results_concepts': {
+        'schema': pa.schema([
+            ('title', pa.string()),
+            ('concepts', pa.string()),
+        ]),
+        'legacy_excel': 'search_results_processed_concepts_v3.xlsx',
+    },
+}
+
+
+def table_path(stage, folder=PROCESSED_DIR):
+    return os.path.join(folder, f"{stage}.arrow")
+
+
+def to_arrow(df, stage):
+    """
+    Converts a DataFrame to an Arrow table that matches the stage schema.
+    Raises ValueError if a required column is missing or cannot be cast.
+    """
+    schema = STAGES[stage]['schema']
+    table = pa.Table.from_pandas(df, preserve_index=False)
+
+    missing = [name for name in schema.names if name not in table.column_names]
+    if missing:
+        raise ValueError(f"Stage '{stage}' is missing required columns: {missing}")
+
+    for field in schema:
+        i = table.column_names.index(field.name)
+        column = table.column(i)
+        if column.type != field.type:
+            try:
+                column = pc.cast(column, field.type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError) as e:
+                raise ValueError(
+                    f"Stage '{stage}': column '{field.name}' cannot be stored as {field.type} ({e})"
+                )
+        table = table.set_column(i, field, column)
+
+    return table
+
+
+def write_table(df, stage, folder=PROCESSED_DIR):
+    """
+    Writes a stage's output as an uncompressed Arrow IPC file.
+    The file is written next to its target and renamed, so readers never
+    see a partially written table.
+    """
+    table = to_arrow(df, stage)
+    os.makedirs(folder, exist_ok=True)
+    path = table_path(stage, folder)
+
+    fd, tmp_path = tempfile.mkstemp(dir=folder, suffix='.arrow.tmp')
+    os.close(fd)
+    try:
+        with pa.OSFile(tmp_path, 'wb') as sink:
+            with pa.ipc.new_file(sink, table.schema) as writer:
+                writer.write_table(table)
+        os.replace(tmp_path, path)
+    finally:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+
+    return path
+
+
+def read_table(stage, folder=PROCESSED_DIR, columns=None, as_pandas=True):
+    """
+    Memory-maps a stage's Arrow file and returns it as a DataFrame.
+    The DataFrame is a copy of the selected columns; as_pandas=False returns
+    the Arrow table itself, whose buffers point into the memory map.
+    A legacy Excel file (e.g. one still produced by hand) is converted once
+    whenever it is newer than the Arrow file, so later reads take the fast path.
+    """
+    path = table_path(stage, folder)
+    legacy_path = os.path.join(folder, STAGES[stage]['legacy_excel'])
+    has_table = os.path.exists(path)
+
+    if not has_table and not os.path.exists(legacy_path):
+        raise FileNotFoundError(f"No table for stage '{stage}' in {folder}")
+
+    if os.path.exists(legacy_path) and (
+        not has_table or os.path.getmtime(legacy_path) > os.path.getmtime(path)
+    ):
+        print(f"   [TableStore] Converting legacy {legacy_path} -> {path}")
+        write_table(pd.read_excel(legacy_path), stage, folder)
+
+    with pa.memory_map(path, 'r') as source:
+        table = pa.ipc.open_file(source).read_all()
+
+    if columns is not None:
+        table = table.select(columns)
+
+    return table.to_pandas() if as_pandas else table
+
+
+def export_excel(stage, filepath=None, folder=PROCESSED_DIR):
+    """
+    Optional final artifact for people who want to open a stage in Excel.
+    """
+    filepath = filepath or os.path.join(folder, f"{stage}.xlsx")
+    read_table(stage, folder).to_excel(filepath, index=False)
+    print(f"Exported '{stage}' to {filepath}")
+
+    return filepath
+
+
+def benchmark(n_rows=100_000, seed=0):
+    """
+    Compares Excel and Arrow IPC write/read times on a synthetic
+    'search_results_processed' table.
+    """
+    rng = np.random.default_rng(seed)
+    words = np.array(['ai', 'governance', 'public', 'policy', 'risk', 'ethics', 'service'])
+
+    def text(n_words):
+        column = pd.Series(words[rng.integers(0, len(words), n_rows)], dtype=object)
+        for _ in range(n_words - 1):
+            column = column + ' ' + words[rng.integers(0, len(words), n_rows)]
+        return column
+
+    df = pd.DataFrame({
+        'title': text(8),
+        'link': 'https://example.org/' + pd.Series(np.arange(n_rows)).astype(str),
+        'file_link': 'https://example.org/pdf/' + pd.Series(np.arange(n_rows)).astype(str),
+        'result_type': 'Article',
+        'cited_by_count': rng.integers(0, 5000, n_rows),
+        'publication_info_summary': 'A Author - ' + text(3) + ', 2024 - example.org',
+        'publication': text(3),
+        'match_title': rng.integers(0, 2, n_rows),
+    })
+
+    results = {}
+    with tempfile.TemporaryDirectory() as folder:
+        excel_path = os.path.join(folder, 'bench.xlsx')
+
+        start = time.perf_counter()
+        df.to_excel(excel_path, index=False)
+        results['excel_write'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        pd.read_excel(excel_path)
+        results['excel_read'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        write_table(df, 'search_results_processed', folder)
+        results['arrow_write'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        read_table('search_results_processed', folder)
+        results['arrow_read'] = time.perf_counter() - start
+
+        start = time.perf_counter()
+        read_table('search_results_processed', folder, columns=['title'])
+        results['arrow_read_one_column'] = time.perf_counter() - start
+
+        results['excel_size_mb'] = os.path.getsize(excel_path) / 1e6
+        results['arrow_size_mb'] = os.path.getsize(table_path('search_results_processed', folder)) / 1e6
+
+    print(f"Rows: {n_rows:,}")
+    print(f"  Excel : write {results['excel_write']:7.2f}s | read {results['excel_read']:7.2f}s "
+          f"| {results['excel_size_mb']:.1f} MB")
+    print(f"  Arrow : write {results['arrow_write']:7.2f}s | read {results['arrow_read']:7.2f}s "
+          f"| {results['arrow_size_mb']:.1f} MB")
+    print(f"  Arrow single-column read: {results['arrow_read_one_column']:.3f}s")
+
+    return results
+
+
+if __name__ == '__main__':
+    if '--benchmark' in sys.argv:
+        benchmark()
+    elif '--export' in sys.argv:
+        export_excel(sys.argv[sys.argv.index('--export') + 1])
+    else:
+        print("Usage: python data_governance/table_store.py --benchmark | --export <stage>")
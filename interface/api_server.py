@@ -1,6 +1,7 @@
 import sys
 import os
-from flask import Flask, request, jsonify
+import logging
+from flask import Flask, Response, request, jsonify
 from flask_cors import CORS
 
 # Add parent directory to path to find your modules
@@ -8,42 +9,88 @@ sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 from agent_orchestrator.orchestrator import AIOrchestrator
 
-app = Flask(__name__)
-CORS(app)  # Allows your Jekyll site to talk to this Python server
+logger = logging.getLogger(__name__)
 
-# Initialize the Brain once when the server starts
-print(">>> Starting AI Governance Server...")
-brain = AIOrchestrator()
 
-@app.route('/api/submit_request', methods=['POST'])
-def submit_request():
+def create_app(brain):
     """
-    Endpoint for the Citizen Interface [Chapter 3.2].
-    Receives JSON: { "text": "I need a permit..." }
-    Returns JSON: { "decision": ..., "explanation": ... }
+    Builds the Flask app around an orchestrator (the benchmark suite passes
+    one backed by its synthetic corpus).
     """
-    try:
-        data = request.json
-        user_input = data.get("text", "")
-        
-        if not user_input:
-            return jsonify({"error": "No input provided"}), 400
-
-        print(f"\n[API] Received Request: {user_input[:50]}...")
-        
-        # Pass the request to your AI Pipeline
-        result = brain.process_request(user_input)
-        
-        return jsonify(result)
-
-    except Exception as e:
-        print(f"Error: {e}")
-        return jsonify({"error": str(e)}), 500
-
-@app.route('/api/health', methods=['GET'])
-def health_check():
-    return jsonify({"status": "active", "system": "AI-Gov-Framework"})
+    app = Flask(__name__)
+    CORS(app)  # Allows your Jekyll site to talk to this Python server
+
+    @app.route('/api/submit_request', methods=['POST'])
+    def submit_request():
+        """
+        Endpoint for the Citizen Interface [Chapter 3.2].
+        Receives JSON: { "text": "I need a permit..." }
+        Returns JSON: { "decision": ..., "explanation": ... }
+        """
+        try:
+            data = request.json
+            user_input = data.get("text", "")
+
+            if not user_input:
+                return jsonify({"error": "No input provided"}), 400
+
+            logger.debug("[API] Received Request: %s...", user_input[:50])
+
+            # Pass the request to your AI Pipeline
+            result = brain.process_request(user_input)
+
+            return jsonify(result)
+
+        except Exception as e:
+            logger.exception("Request failed")
+            return jsonify({"error": str(e)}), 500
+
+    @app.route('/api/health', methods=['GET'])
+    def health_check():
+        return jsonify({"status": "active", "system": "AI-Gov-Framework"})
+
+    @app.route('/api/metrics', methods=['GET'])
+    def metrics():
+        """
+        Per-step latency histograms in Prometheus text format.
+        """
+        stats = brain.compliance_agent.stats
+        audit = brain.audit_log.stats
+        text = brain.tracer.render_prometheus() + (
+            "# HELP aigov_compliance_decisions_total Compliance decisions by evaluation path.\n"
+            "# TYPE aigov_compliance_decisions_total counter\n"
+            f'aigov_compliance_decisions_total{{path="fast"}} {stats["fast_path"]}\n'
+            f'aigov_compliance_decisions_total{{path="slow"}} {stats["total"] - stats["fast_path"]}\n'
+            "# HELP aigov_compliance_fast_path_ratio Fraction of decisions made by the rule index.\n"
+            "# TYPE aigov_compliance_fast_path_ratio gauge\n"
+            f"aigov_compliance_fast_path_ratio {brain.compliance_agent.fast_path_ratio():.6f}\n"
+            "# HELP aigov_audit_records_total Audit records by outcome.\n"
+            "# TYPE aigov_audit_records_total counter\n"
+            f'aigov_audit_records_total{{outcome="written"}} {audit["written"]}\n'
+            f'aigov_audit_records_total{{outcome="dropped"}} {audit["dropped"]}\n'
+            "# HELP aigov_audit_pending_records Audit records waiting for the background writer.\n"
+            "# TYPE aigov_audit_pending_records gauge\n"
+            f"aigov_audit_pending_records {brain.audit_log.pending()}\n"
+        )
+        return Response(text, mimetype="text/plain; version=0.0.4; charset=utf-8")
+
+    return app
+
+
+def __getattr__(name):
+    # `from interface.api_server import app` (e.g. a WSGI server) builds the
+    # default orchestrator on first use
+    global app
+    if name == "app":
+        print(">>> Starting AI Governance Server...")
+        app = create_app(AIOrchestrator())
+        return app
+    raise AttributeError(name)
+
 
 if __name__ == "__main__":
+    # Initialize the Brain once when the server starts
+    print(">>> Starting AI Governance Server...")
+    app = create_app(AIOrchestrator())
     # Run on port 5000
     app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
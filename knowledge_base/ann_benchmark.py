@@ -0,0 +1,185 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+The ann_benchmark.py module measures what the HNSW settings of the policy
+vector store cost and buy. For each collection size it indexes the same
+embeddings into Chroma under every configuration of a parameter sweep,
+computes the exact top-k with NumPy brute force, and reports recall@k
+against p50/p99 single-query latency (plus build time).
+
+Usage:
+    python knowledge_base/ann_benchmark.py                  # synthetic embeddings
+    python knowledge_base/ann_benchmark.py --sizes 1000 20000 --k 5
+    python knowledge_base/ann_benchmark.py --from-db        # embeddings of the served knowledge base
+"""
+
+import os
+import sys
+import json
+import time
+import argparse
+import itertools
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from knowledge_base.vector_store import DEFAULT_HNSW_CONFIG, hnsw_metadata
+from knowledge_base.index_versions import served_db_path
+
+# --- CONFIGURATION ---
+DB_PATH = "data/chroma_db"
+COLLECTION_NAME = "policy_knowledge_base"   # as written by ingest_policies.py
+DIMENSION = 384                     # all-MiniLM-L6-v2
+SIZES = [1_000, 10_000, 50_000]
+SWEEP = {
+    "M": [8, 16, 32],
+    "construction_ef": [100, 200],
+    "search_ef": [10, 50, 100],
+}
+BATCH_SIZE = 5_000
+
+
+def synthetic_embeddings(n, dim=DIMENSION, n_clusters=50, seed=0, latent_dim=None):
+    """
+    Clustered unit vectors, closer to real sentence embeddings than
+    uniform noise (which makes every ANN index look bad). With latent_dim,
+    the spread inside a cluster lies in a random latent_dim-dimensional
+    subspace, like the low intrinsic dimension of real embeddings.
+    """
+    rng = np.random.default_rng(seed)
+    centers = rng.normal(size=(n_clusters, dim))
+    if latent_dim:
+        basis = rng.normal(size=(latent_dim, dim)) / np.sqrt(latent_dim)
+        noise = rng.normal(size=(n, latent_dim)) @ basis
+    else:
+        noise = rng.normal(size=(n, dim))
+    vectors = centers[rng.integers(0, n_clusters, n)] + 0.35 * noise
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+    return vectors.astype(np.float32)
+
+
+def load_db_embeddings(db_path=DB_PATH, collection_name=COLLECTION_NAME):
+    import chromadb
+
+    client = chromadb.PersistentClient(path=db_path)
+    collection = client.get_collection(collection_name)
+    embeddings = collection.get(include=["embeddings"])["embeddings"]
+    return np.asarray(embeddings, dtype=np.float32)
+
+
+def make_queries(vectors, n_queries, seed=1):
+    """
+    Indexed vectors plus noise on the scale of the data: queries land near
+    stored documents without being in the index themselves.
+    """
+    rng = np.random.default_rng(seed)
+    queries = vectors[rng.integers(0, len(vectors), n_queries)]
+    queries = queries + vectors.std() * rng.normal(size=queries.shape)
+    return queries.astype(np.float32)
+
+
+def exact_top_k(vectors, queries, k, space):
+    """
+    Brute-force ground truth in the same distance space as the index.
+    """
+    if space == "l2":
+        scores = -((queries ** 2).sum(1)[:, None] - 2 * queries @ vectors.T + (vectors ** 2).sum(1)[None, :])
+    elif space == "cosine":
+        v = vectors / np.linalg.norm(vectors, axis=1, keepdims=True)
+        q = queries / np.linalg.norm(queries, axis=1, keepdims=True)
+        scores = q @ v.T
+    else:
+        scores = queries @ vectors.T
+
+    top = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    return [set(row) for row in top]
+
+
+def build_collection(client, name, vectors, config):
+    try:
+        client.delete_collection(name)
+    except Exception:
+        pass
+    collection = client.create_collection(name=name, metadata=hnsw_metadata(config), embedding_function=None)
+
+    start = time.perf_counter()
+    for offset in range(0, len(vectors), BATCH_SIZE):
+        batch = vectors[offset:offset + BATCH_SIZE]
+        collection.add(ids=[str(i) for i in range(offset, offset + len(batch))], embeddings=batch.tolist())
+    return collection, time.perf_counter() - start
+
+
+def measure(collection, queries, truth, k):
+    latencies = []
+    hits = 0
+    for query, expected in zip(queries, truth):
+        start = time.perf_counter()
+        result = collection.query(query_embeddings=[query.tolist()], n_results=k, include=[])
+        latencies.append(time.perf_counter() - start)
+        hits += len(expected & {int(i) for i in result["ids"][0]})
+
+    latencies = np.array(latencies) * 1000
+    return {
+        "recall": hits / (k * len(queries)),
+        "p50_ms": float(np.percentile(latencies, 50)),
+        "p99_ms": float(np.percentile(latencies, 99)),
+    }
+
+
+def sweep_configs(space, sweep=SWEEP):
+    keys = list(sweep)
+    for values in itertools.product(*(sweep[key] for key in keys)):
+        yield dict(DEFAULT_HNSW_CONFIG, space=space, **dict(zip(keys, values)))
+
+
+def run_benchmark(sizes=SIZES, k=10, n_queries=200, space="l2", from_db=False, output=None):
+    import chromadb
+
+    client = chromadb.EphemeralClient()
+    all_vectors = load_db_embeddings(served_db_path(DB_PATH)) if from_db else synthetic_embeddings(max(sizes))
+    results = []
+
+    print(f"{'size':>7} {'M':>3} {'c_ef':>5} {'s_ef':>5} | {'build s':>8} {'recall@' + str(k):>10} "
+          f"{'p50 ms':>7} {'p99 ms':>7}")
+    for size in sizes:
+        if size > len(all_vectors):
+            print(f"Skipping size {size}: only {len(all_vectors)} embeddings available.")
+            continue
+        vectors = all_vectors[:size]
+        queries = make_queries(vectors, n_queries)
+        truth = exact_top_k(vectors, queries, min(k, size), space)
+
+        # HNSW settings are fixed at creation, so every configuration gets its own build
+        for config in sweep_configs(space):
+            collection, build_seconds = build_collection(client, "ann_benchmark", vectors, config)
+            row = {"size": size, **config, "build_s": build_seconds,
+                   **measure(collection, queries, truth, min(k, size))}
+            results.append(row)
+            print(f"{size:>7} {row['M']:>3} {row['construction_ef']:>5} {row['search_ef']:>5} | "
+                  f"{row['build_s']:>8.2f} {row['recall']:>10.3f} {row['p50_ms']:>7.2f} {row['p99_ms']:>7.2f}")
+
+        client.delete_collection("ann_benchmark")
+
+    if output:
+        os.makedirs(os.path.dirname(output) or ".", exist_ok=True)
+        with open(output, "w", encoding="utf-8") as f:
+            json.dump(results, f, indent=2)
+        print(f"✅ Results saved to {output}")
+
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="HNSW recall/latency sweep for the policy vector store")
+    parser.add_argument("--sizes", type=int, nargs="+", default=SIZES)
+    parser.add_argument("--k", type=int, default=10)
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--space", choices=["l2", "cosine", "ip"], default="l2")
+    parser.add_argument("--from-db", action="store_true",
+                        help="Use the embeddings of the served knowledge base (current version, or data/chroma_db)")
+    parser.add_argument("--output", help="Write the results as JSON")
+    args = parser.parse_args()
+
+    run_benchmark(args.sizes, args.k, args.queries, args.space, args.from_db, args.output)
@@ -0,0 +1,339 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+The compressed_vectors.py module adds compressed copies of the snapshot
+vectors (knowledge_base/embedding_snapshot.py) for corpora whose float32
+embeddings no longer fit comfortably in RAM:
+
+    float16  2x smaller, scores computed block by block in float32
+    int8     4x smaller, per-dimension symmetric scale
+    pq       product quantisation: 8-bit codes per sub-vector (16x smaller
+             at 384 dims / 96 sub-vectors), scored with lookup tables
+
+Any index can re-rank its top candidates with the full-precision vectors,
+which stay memory-mapped on disk and are only touched for those rows.
+The compressed codes are written into the snapshot directory and mapped
+read-only like the rest of the snapshot.
+
+Usage:
+    python knowledge_base/compressed_vectors.py --build int8 pq   # after the snapshot export
+    python knowledge_base/compressed_vectors.py --benchmark       # memory / latency / recall
+"""
+
+import os
+import sys
+import time
+import argparse
+import tempfile
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from knowledge_base.embedding_snapshot import EmbeddingSnapshot, SNAPSHOT_DIR, normalize_queries, top_k
+
+# --- CONFIGURATION ---
+COMPRESSIONS = ("float16", "int8", "pq")
+BLOCK_ROWS = 65_536          # rows encoded at a time while building
+SCORE_BLOCK_ROWS = 512       # rows decoded at a time while scoring (stays in L2 cache)
+PQ_SUBVECTORS = 96           # 384 dims -> 4 dims per sub-vector, 96 bytes per vector
+PQ_CENTROIDS = 256           # one byte per sub-vector code
+PQ_TRAIN_SAMPLE = 30_000
+PQ_ITERATIONS = 15
+DEFAULT_RERANK = {"float16": 0, "int8": 0, "pq": 200}
+# File whose presence marks a built index of each kind
+INDEX_FILES = {"float16": "vectors_float16.npy", "int8": "vectors_int8.npy", "pq": "pq_codes.npy"}
+
+# float16 -> float32 through a 256 KB table: faster than astype() here
+_F16_TO_F32 = np.arange(65536, dtype=np.uint16).view(np.float16).astype(np.float32)
+
+
+def save_array(folder, name, array):
+    """
+    Writes folder/name through a temporary file and a rename, so a reader
+    memory-mapping the snapshot sees the old or the new file, never a
+    partial one.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=folder, prefix=f".{name}-")
+    with os.fdopen(fd, "wb") as f:
+        np.save(f, array)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, os.path.join(folder, name))
+
+
+# -------------------------------
+# Scalar quantisation
+# -------------------------------
+
+class ScalarIndex:
+    """
+    float16 or int8 copy of the vectors. Scores are computed block by block,
+    so only SCORE_BLOCK_ROWS rows are decoded to float32 at a time.
+    """
+    def __init__(self, codes, scale=None):
+        self.codes = codes
+        self.scale = scale
+
+    @classmethod
+    def build(cls, vectors, kind):
+        if kind == "float16":
+            return cls(np.asarray(vectors, dtype=np.float16))
+        # Symmetric per-dimension scale: the largest |value| maps to 127
+        scale = np.maximum(np.abs(vectors).max(axis=0), 1e-12).astype(np.float32) / 127
+        codes = np.empty(vectors.shape, dtype=np.int8)
+        for start in range(0, len(vectors), BLOCK_ROWS):
+            block = np.asarray(vectors[start:start + BLOCK_ROWS], dtype=np.float32)
+            codes[start:start + BLOCK_ROWS] = np.clip(np.rint(block / scale), -127, 127)
+        return cls(codes, scale)
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + (self.scale.nbytes if self.scale is not None else 0)
+
+    def scores(self, queries):
+        # Fold the int8 scale into the queries instead of into every row
+        weights = (queries * self.scale if self.scale is not None else queries).T.astype(np.float32)
+        out = np.empty((len(queries), len(self.codes)), dtype=np.float32)
+        for start in range(0, len(self.codes), SCORE_BLOCK_ROWS):
+            block = self.codes[start:start + SCORE_BLOCK_ROWS]
+            if block.dtype == np.float16:
+                block = _F16_TO_F32.take(block.view(np.uint16))
+            else:
+                block = block.astype(np.float32)
+            out[:, start:start + len(block)] = (block @ weights).T
+        return out
+
+    def save(self, folder, kind):
+        # Scale first: the codes file marks the index as built
+        if self.scale is not None:
+            save_array(folder, f"vectors_{kind}_scale.npy", self.scale)
+        save_array(folder, f"vectors_{kind}.npy", self.codes)
+
+    @classmethod
+    def load(cls, folder, kind):
+        codes = np.load(os.path.join(folder, f"vectors_{kind}.npy"), mmap_mode="r")
+        scale_path = os.path.join(folder, f"vectors_{kind}_scale.npy")
+        return cls(codes, np.load(scale_path) if os.path.exists(scale_path) else None)
+
+
+# -------------------------------
+# Product quantisation
+# -------------------------------
+
+def kmeans(x, k, iterations, rng):
+    centroids = x[rng.choice(len(x), k, replace=False)].copy()
+    for _ in range(iterations):
+        distances = (x ** 2).sum(1)[:, None] - 2 * x @ centroids.T + (centroids ** 2).sum(1)[None, :]
+        assign = distances.argmin(axis=1)
+        counts = np.bincount(assign, minlength=k)
+        sums = np.stack([np.bincount(assign, weights=x[:, d], minlength=k) for d in range(x.shape[1])], axis=1)
+        filled = counts > 0
+        centroids[filled] = sums[filled] / counts[filled, None]
+        # Re-seed empty clusters with random points
+        centroids[~filled] = x[rng.choice(len(x), (~filled).sum(), replace=False)]
+    return centroids
+
+
+class PQIndex:
+    """
+    Product quantiser: each vector is split into m sub-vectors and every
+    sub-vector is replaced by the id of its nearest of 256 centroids (or of
+    one centroid per vector, for a corpus of fewer than 256 vectors).
+    A query builds an (m, 256) table of sub-vector dot products once;
+    a row's score is the sum of m table lookups.
+    """
+    def __init__(self, codebooks, codes):
+        self.codebooks = codebooks          # (m, k <= 256, dim / m) float32
+        self.codes = codes                  # (m, n) uint8, one contiguous row per sub-vector
+
+    @classmethod
+    def build(cls, vectors, m=PQ_SUBVECTORS, train_sample=PQ_TRAIN_SAMPLE, iterations=PQ_ITERATIONS, seed=0):
+        n, dim = vectors.shape
+        if not n:
+            raise ValueError("Cannot build a PQ index from an empty snapshot")
+        if dim % m:
+            raise ValueError(f"Dimension {dim} is not divisible into {m} sub-vectors")
+        sub = dim // m
+        rng = np.random.default_rng(seed)
+        sample = np.asarray(vectors[np.sort(rng.choice(n, min(n, train_sample), replace=False))],
+                            dtype=np.float32)
+
+        # k-means cannot pick more distinct centroids than there are vectors
+        k = min(PQ_CENTROIDS, len(sample))
+        codebooks = np.stack([
+            kmeans(sample[:, j * sub:(j + 1) * sub], k, iterations, rng) for j in range(m)
+        ])
+
+        codes = np.empty((m, n), dtype=np.uint8)
+        for start in range(0, n, BLOCK_ROWS):
+            block = np.asarray(vectors[start:start + BLOCK_ROWS], dtype=np.float32)
+            for j in range(m):
+                part = block[:, j * sub:(j + 1) * sub]
+                c = codebooks[j]
+                distances = (c ** 2).sum(1)[None, :] - 2 * part @ c.T
+                codes[j, start:start + len(block)] = distances.argmin(axis=1)
+        return cls(codebooks, codes)
+
+    @property
+    def nbytes(self):
+        return self.codes.nbytes + self.codebooks.nbytes
+
+    def scores(self, queries):
+        m, _, sub = self.codebooks.shape
+        out = np.zeros((len(queries), self.codes.shape[1]), dtype=np.float32)
+        for row, query in enumerate(queries):
+            # (m, 256) lookup table of sub-vector dot products
+            table = np.einsum("mks,ms->mk", self.codebooks, query.reshape(m, sub))
+            for j in range(m):
+                out[row] += table[j].take(self.codes[j])
+        return out
+
+    def save(self, folder, kind="pq"):
+        save_array(folder, "pq_codebooks.npy", self.codebooks)
+        save_array(folder, "pq_codes.npy", self.codes)
+
+    @classmethod
+    def load(cls, folder, kind="pq"):
+        return cls(np.load(os.path.join(folder, "pq_codebooks.npy")),
+                   np.load(os.path.join(folder, "pq_codes.npy"), mmap_mode="r"))
+
+
+INDEX_TYPES = {"float16": ScalarIndex, "int8": ScalarIndex, "pq": PQIndex}
+
+
+def build_index(vectors, kind):
+    if kind == "pq":
+        return PQIndex.build(vectors)
+    return ScalarIndex.build(vectors, kind)
+
+
+# -------------------------------
+# Search over a snapshot
+# -------------------------------
+
+class CompressedSnapshot:
+    """
+    Drop-in for EmbeddingSnapshot.search() that scores with a compressed
+    index and re-ranks the best `rerank` candidates with the full-precision
+    memory-mapped vectors (rerank=0 trusts the compressed scores).
+    """
+    def __init__(self, snapshot, kind, rerank=None, index=None):
+        if kind not in COMPRESSIONS:
+            raise ValueError(f"Unknown compression '{kind}' (expected one of {COMPRESSIONS})")
+        self.snapshot = snapshot
+        self.kind = kind
+        self.rerank = DEFAULT_RERANK[kind] if rerank is None else rerank
+        self.index = index if index is not None else load_index(snapshot.folder, kind)
+
+    def __len__(self):
+        return len(self.snapshot)
+
+    def top_k(self, queries, k):
+        approximate = self.index.scores(queries)
+        if self.rerank <= k:
+            return top_k(approximate, k)
+
+        candidates, _ = top_k(approximate, self.rerank)
+        indices, scores = [], []
+        for query, rows in zip(queries, candidates):
+            # Sorted rows keep the memory-mapped reads in file order
+            rows = np.sort(rows)
+            exact = np.asarray(self.snapshot.embeddings[rows]) @ query
+            best, best_scores = top_k(exact[None, :], k)
+            indices.append(rows[best[0]])
+            scores.append(best_scores[0])
+        return np.array(indices), np.array(scores)
+
+    def search(self, query_embeddings, n_results=2):
+        return self.snapshot.results(*self.top_k(normalize_queries(query_embeddings), n_results))
+
+
+def load_index(folder, kind):
+    try:
+        return INDEX_TYPES[kind].load(folder, kind)
+    except FileNotFoundError:
+        raise FileNotFoundError(f"No {kind} vectors in {folder} "
+                                f"(run knowledge_base/compressed_vectors.py --build {kind})") from None
+
+
+def compressions_in(folder):
+    """
+    Kinds of compressed index already built in a snapshot directory.
+    """
+    return [kind for kind in COMPRESSIONS if os.path.exists(os.path.join(folder, INDEX_FILES[kind]))]
+
+
+def build_compressed(kinds, snapshot_dir=SNAPSHOT_DIR):
+    """
+    Builds compressed indexes into a snapshot directory. export_snapshot()
+    calls this on every export for the kinds in use, so they never go
+    missing when the snapshot is replaced.
+    """
+    snapshot = EmbeddingSnapshot(snapshot_dir)
+    for kind in kinds:
+        start = time.perf_counter()
+        index = build_index(snapshot.embeddings, kind)
+        index.save(snapshot_dir, kind)
+        print(f"✅ {kind}: {index.nbytes / 1e6:.1f} MB (float32: {snapshot.embeddings.nbytes / 1e6:.1f} MB) "
+              f"built in {time.perf_counter() - start:.1f}s")
+
+
+# -------------------------------
+# Benchmark
+# -------------------------------
+
+def benchmark(n=200_000, dim=384, n_queries=100, k=10, latent_dim=64):
+    """
+    Memory, single-query latency and recall@k of every compressed index
+    (with and without re-ranking) against the exact float32 scan.
+    """
+    from knowledge_base.ann_benchmark import synthetic_embeddings, make_queries
+
+    print(f">>> {n:,} x {dim} clustered unit vectors (latent dim {latent_dim}), {n_queries} queries, k={k}")
+    vectors = synthetic_embeddings(n, dim, latent_dim=latent_dim)
+    queries = normalize_queries(make_queries(vectors, n_queries))
+    truth, _ = top_k(queries @ vectors.T, k)
+
+    class Vectors:
+        # Minimal stand-in for EmbeddingSnapshot (only the vectors are needed)
+        embeddings = vectors
+
+    def run(label, nbytes, search):
+        latencies, hits = [], 0
+        for query, expected in zip(queries, truth):
+            start = time.perf_counter()
+            found, _ = search(query[None, :])
+            latencies.append(time.perf_counter() - start)
+            hits += len(set(found[0]) & set(expected))
+        latencies = np.array(latencies) * 1000
+        print(f"{label:<22} {nbytes / 1e6:>9.1f} MB {np.percentile(latencies, 50):>9.2f} "
+              f"{np.percentile(latencies, 99):>9.2f} {hits / (k * n_queries):>10.3f}")
+
+    print(f"{'index':<22} {'memory':>12} {'p50 ms':>9} {'p99 ms':>9} {'recall@' + str(k):>10}")
+    run("float32 (exact)", vectors.nbytes, lambda q: top_k(q @ vectors.T, k))
+
+    for kind in COMPRESSIONS:
+        start = time.perf_counter()
+        index = build_index(vectors, kind)
+        print(f"   [{kind} built in {time.perf_counter() - start:.1f}s]")
+        for rerank in sorted({0, DEFAULT_RERANK[kind], 4 * k}):
+            searcher = CompressedSnapshot(Vectors, kind, rerank=rerank, index=index)
+            label = f"{kind}" + (f" + rerank {rerank}" if rerank else "")
+            run(label, index.nbytes, lambda q: searcher.top_k(q, k))
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compressed vector indexes for the embedding snapshot")
+    parser.add_argument("--build", nargs="+", choices=COMPRESSIONS)
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--size", type=int, default=200_000)
+    parser.add_argument("--latent-dim", type=int, default=64,
+                        help="Intrinsic dimension of the synthetic vectors (0 = isotropic noise)")
+    args = parser.parse_args()
+
+    if args.build:
+        build_compressed(args.build)
+    if args.benchmark:
+        benchmark(n=args.size, latent_dim=args.latent_dim or None)
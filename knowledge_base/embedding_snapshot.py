@@ -0,0 +1,351 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+The embedding_snapshot.py module exports the ingested policy chunks into a
+read-only snapshot that API workers memory-map instead of each opening
+Chroma and loading its HNSW index into private memory:
+
+    embeddings.npy   float32 (n, dim), L2-normalised rows
+    documents.bin    UTF-8 chunk texts, back to back
+    offsets.npy      int64 (n + 1,) byte offsets of each chunk in documents.bin
+    records.json     ids and metadatas
+    manifest.json    count, dimension, source collection, export time
+    vectors_*.npy, pq_*.npy   compressed indexes, if any (compressed_vectors.py)
+
+Pages of a memory-mapped file live in the OS page cache, so every worker
+on the machine shares one copy. Search is an exact, vectorised dot product.
+Each export is a new directory; the snapshot path is a symlink that is
+switched to it atomically, and the previous export is kept for workers
+still opening it.
+
+Usage:
+    python knowledge_base/embedding_snapshot.py               # export the served version (or data/chroma_db)
+    python knowledge_base/embedding_snapshot.py --benchmark   # cold start / RSS vs Chroma
+"""
+
+import os
+import sys
+import json
+import mmap
+import time
+import shutil
+import argparse
+import datetime
+import tempfile
+import subprocess
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# --- CONFIGURATION ---
+DB_PATH = "data/chroma_db"
+COLLECTION_NAME = "policy_knowledge_base"
+SNAPSHOT_DIR = "data/snapshots/policy_embeddings"
+PAGE_SIZE = 5000
+KEEP_SNAPSHOTS = 2          # current + previous (workers may still be opening it)
+
+
+# -------------------------------
+# Export
+# -------------------------------
+
+def export_snapshot(db_path=DB_PATH, collection_name=COLLECTION_NAME, snapshot_dir=SNAPSHOT_DIR,
+                    compressions=None):
+    """
+    Writes the collection to a new versioned directory next to snapshot_dir
+    and then atomically replaces the snapshot_dir symlink with one pointing
+    at it, so readers never see a partial or missing snapshot.
+    Compressed indexes (knowledge_base/compressed_vectors.py) are rebuilt in
+    the same step: `compressions`, or by default the kinds the previous
+    snapshot had plus POLICY_KB_COMPRESSION.
+    """
+    import chromadb
+
+    print(f">>> Exporting '{collection_name}' from {db_path} to {snapshot_dir}...")
+    client = chromadb.PersistentClient(path=db_path)
+    collection = client.get_collection(collection_name)
+    total = collection.count()
+
+    parent = os.path.dirname(os.path.abspath(snapshot_dir))
+    os.makedirs(parent, exist_ok=True)
+    build_dir = tempfile.mkdtemp(dir=parent, prefix=".snapshot-")
+
+    ids, metadatas, offsets = [], [], [0]
+    embeddings = None
+    with open(os.path.join(build_dir, "documents.bin"), "wb") as documents:
+        row = 0
+        while row < total:
+            page = collection.get(include=["embeddings", "documents", "metadatas"],
+                                  limit=PAGE_SIZE, offset=row)
+            if not page["ids"]:
+                break
+            vectors = np.asarray(page["embeddings"], dtype=np.float32)
+            if embeddings is None:
+                embeddings = np.lib.format.open_memmap(os.path.join(build_dir, "embeddings.npy"),
+                                                       mode="w+", dtype=np.float32,
+                                                       shape=(total, vectors.shape[1]))
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            embeddings[row:row + len(vectors)] = vectors / np.maximum(norms, 1e-12)
+
+            for text in page["documents"]:
+                data = (text or "").encode("utf-8")
+                documents.write(data)
+                offsets.append(offsets[-1] + len(data))
+            ids.extend(page["ids"])
+            metadatas.extend(page["metadatas"])
+            row += len(page["ids"])
+
+    if embeddings is None:
+        shutil.rmtree(build_dir)
+        raise ValueError(f"Collection '{collection_name}' is empty; nothing to export")
+    embeddings.flush()
+    del embeddings
+
+    np.save(os.path.join(build_dir, "offsets.npy"), np.asarray(offsets, dtype=np.int64))
+    with open(os.path.join(build_dir, "records.json"), "w", encoding="utf-8") as f:
+        json.dump({"ids": ids, "metadatas": metadatas}, f)
+    with open(os.path.join(build_dir, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump({
+            "count": len(ids),
+            "dimension": int(np.load(os.path.join(build_dir, "embeddings.npy"), mmap_mode="r").shape[1]),
+            "collection": collection_name,
+            "db_path": db_path,
+            "exported_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        }, f, indent=2)
+
+    from knowledge_base.compressed_vectors import build_compressed, compressions_in
+    from knowledge_base.vector_store import KB_COMPRESSION
+
+    if compressions is None:
+        compressions = set(compressions_in(snapshot_dir) if os.path.isdir(snapshot_dir) else [])
+        if KB_COMPRESSION:
+            compressions.add(KB_COMPRESSION)
+    if compressions:
+        build_compressed(sorted(compressions), build_dir)
+
+    # Swap in the new snapshot: complete version directory first, then the link
+    name = os.path.basename(os.path.abspath(snapshot_dir))
+    version = f"{name}-{datetime.datetime.now().strftime('%Y%m%d-%H%M%S-%f')}"
+    os.replace(build_dir, os.path.join(parent, version))
+    if os.path.isdir(snapshot_dir) and not os.path.islink(snapshot_dir):
+        # A plain directory (older export layout) cannot be replaced by a link in one rename
+        shutil.rmtree(snapshot_dir)
+    tmp_link = os.path.join(parent, f".{version}.link")
+    os.symlink(version, tmp_link)
+    os.replace(tmp_link, snapshot_dir)
+    gc_snapshots(parent, name)
+
+    print(f"✅ Snapshot with {len(ids)} chunks saved to {snapshot_dir} -> {version}")
+    return len(ids)
+
+
+def gc_snapshots(parent, name, keep=KEEP_SNAPSHOTS):
+    """
+    Deletes all but the newest `keep` snapshot versions. Workers that
+    already mapped an older one keep their pages until they close it.
+    """
+    current = os.path.realpath(os.path.join(parent, name))
+    versions = sorted(entry for entry in os.listdir(parent)
+                      if entry.startswith(name + "-") and os.path.isdir(os.path.join(parent, entry)))
+    for entry in versions[:-keep]:
+        if os.path.join(parent, entry) != current:
+            shutil.rmtree(os.path.join(parent, entry), ignore_errors=True)
+
+
+# -------------------------------
+# Read side
+# -------------------------------
+
+class EmbeddingSnapshot:
+    """
+    Read-only view of an exported snapshot. Opening it maps the files and
+    reads the small records.json; vectors and texts are paged in on demand.
+    """
+    def __init__(self, snapshot_dir=SNAPSHOT_DIR):
+        # Resolve the link once: every file comes from the same export even if
+        # a new one is swapped in while this one is being opened
+        snapshot_dir = os.path.realpath(snapshot_dir)
+        if not os.path.exists(os.path.join(snapshot_dir, "manifest.json")):
+            raise FileNotFoundError(f"No embedding snapshot in {snapshot_dir} "
+                                    "(run knowledge_base/embedding_snapshot.py after ingestion)")
+        self.folder = snapshot_dir
+        with open(os.path.join(snapshot_dir, "manifest.json"), encoding="utf-8") as f:
+            self.manifest = json.load(f)
+        with open(os.path.join(snapshot_dir, "records.json"), encoding="utf-8") as f:
+            records = json.load(f)
+        self.ids = records["ids"]
+        self.metadatas = records["metadatas"]
+
+        self.embeddings = np.load(os.path.join(snapshot_dir, "embeddings.npy"), mmap_mode="r")
+        self.offsets = np.load(os.path.join(snapshot_dir, "offsets.npy"), mmap_mode="r")
+        with open(os.path.join(snapshot_dir, "documents.bin"), "rb") as f:
+            self._documents = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if self.offsets[-1] else b""
+
+    def __len__(self):
+        return len(self.ids)
+
+    def document(self, i):
+        return self._documents[self.offsets[i]:self.offsets[i + 1]].decode("utf-8")
+
+    def search(self, query_embeddings, n_results=2):
+        """
+        Exact top-k by cosine similarity. Returns a dict shaped like
+        Chroma's query() result; distances are squared L2 between unit
+        vectors (2 - 2 * cosine), as Chroma's default "l2" space reports.
+        """
+        queries = normalize_queries(query_embeddings)
+        return self.results(*top_k(queries @ self.embeddings.T, n_results))
+
+    def results(self, indices, scores):
+        """
+        Chroma-style result dict for rows of (chunk indices, cosine scores).
+        """
+        result = {"ids": [], "documents": [], "metadatas": [], "distances": []}
+        for rows, row_scores in zip(indices, scores):
+            result["ids"].append([self.ids[i] for i in rows])
+            result["documents"].append([self.document(i) for i in rows])
+            result["metadatas"].append([self.metadatas[i] for i in rows])
+            result["distances"].append([float(2 - 2 * score) for score in row_scores])
+        return result
+
+
+def normalize_queries(query_embeddings):
+    queries = np.atleast_2d(np.asarray(query_embeddings, dtype=np.float32))
+    return queries / np.maximum(np.linalg.norm(queries, axis=1, keepdims=True), 1e-12)
+
+
+def top_k(scores, k):
+    """
+    Indices and scores of the k best columns of each row, best first.
+    """
+    k = min(k, scores.shape[1])
+    if k < scores.shape[1]:
+        candidates = np.argpartition(-scores, k - 1, axis=1)[:, :k]
+    else:
+        candidates = np.tile(np.arange(scores.shape[1]), (len(scores), 1))
+    candidate_scores = np.take_along_axis(scores, candidates, axis=1)
+    order = np.argsort(-candidate_scores, axis=1)
+    return np.take_along_axis(candidates, order, axis=1), np.take_along_axis(candidate_scores, order, axis=1)
+
+
+# -------------------------------
+# Benchmark
+# -------------------------------
+
+def rss_breakdown():
+    """
+    (private, shared file-backed) resident memory in MB, from /proc on Linux.
+    Memory-mapped snapshot pages show up as file-backed: one copy for all workers.
+    """
+    fields = {}
+    try:
+        with open("/proc/self/status") as f:
+            for line in f:
+                if line.startswith(("RssAnon:", "RssFile:", "RssShmem:")):
+                    name, value = line.split(":")
+                    fields[name] = int(value.split()[0]) / 1024
+    except OSError:
+        return None, None
+    return round(fields.get("RssAnon", 0), 1), round(fields.get("RssFile", 0), 1)
+
+
+def worker(mode, path, collection_name, n_queries):
+    """
+    One simulated API worker: open the store, answer queries, report
+    time to first answer and memory.
+    """
+    start = time.perf_counter()
+    rng = np.random.default_rng(os.getpid())
+
+    if mode == "chroma":
+        import chromadb
+        collection = chromadb.PersistentClient(path=path).get_collection(collection_name)
+        dim = len(collection.peek(1)["embeddings"][0])
+        query = lambda q: collection.query(query_embeddings=[q.tolist()], n_results=2)
+    else:
+        snapshot = EmbeddingSnapshot(path)
+        dim = snapshot.embeddings.shape[1]
+        query = lambda q: snapshot.search(q, n_results=2)
+
+    query(rng.normal(size=dim).astype(np.float32))
+    cold_start = time.perf_counter() - start
+
+    latencies = []
+    for _ in range(n_queries):
+        q = rng.normal(size=dim).astype(np.float32)
+        t = time.perf_counter()
+        query(q)
+        latencies.append(time.perf_counter() - t)
+
+    anon, file_backed = rss_breakdown()
+    print(json.dumps({
+        "cold_start_s": round(cold_start, 3),
+        "p50_ms": round(float(np.percentile(latencies, 50)) * 1000, 2),
+        "rss_private_mb": anon,
+        "rss_shared_file_mb": file_backed,
+    }))
+
+
+def benchmark(n_chunks=50_000, dim=384, workers=4, n_queries=50):
+    """
+    Builds a synthetic Chroma collection, exports it, then starts the same
+    number of worker processes against each store at once.
+    """
+    import chromadb
+
+    with tempfile.TemporaryDirectory() as workdir:
+        db_path = os.path.join(workdir, "chroma_db")
+        snapshot_dir = os.path.join(workdir, "snapshot")
+
+        print(f">>> Building a {n_chunks:,} x {dim} collection...")
+        rng = np.random.default_rng(0)
+        collection = chromadb.PersistentClient(path=db_path).create_collection(
+            COLLECTION_NAME, embedding_function=None)
+        for offset in range(0, n_chunks, PAGE_SIZE):
+            n = min(PAGE_SIZE, n_chunks - offset)
+            collection.add(ids=[f"chunk_{i}" for i in range(offset, offset + n)],
+                           embeddings=rng.normal(size=(n, dim)).astype(np.float32).tolist(),
+                           documents=[f"Policy clause {i}." for i in range(offset, offset + n)],
+                           metadatas=[{"source": f"policy_{i // 10}.pdf", "chunk_index": i % 10}
+                                      for i in range(offset, offset + n)])
+        del collection
+
+        export_start = time.perf_counter()
+        export_snapshot(db_path, COLLECTION_NAME, snapshot_dir)
+        print(f"   Export took {time.perf_counter() - export_start:.2f}s")
+
+        for mode, path in (("chroma", db_path), ("snapshot", snapshot_dir)):
+            procs = [subprocess.Popen([sys.executable, os.path.abspath(__file__), "--worker", mode, path,
+                                       "--queries", str(n_queries)], stdout=subprocess.PIPE, text=True)
+                     for _ in range(workers)]
+            results = [json.loads(p.communicate()[0].strip().splitlines()[-1]) for p in procs]
+
+            def mean(key):
+                values = [r[key] for r in results if r[key] is not None]
+                return sum(values) / len(values) if values else float("nan")
+
+            print(f"[{mode:<8}] {workers} workers | cold start {mean('cold_start_s'):.2f}s | "
+                  f"query p50 {mean('p50_ms'):.2f} ms | RSS per worker: private {mean('rss_private_mb'):.0f} MB, "
+                  f"shared file-backed {mean('rss_shared_file_mb'):.0f} MB")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Export / benchmark the memory-mapped embedding snapshot")
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--chunks", type=int, default=50_000)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--worker", nargs=2, metavar=("MODE", "PATH"), help=argparse.SUPPRESS)
+    parser.add_argument("--queries", type=int, default=50)
+    parser.add_argument("--compress", nargs="+", choices=("float16", "int8", "pq"),
+                        help="Compressed indexes to build (default: those already in use)")
+    args = parser.parse_args()
+
+    if args.worker:
+        worker(args.worker[0], args.worker[1], COLLECTION_NAME, args.queries)
+    elif args.benchmark:
+        benchmark(n_chunks=args.chunks, workers=args.workers, n_queries=args.queries)
+    else:
+        from knowledge_base.index_versions import served_db_path
+        export_snapshot(served_db_path(DB_PATH), compressions=args.compress)
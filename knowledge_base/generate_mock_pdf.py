@@ -1,5 +1,14 @@
 from reportlab.pdfgen import canvas
+from reportlab.lib.pagesizes import A4
 import os
+import sys
+import json
+import random
+import argparse
+import textwrap
+
+# Benchmark corpora stay out of data/raw_policies, which the pipeline ingests
+SYNTHETIC_FOLDER = "data/synthetic_policies"
 
 def create_dummy_policy():
     # Ensure the raw policy folder exists
@@ -29,5 +38,204 @@ def create_dummy_policy():
     c.save()
     print(f"✅ Generated Mock Policy: {file_path}")
 
+
+# -------------------------------
+# Synthetic corpus (benchmarks)
+# -------------------------------
+
+# (slug, order title, subject, benefit) per programme
+TOPICS = [
+    ("Housing_Subsidy", "HOUSING SUBSIDY", "Affordable Housing Assistance", "a housing subsidy"),
+    ("Education_Scholarship", "MERIT SCHOLARSHIP", "Higher Education Scholarships", "a scholarship"),
+    ("Health_Insurance", "HEALTH COVER", "Public Health Insurance Enrolment", "subsidised health cover"),
+    ("Old_Age_Pension", "OLD AGE PENSION", "Monthly Pension for Senior Citizens", "a monthly pension"),
+    ("Small_Business_Loan", "MSME CREDIT", "Interest-Free Loans for Small Enterprises", "an interest-free loan"),
+    ("Farm_Support", "FARMER SUPPORT", "Input Subsidy for Smallholder Farmers", "an input subsidy"),
+    ("Digital_ID", "DIGITAL IDENTITY", "Biometric Enrolment for Digital ID", "a digital ID"),
+    ("Public_Surveillance", "PUBLIC SAFETY CCTV", "Use of Surveillance Cameras in Public Spaces", "camera installation approval"),
+]
+
+# Phrasings the eligibility rule extractor has to cope with
+INCOME_CLAUSES = [
+    "Annual family income must be less than ${amount:,}.",
+    "The applicant's annual income must not exceed ${amount:,}.",
+    "Household income should be below ${amount:,} per year.",
+    "Only families with an income of up to ${amount:,} are eligible.",
+]
+RESIDENCY_CLAUSES = [
+    "The applicant must be a resident of the state for at least {years} years.",
+    "Applicants must have been a resident of the district for a minimum of {years} years.",
+]
+OTHER_CLAUSES = [
+    "Applicant must not own any other residential property.",
+    "The applicant must not be a beneficiary of any similar central scheme.",
+    "Only one member per household may apply.",
+    "Government employees are not eligible under this order.",
+    "Priority shall be given to women-headed households and persons with disabilities.",
+    "The benefit is not transferable and lapses on the death of the beneficiary.",
+]
+DOCUMENTS = [
+    "Valid Government ID (Driver's License / Voter ID)",
+    "Income Certificate issued by a Gazetted Officer",
+    "Proof of current residence (Utility Bill)",
+    "Bank account passbook",
+    "Two recent passport-size photographs",
+    "Caste or community certificate, if applicable",
+    "Land ownership records",
+    "Medical certificate from a registered practitioner",
+]
+PROSE = [
+    "The Department shall review every application within {days} working days of receipt.",
+    "District Collectors are directed to give wide publicity to this scheme.",
+    "Funds for this scheme shall be met from the budget head {head} for the financial year.",
+    "Any false declaration shall lead to recovery of the benefit with interest at {rate}% per annum.",
+    "Grievances may be lodged with the Grievance Redressal Officer of the district.",
+    "Automated decision systems used under this order shall be subject to human oversight.",
+    "Personal data collected under this order shall not be shared with third parties.",
+    "The use of real-time remote biometric identification in public spaces is prohibited.",
+    "This order shall come into force with immediate effect and remain valid until revoked.",
+]
+
+# PII that leaks into real scanned orders (officer signatures, sample cases)
+FIRST_NAMES = ["Deepak", "Anita", "Rahul", "Priya", "John", "Maria", "Suresh", "Fatima", "Wei", "Olga"]
+LAST_NAMES = ["Nair", "Sharma", "Iyer", "Smith", "Garcia", "Khan", "Reddy", "Chen", "Ivanova", "Das"]
+CITIES = ["Bangalore", "Chennai", "Mumbai", "Kochi", "Hyderabad", "Pune", "Delhi"]
+PII_LINES = [
+    "Contact officer: {name}, phone {phone}, email {email}.",
+    "Sample case: {name} of {city} was sanctioned the benefit on appeal.",
+    "Queries may be sent to {email} or by phone to {phone}.",
+    "Signed: {name}, Deputy Secretary, {city}.",
+]
+
+
+def make_pii(rng):
+    first, last = rng.choice(FIRST_NAMES), rng.choice(LAST_NAMES)
+    return {
+        "name": f"{first} {last}",
+        "phone": f"9{rng.randint(100000000, 999999999)}",
+        "email": f"{first.lower()}.{last.lower()}@gov.example.in",
+        "city": rng.choice(CITIES),
+    }
+
+
+def generate_policy(rng, number, year, min_pages=1, max_pages=5, pii_rate=0.5):
+    """
+    Builds one policy as a list of lines (headings start at column 0,
+    clauses are '- ' bullets) plus the ground truth used to build it.
+    """
+    slug, order_title, subject, benefit = rng.choice(TOPICS)
+    income = rng.choice([15_000, 20_000, 30_000, 45_000, 60_000, 75_000, 100_000])
+    years = rng.choice([1, 2, 3, 5, 10])
+    documents = rng.sample(DOCUMENTS, rng.randint(2, 5))
+    pii = []
+
+    def filler(n):
+        out = []
+        for _ in range(n):
+            out.append(rng.choice(PROSE).format(days=rng.randint(7, 60),
+                                                head=f"{rng.randint(2000, 2999)}-{rng.randint(10, 99)}",
+                                                rate=rng.choice([6, 9, 12])))
+            if rng.random() < pii_rate / 10:
+                values = make_pii(rng)
+                pii.append(values)
+                out.append(rng.choice(PII_LINES).format(**values))
+        return out
+
+    lines = [
+        f"GOVERNMENT ORDER NO. {number}/{year} - {order_title}",
+        "-" * 60,
+        f"SUBJECT: Guidelines for {subject}",
+        "",
+        "PREAMBLE:",
+        *filler(rng.randint(2, 6)),
+        "",
+        "1. ELIGIBILITY CRITERIA:",
+    ]
+
+    clauses = [rng.choice(RESIDENCY_CLAUSES).format(years=years),
+               rng.choice(INCOME_CLAUSES).format(amount=income)]
+    clauses += rng.sample(OTHER_CLAUSES, rng.randint(0, 3))
+    rng.shuffle(clauses)
+    lines += [f"- {clause}" for clause in clauses]
+
+    lines += ["", "2. DOCUMENTATION REQUIRED:"]
+    lines += [f"- {doc}." for doc in documents]
+
+    # Varying clause structure: extra numbered sections sized to the page target
+    target_lines = rng.randint(min_pages, max_pages) * 45
+    section = 3
+    while len(lines) < target_lines:
+        lines += ["", f"{section}. {rng.choice(['GENERAL CONDITIONS', 'PROCEDURE', 'MONITORING', 'DATA PROTECTION', 'PENALTIES', 'TRANSITIONAL PROVISIONS'])}:"]
+        lines += filler(rng.randint(4, 12))
+        section += 1
+
+    lines += ["", f"{section}. APPLICATION PROCESS:",
+              f"Applications for {benefit} must be submitted via the AI-Gov Portal."]
+    if rng.random() < pii_rate:
+        values = make_pii(rng)
+        pii.append(values)
+        lines.append(PII_LINES[3].format(**values))
+
+    return {
+        "filename": f"GO_{slug}_{year}_{number:05d}.pdf",
+        "lines": lines,
+        "max_income": income,
+        "min_residency_years": years,
+        "required_documents": documents,
+        "pii": pii,
+    }
+
+
+def write_policy_pdf(lines, file_path):
+    """
+    Writes the lines onto as many A4 pages as they need.
+    """
+    width, height = A4
+    c = canvas.Canvas(file_path, pagesize=A4)
+    y = height - 60
+    for line in lines:
+        indent = 120 if line.startswith("- ") else 100
+        for part in textwrap.wrap(line, 90) or [""]:
+            if y < 60:
+                c.showPage()
+                y = height - 60
+            c.drawString(indent, y, part)
+            y -= 18
+    c.save()
+
+
+def generate_corpus(n, folder=SYNTHETIC_FOLDER, seed=42, min_pages=1, max_pages=5, pii_rate=0.5):
+    """
+    Writes n synthetic policy PDFs and a manifest.json with the ground
+    truth (thresholds, documents, injected PII) of each one.
+    """
+    rng = random.Random(seed)
+    os.makedirs(folder, exist_ok=True)
+    manifest = []
+
+    for i in range(n):
+        policy = generate_policy(rng, number=i + 1, year=rng.choice([2023, 2024, 2025]),
+                                 min_pages=min_pages, max_pages=max_pages, pii_rate=pii_rate)
+        write_policy_pdf(policy.pop("lines"), os.path.join(folder, policy["filename"]))
+        manifest.append(policy)
+
+    with open(os.path.join(folder, "manifest.json"), "w", encoding="utf-8") as f:
+        json.dump(manifest, f, indent=2)
+
+    print(f"✅ Generated {n} mock policies in {folder}")
+    return manifest
+
+
 if __name__ == "__main__":
-    create_dummy_policy()
+    if len(sys.argv) == 1:
+        create_dummy_policy()
+    else:
+        parser = argparse.ArgumentParser(description="Generate synthetic government policy PDFs")
+        parser.add_argument("--count", type=int, required=True)
+        parser.add_argument("--folder", default=SYNTHETIC_FOLDER)
+        parser.add_argument("--seed", type=int, default=42)
+        parser.add_argument("--min-pages", type=int, default=1)
+        parser.add_argument("--max-pages", type=int, default=5)
+        parser.add_argument("--pii-rate", type=float, default=0.5)
+        args = parser.parse_args()
+        generate_corpus(args.count, args.folder, args.seed, args.min_pages, args.max_pages, args.pii_rate)
@@ -0,0 +1,313 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+The index_versions.py module rebuilds the policy knowledge base without
+touching the index the API is serving (blue/green). Each build ingests into
+its own directory under data/chroma_versions/, together with the eligibility
+rule index compiled from it; only when it has finished is the CURRENT alias
+file replaced, in one atomic rename, to point at it.
+Running PolicyKnowledgeBase instances watch the alias and switch to the new
+version in the background, so in-flight queries never see a half-built
+collection. Old versions are garbage-collected after the flip.
+
+Usage:
+    python knowledge_base/index_versions.py --build          # rebuild from data/raw_policies
+    python knowledge_base/index_versions.py --list
+    python knowledge_base/index_versions.py --rollback v20250101-120000-000000
+    python knowledge_base/index_versions.py --benchmark      # query latency during a rebuild
+"""
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import datetime
+import tempfile
+import threading
+import subprocess
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+# --- CONFIGURATION ---
+VERSIONS_DIR = "data/chroma_versions"
+ALIAS_FILE = "CURRENT"
+COLLECTION_NAME = "policy_knowledge_base"   # as written by ingest_policies.py
+RULE_INDEX = "rule_index.json"  # eligibility rules compiled from the version, in its directory
+KEEP_VERSIONS = 2           # current + previous (readers may still be switching)
+BUILD_NICE = 10             # CPU priority of a build, so serving keeps the CPU
+RELOAD_INTERVAL = 2.0       # seconds between alias checks in readers
+
+
+def alias_path(versions_dir=VERSIONS_DIR):
+    return os.path.join(versions_dir, ALIAS_FILE)
+
+
+def current_version(versions_dir=VERSIONS_DIR):
+    """
+    The version the alias points at ({"version", "path", "collection", ...}),
+    or None before the first versioned build.
+    """
+    try:
+        with open(alias_path(versions_dir), encoding="utf-8") as f:
+            return json.load(f)
+    except FileNotFoundError:
+        return None
+
+
+def list_versions(versions_dir=VERSIONS_DIR):
+    """
+    Completed builds, oldest first. A build is complete once its
+    version.json exists (written last).
+    """
+    versions = []
+    if not os.path.isdir(versions_dir):
+        return versions
+    for name in sorted(os.listdir(versions_dir)):
+        info_path = os.path.join(versions_dir, name, "version.json")
+        if os.path.exists(info_path):
+            with open(info_path, encoding="utf-8") as f:
+                versions.append(json.load(f))
+    return versions
+
+
+def flip_alias(info, versions_dir=VERSIONS_DIR):
+    """
+    Points the alias at a completed version. The new alias is written to a
+    temporary file and renamed over the old one, so readers see either the
+    old or the new target, never a partial file.
+    """
+    fd, tmp_path = tempfile.mkstemp(dir=versions_dir, prefix=".alias-")
+    with os.fdopen(fd, "w", encoding="utf-8") as f:
+        json.dump(info, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, alias_path(versions_dir))
+    print(f"✅ Knowledge base alias now points at {info['version']}")
+
+
+def gc_versions(versions_dir=VERSIONS_DIR, keep=KEEP_VERSIONS):
+    """
+    Deletes all but the newest `keep` completed versions (never the current
+    one) and any abandoned partial builds.
+    """
+    current = (current_version(versions_dir) or {}).get("version")
+    complete = [v["version"] for v in list_versions(versions_dir)]
+    keep_set = set(complete[-keep:]) | {current}
+    removed = []
+    for name in os.listdir(versions_dir):
+        path = os.path.join(versions_dir, name)
+        if name in keep_set or not os.path.isdir(path) or name.startswith("."):
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        removed.append(name)
+    if removed:
+        print(f"   [GC] Removed old versions: {', '.join(sorted(removed))}")
+    return removed
+
+
+def served_db_path(db_path, versions_dir=VERSIONS_DIR):
+    """
+    The Chroma directory the API serves: the current version once the alias
+    exists, db_path (the unversioned knowledge base) before that.
+    """
+    info = current_version(versions_dir)
+    return info["path"] if info else db_path
+
+
+def build_version(policy_folder=None, versions_dir=VERSIONS_DIR, embedding_function=None,
+                  keep=KEEP_VERSIONS, nice=BUILD_NICE, hnsw_config=None):
+    """
+    Ingests policy_folder into a new version directory, then flips the alias
+    to it and collects old versions. Returns the version info, or None if the
+    build failed (the alias is left untouched).
+    """
+    from knowledge_base.ingest_policies import ingest_policies, POLICY_FOLDER
+    from knowledge_base.vector_store import hnsw_metadata
+    from specialized_agents.eligibility_rules import build_rule_index
+
+    if nice:
+        os.nice(nice)
+    os.makedirs(versions_dir, exist_ok=True)
+    lock_path = os.path.join(versions_dir, ".build.lock")
+    try:
+        lock = os.open(lock_path, os.O_CREAT | os.O_EXCL | os.O_WRONLY)
+    except FileExistsError:
+        print(f"❌ Error: another build holds {lock_path} (delete it if that build is gone)")
+        return None
+
+    try:
+        version = "v" + datetime.datetime.now().strftime("%Y%m%d-%H%M%S-%f")
+        path = os.path.join(versions_dir, version)
+        start = time.perf_counter()
+        summary = ingest_policies(policy_folder or POLICY_FOLDER, db_path=path, collection_name=COLLECTION_NAME,
+                                  embedding_function=embedding_function, metadata=hnsw_metadata(hnsw_config))
+        if not summary or not summary["chunks"]:
+            print(f"❌ Build {version} produced no chunks; keeping the current version.")
+            shutil.rmtree(path, ignore_errors=True)
+            return None
+        # Compiled with the version, so readers switch chunks and rules together
+        build_rule_index(path, COLLECTION_NAME, output_file=os.path.join(path, RULE_INDEX))
+
+        info = {
+            "version": version,
+            "path": os.path.abspath(path),
+            "collection": COLLECTION_NAME,
+            "chunks": summary["chunks"],
+            "files": summary["success"],
+            "build_seconds": round(time.perf_counter() - start, 2),
+            "built_at": datetime.datetime.now().isoformat(timespec="seconds"),
+        }
+        with open(os.path.join(path, "version.json"), "w", encoding="utf-8") as f:
+            json.dump(info, f, indent=2)
+        flip_alias(info, versions_dir)
+        gc_versions(versions_dir, keep)
+        return info
+    finally:
+        os.close(lock)
+        os.remove(lock_path)
+
+
+class VersionWatcher:
+    """
+    Background thread that calls on_change(info) whenever the alias file is
+    replaced. Checking is one stat() per interval.
+    """
+    def __init__(self, on_change, versions_dir=VERSIONS_DIR, interval=RELOAD_INTERVAL):
+        self.on_change = on_change
+        self.path = alias_path(versions_dir)
+        self.versions_dir = versions_dir
+        self.interval = interval
+        self.stamp = self._stamp()
+        self.stopped = threading.Event()
+        threading.Thread(target=self._run, name="kb-version-watcher", daemon=True).start()
+
+    def _stamp(self):
+        try:
+            stat = os.stat(self.path)
+            return stat.st_ino, stat.st_mtime_ns
+        except FileNotFoundError:
+            return None
+
+    def _run(self):
+        while not self.stopped.wait(self.interval):
+            stamp = self._stamp()
+            if stamp == self.stamp:
+                continue
+            info = current_version(self.versions_dir)
+            if info is None:
+                continue
+            try:
+                self.on_change(info)
+                self.stamp = stamp
+            except Exception as e:
+                # Keep serving the old version; retried on the next check
+                print(f"⚠️  Could not switch to knowledge base {info.get('version')}: {e}")
+
+    def stop(self):
+        self.stopped.set()
+
+
+# -------------------------------
+# Benchmark
+# -------------------------------
+
+def benchmark(n_docs=150, seconds_before=3.0, interval=0.02):
+    """
+    Serves queries from a versioned knowledge base while a full rebuild runs
+    in another process, and reports latency before, during and after it.
+    """
+    from run_benchmarks import QUERIES, make_hashing_embedding_function, quiet
+    from knowledge_base.generate_mock_pdf import generate_corpus
+    from knowledge_base.vector_store import PolicyKnowledgeBase
+
+    embedding_function = make_hashing_embedding_function()
+    with tempfile.TemporaryDirectory() as workdir:
+        folder = os.path.join(workdir, "policies")
+        versions_dir = os.path.join(workdir, "versions")
+        print(f">>> Generating {n_docs} synthetic policies and the first version...")
+        with quiet():
+            generate_corpus(n_docs, folder=folder, seed=7)
+            build_version(folder, versions_dir, embedding_function, nice=0)
+
+        kb = PolicyKnowledgeBase(os.path.join(workdir, "chroma_db"), versions_dir=versions_dir,
+                                 embedding_fn=embedding_function, reload_interval=0.2)
+        first = kb.version
+
+        samples, errors = [], 0
+        build = switched = None
+        start = time.perf_counter()
+        i = 0
+        while True:
+            now = time.perf_counter() - start
+            if build is None and now >= seconds_before:
+                print(">>> Rebuilding in the background...")
+                code = ("import sys; sys.path.insert(0, '.');"
+                        "from run_benchmarks import make_hashing_embedding_function as f;"
+                        "from knowledge_base.index_versions import build_version;"
+                        f"build_version({folder!r}, {versions_dir!r}, f())")
+                build = subprocess.Popen([sys.executable, "-c", code], stdout=subprocess.DEVNULL,
+                                         cwd=os.path.abspath(os.path.join(os.path.dirname(__file__), "..")))
+                build_started = now
+            if switched is None and build is not None and kb.version != first:
+                switched = now
+            if switched is not None and now - switched >= seconds_before:
+                break
+            if build is not None and build.poll() not in (None, 0):
+                raise RuntimeError("Background rebuild failed")
+
+            t0 = time.perf_counter()
+            try:
+                kb.query_policy(QUERIES[i % len(QUERIES)])
+            except Exception:
+                errors += 1
+            samples.append((now, (time.perf_counter() - t0) * 1000))
+            i += 1
+            time.sleep(interval)
+
+        kb.watcher.stop()
+        phases = {
+            "before rebuild": [ms for t, ms in samples if t < build_started],
+            "during rebuild": [ms for t, ms in samples if build_started <= t < switched],
+            "after switch": [ms for t, ms in samples if t >= switched],
+        }
+        print(f"{'phase':<16} {'queries':>8} {'p50 ms':>8} {'p99 ms':>8} {'max ms':>8}")
+        for phase, values in phases.items():
+            values = np.array(values or [0.0])
+            print(f"{phase:<16} {len(values):>8} {np.percentile(values, 50):>8.2f} "
+                  f"{np.percentile(values, 99):>8.2f} {values.max():>8.2f}")
+        print(f"Rebuild took {switched - build_started:.1f}s; served {first} -> {kb.version}; "
+              f"failed queries: {errors}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Versioned (blue/green) knowledge base builds")
+    parser.add_argument("--build", action="store_true", help="Ingest into a new version and flip the alias")
+    parser.add_argument("--policy-folder")
+    parser.add_argument("--keep", type=int, default=KEEP_VERSIONS)
+    parser.add_argument("--nice", type=int, default=BUILD_NICE)
+    parser.add_argument("--list", action="store_true")
+    parser.add_argument("--rollback", metavar="VERSION", help="Point the alias back at a kept version")
+    parser.add_argument("--benchmark", action="store_true")
+    args = parser.parse_args()
+
+    if args.build:
+        if build_version(args.policy_folder, keep=args.keep, nice=args.nice) is None:
+            sys.exit(1)
+    if args.rollback:
+        matches = [v for v in list_versions() if v["version"] == args.rollback]
+        if not matches:
+            print(f"❌ Error: no completed version '{args.rollback}' in {VERSIONS_DIR}")
+            sys.exit(1)
+        flip_alias(matches[0])
+    if args.list:
+        current = (current_version() or {}).get("version")
+        for v in list_versions():
+            marker = "*" if v["version"] == current else " "
+            print(f"{marker} {v['version']}  {v['chunks']:>7} chunks  {v['files']:>5} files  built {v['built_at']}")
+    if args.benchmark:
+        benchmark()
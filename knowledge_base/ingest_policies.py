@@ -9,27 +9,41 @@ POLICY_FOLDER = "data/raw_policies"
 DB_PATH = "data/chroma_db"
 COLLECTION_NAME = "policy_knowledge_base"
 
-def ingest_policies():
-    print(f">>> Knowledge Base loading from {DB_PATH}")
+def ingest_policies(policy_folder=POLICY_FOLDER, db_path=DB_PATH, collection_name=COLLECTION_NAME,
+                    embedding_function=None, metadata=None):
+    """
+    Chunks every PDF in policy_folder into the collection.
+    embedding_function=None uses Chroma's default embedding model; metadata
+    (e.g. HNSW settings) only applies when the collection is created.
+    Returns a summary of the run (files, chunks, characters).
+    """
+    print(f">>> Knowledge Base loading from {db_path}")
     
     # Initialize ChromaDB
-    chroma_client = chromadb.PersistentClient(path=DB_PATH)
-    collection = chroma_client.get_or_create_collection(name=COLLECTION_NAME)
+    chroma_client = chromadb.PersistentClient(path=db_path)
+    kwargs = {"metadata": metadata} if metadata else {}
+    if embedding_function is None:
+        collection = chroma_client.get_or_create_collection(name=collection_name, **kwargs)
+    else:
+        collection = chroma_client.get_or_create_collection(name=collection_name,
+                                                            embedding_function=embedding_function, **kwargs)
 
-    print(f"\n>>> Scanning '{POLICY_FOLDER}' for policies...")
+    print(f"\n>>> Scanning '{policy_folder}' for policies...")
     
-    if not os.path.exists(POLICY_FOLDER):
-        print(f"Error: Policy folder '{POLICY_FOLDER}' does not exist.")
-        return
+    if not os.path.exists(policy_folder):
+        print(f"Error: Policy folder '{policy_folder}' does not exist.")
+        return None
 
-    files = [f for f in os.listdir(POLICY_FOLDER) if f.lower().endswith(".pdf")]
+    files = [f for f in os.listdir(policy_folder) if f.lower().endswith(".pdf")]
     print(f"Found {len(files)} PDFs. Starting ingestion...")
 
     success_count = 0
     fail_count = 0
+    chunk_count = 0
+    char_count = 0
 
     for filename in files:
-        file_path = os.path.join(POLICY_FOLDER, filename)
+        file_path = os.path.join(policy_folder, filename)
         
         try:
             print(f"Processing: {filename}...", end="", flush=True)
@@ -89,6 +103,8 @@ def ingest_policies():
             
             print(f" ✅ Indexed {len(chunks)} chunks.")
             success_count += 1
+            chunk_count += len(chunks)
+            char_count += len(text)
 
         except Exception as e:
             print(f"\n❌ Critical Error processing {filename}: {e}")
@@ -98,5 +114,8 @@ def ingest_policies():
     print(f"    Success: {success_count}")
     print(f"    Failed:  {fail_count}")
 
+    return {"files": len(files), "success": success_count, "failed": fail_count,
+            "chunks": chunk_count, "characters": char_count}
+
 if __name__ == "__main__":
     ingest_policies()
\ No newline at end of file
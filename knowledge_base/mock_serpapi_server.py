@@ -0,0 +1,112 @@
+import sys
+import json
+import time
+import hashlib
+import threading
+from urllib.parse import urlparse, parse_qs
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+# Local stand-in for SerpApi's /search.json (engine=google_scholar), so the
+# scraper can be run and benchmarked without spending API credits.
+# Every query has RESULTS_PER_QUERY deterministic results; a few titles are
+# shared between queries so de-duplication has something to do.
+
+RESULTS_PER_QUERY = 45
+SHARED_TITLES = [
+    "Artificial Intelligence in Public Administration: A Systematic Review",
+    "Algorithmic Accountability in Government Services",
+    "The EU AI Act and the Public Sector",
+]
+VENUES = ["Government Information Quarterly", "Public Administration Review",
+          "AI & Society", "Policy & Internet", "Journal of Public Policy"]
+
+
+def mock_result(query, position):
+    digest = hashlib.sha256(f"{query}|{position}".encode("utf-8")).hexdigest()
+    if position % 15 == 0:
+        title = SHARED_TITLES[(position // 15) % len(SHARED_TITLES)]
+        result_id = hashlib.sha256(title.encode("utf-8")).hexdigest()[:12]
+    else:
+        title = f"{query.title()}: Study {position + 1}"
+        result_id = digest[:12]
+
+    venue = VENUES[int(digest[:2], 16) % len(VENUES)]
+    year = 2015 + int(digest[2:4], 16) % 10
+    result = {
+        "position": position,
+        "title": title,
+        "result_id": result_id,
+        "link": f"https://example.org/papers/{result_id}",
+        "snippet": f"This paper examines {query.lower()} in the context of public services.",
+        "type": "Book" if int(digest[4:6], 16) % 10 == 0 else None,
+        "publication_info": {"summary": f"A Author, B Author - {venue}, {year} - example.org"},
+        "inline_links": {"cited_by": {"total": int(digest[6:10], 16) % 500}},
+    }
+    if int(digest[10:12], 16) % 2 == 0:
+        result["resources"] = [{"title": "example.org", "file_format": "PDF",
+                                "link": f"https://example.org/pdf/{result_id}.pdf"}]
+    return result
+
+
+class MockSerpApiHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, format, *args):
+        pass
+
+    def _send_json(self, payload, status=200):
+        body = json.dumps(payload).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def do_GET(self):
+        url = urlparse(self.path)
+        params = {k: v[0] for k, v in parse_qs(url.query).items()}
+        with self.server.lock:
+            self.server.requests += 1
+        time.sleep(self.server.latency)
+
+        if url.path != "/search.json":
+            return self._send_json({"error": f"Unknown path {url.path}"}, status=404)
+        if not params.get("api_key"):
+            return self._send_json({"error": "Invalid API key."}, status=401)
+        if params.get("engine") != "google_scholar" or not params.get("q"):
+            return self._send_json({"error": "Missing query `q` or unsupported engine."}, status=400)
+
+        start = int(params.get("start", 0))
+        num = min(int(params.get("num", 10)), 20)
+        positions = range(start, min(start + num, RESULTS_PER_QUERY))
+        self._send_json({
+            "search_metadata": {"status": "Success"},
+            "search_parameters": params,
+            "organic_results": [mock_result(params["q"], p) for p in positions],
+        })
+
+
+def start_mock_server(host="127.0.0.1", port=0, latency=0.2):
+    """
+    Starts the server on a background thread. port=0 picks a free port.
+    Returns (server, base_url); call server.shutdown() to stop it.
+    """
+    server = ThreadingHTTPServer((host, port), MockSerpApiHandler)
+    server.daemon_threads = True
+    server.latency = latency
+    server.lock = threading.Lock()
+    server.requests = 0
+
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+if __name__ == "__main__":
+    port = int(sys.argv[1]) if len(sys.argv) > 1 else 8765
+    server, base_url = start_mock_server(port=port)
+    print(f">>> Mock SerpApi on {base_url} (set SERPAPI_BASE_URL={base_url} and any SERPAPI_KEY)")
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        server.shutdown()
@@ -8,15 +8,20 @@ a search result and extract article keywords from the first page.
 
 
 import io
+import os
 import re
 import sys
 import requests
 import numpy as np
-import pandas as pd
 
 import pdfquery
 import PyPDF2
 
+# Add parent directory to path so we can import our other modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data_governance.table_store import read_table
+
 def run_automatic_extraction():
     database = load_database()
     database['keywords'] = database.apply(store_keywords, axis=1)
@@ -24,8 +29,8 @@ def run_automatic_extraction():
     return database
 
 
-def load_database(filepath='../data/processed/search_results_processed.xlsx'):
-    database_df = pd.read_excel(filepath)
+def load_database(folder='../data/processed'):
+    database_df = read_table('search_results_processed', folder=folder)
 
     return database_df
 
@@ -1,7 +1,14 @@
 import os
 import sys
+import json
+import time
+import hashlib
+import argparse
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
 import pandas as pd
-from serpapi import GoogleSearch
+import requests
 from dotenv import load_dotenv
 
 # Load API Key
@@ -9,58 +16,265 @@ load_dotenv()
 API_KEY = os.getenv("SERPAPI_KEY") or os.getenv("SERPAPI_API_KEY")
 
 # Configuration
-QUERY = "AI Governance Frameworks"  # You can change this query
+QUERIES = ["AI Governance Frameworks"]  # Add queries here or pass --query
+PAGES = 1                               # Result pages per query
+RESULTS_PER_PAGE = 10                   # SerpApi allows up to 20 for Scholar
 OUTPUT_FILE = "data/raw/google_scholar_organic_results.csv"
+CACHE_DIR = "data/raw/serpapi_cache"
+# Point at a mock server for offline runs (knowledge_base/mock_serpapi_server.py)
+SERPAPI_BASE_URL = os.getenv("SERPAPI_BASE_URL", "https://serpapi.com")
+
+# Rate budget: sustained requests/second, burst size and parallel connections
+RATE_PER_SECOND = 2.0
+BURST = 4
+MAX_WORKERS = 4
+
+# retrieve_pdfs.py reads the download URL from the last column (then the
+# one before it), so file_link/link stay at the end.
+COLUMNS = ["title", "snippet", "publication_info", "result_type", "cited_by_count",
+           "query", "page", "result_id", "link", "file_link"]
+
+
+class TokenBucket:
+    """
+    Thread-safe token bucket: acquire() blocks until a request fits the budget.
+    """
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.capacity = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def acquire(self):
+        while True:
+            with self.lock:
+                now = time.monotonic()
+                self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+                self.updated = now
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                wait = (1 - self.tokens) / self.rate
+            time.sleep(wait)
+
+
+class ScholarScraper:
+    """
+    Fetches (query, page) pairs concurrently within the rate budget.
+    Raw responses are cached on disk, so a rerun of the same pages
+    costs no API credits.
+    """
+    def __init__(self, api_key, base_url=SERPAPI_BASE_URL, cache_dir=CACHE_DIR,
+                 rate=RATE_PER_SECOND, burst=BURST, max_workers=MAX_WORKERS,
+                 results_per_page=RESULTS_PER_PAGE, max_api_calls=None):
+        self.api_key = api_key
+        self.base_url = base_url.rstrip("/")
+        self.cache_dir = cache_dir
+        self.results_per_page = results_per_page
+        self.max_workers = max_workers
+        self.max_api_calls = max_api_calls
+        self.bucket = TokenBucket(rate, burst)
+        self.session = requests.Session()
+        self.stats = {"api_calls": 0, "cache_hits": 0, "errors": 0}
+        self.lock = threading.Lock()
+
+    def cache_path(self, query, page):
+        key = hashlib.sha256(json.dumps([query, page, self.results_per_page]).encode("utf-8")).hexdigest()
+        return os.path.join(self.cache_dir, f"{key}.json")
+
+    def fetch_page(self, query, page):
+        """
+        Returns the raw SerpApi response for one page (page numbers start at 1).
+        """
+        path = self.cache_path(query, page)
+        if os.path.exists(path):
+            with open(path, encoding="utf-8") as f:
+                cached = json.load(f)
+            with self.lock:
+                self.stats["cache_hits"] += 1
+            return cached["response"]
 
-def scrape_scholar():
+        with self.lock:
+            if self.max_api_calls is not None and self.stats["api_calls"] >= self.max_api_calls:
+                raise RuntimeError("API call budget exhausted")
+            self.stats["api_calls"] += 1
+
+        self.bucket.acquire()
+        params = {
+            "engine": "google_scholar",
+            "q": query,
+            "api_key": self.api_key,
+            "num": self.results_per_page,
+            "start": (page - 1) * self.results_per_page,
+        }
+        response = self.session.get(f"{self.base_url}/search.json", params=params, timeout=30)
+        results = response.json()
+        if response.status_code != 200 or "error" in results:
+            raise RuntimeError(results.get("error", f"HTTP {response.status_code}"))
+
+        # Only successful responses are cached
+        os.makedirs(self.cache_dir, exist_ok=True)
+        tmp_path = path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"query": query, "page": page, "response": results}, f)
+        os.replace(tmp_path, path)
+        return results
+
+    def scrape(self, queries, pages, output_file=OUTPUT_FILE):
+        """
+        Fetches every (query, page) and appends results not already in
+        output_file as each page arrives. Returns the number of new rows.
+        """
+        seen, columns = load_existing(output_file)
+        jobs = [(query, page) for query in queries for page in pages]
+        added = 0
+
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            futures = {pool.submit(self.fetch_page, query, page): (query, page) for query, page in jobs}
+            for future in as_completed(futures):
+                query, page = futures[future]
+                try:
+                    results = future.result()
+                except Exception as e:
+                    with self.lock:
+                        self.stats["errors"] += 1
+                    print(f"⚠️ Warning: '{query}' page {page} failed: {e}")
+                    continue
+
+                rows = []
+                for item in results.get("organic_results", []):
+                    row = clean_result(item, query, page)
+                    key = result_key(row)
+                    if key not in seen:
+                        seen.add(key)
+                        rows.append(row)
+
+                append_rows(rows, output_file, columns)
+                added += len(rows)
+                print(f"   '{query}' page {page}: {len(rows)} new results")
+
+        return added
+
+
+def clean_result(item, query, page):
+    # Extract only relevant columns
+    resources = item.get("resources") or [{}]
+    return {
+        "title": item.get("title"),
+        "snippet": item.get("snippet"),
+        "publication_info": item.get("publication_info", {}).get("summary", ""),
+        "result_type": item.get("type"),
+        "cited_by_count": item.get("inline_links", {}).get("cited_by", {}).get("total"),
+        "query": query,
+        "page": page,
+        "result_id": item.get("result_id"),
+        "link": item.get("link"),
+        "file_link": resources[0].get("link"),
+    }
+
+
+def result_key(row):
+    # Same paper from two queries is one result
+    link = row.get("link")
+    if isinstance(link, str) and link:
+        return link
+    return str(row.get("title", "")).strip().lower()
+
+
+def load_existing(output_file):
+    """
+    Returns (keys of the results already saved, column order of the file).
+    A file from an older scraper gains the missing columns; none are dropped.
+    """
+    if not os.path.exists(output_file) or os.path.getsize(output_file) == 0:
+        return set(), COLUMNS
+    df = pd.read_csv(output_file, on_bad_lines="skip")
+    columns = list(df.columns)
+    missing = [c for c in COLUMNS if c not in columns]
+    if missing:
+        columns += missing
+        df.reindex(columns=columns).to_csv(output_file, index=False)
+    return {result_key(row) for row in df.to_dict("records")}, columns
+
+
+def append_rows(rows, output_file, columns=COLUMNS):
+    if not rows:
+        return
+    # Ensure directory exists
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    header = not os.path.exists(output_file) or os.path.getsize(output_file) == 0
+    pd.DataFrame(rows).reindex(columns=columns).to_csv(output_file, mode="a", header=header, index=False)
+
+
+def scrape_scholar(queries=QUERIES, pages=range(1, PAGES + 1), output_file=OUTPUT_FILE,
+                   base_url=SERPAPI_BASE_URL, max_api_calls=None):
     if not API_KEY:
         print("❌ Error: SERPAPI_KEY not found in .env")
         return
 
-    print(f">>> Scraping Google Scholar for: '{QUERY}'...")
-    
-    params = {
-        "engine": "google_scholar",
-        "q": QUERY,
-        "api_key": API_KEY,
-        "num": 10  # Number of results to fetch
-    }
+    print(f">>> Scraping Google Scholar for {len(queries)} queries x {len(pages)} pages...")
+    scraper = ScholarScraper(API_KEY, base_url=base_url, max_api_calls=max_api_calls)
 
     try:
-        search = GoogleSearch(params)
-        results = search.get_dict()
-        
-        organic_results = results.get("organic_results", [])
-        
-        if not organic_results:
-            print("⚠️ Warning: No organic results returned from SerpApi.")
-            print(f"Debug Message: {results.get('error')}")
-            return
-
-        # Extract only relevant columns
-        cleaned_data = []
-        for item in organic_results:
-            cleaned_data.append({
-                "title": item.get("title"),
-                "link": item.get("link"),
-                "snippet": item.get("snippet"),
-                "publication_info": item.get("publication_info", {}).get("summary", "")
-            })
-
-        # Save to CSV
-        df = pd.DataFrame(cleaned_data)
-        
-        # Ensure directory exists
-        os.makedirs(os.path.dirname(OUTPUT_FILE), exist_ok=True)
-        
-        df.to_csv(OUTPUT_FILE, index=False)
-        print(f"✅ Success! Saved {len(df)} results to {OUTPUT_FILE}")
-        print(df.head(1)) # Show the first row to verify
-
+        added = scraper.scrape(queries, pages, output_file)
     except Exception as e:
         print(f"❌ Critical Error during scraping: {e}")
         sys.exit(1)
 
+    stats = scraper.stats
+    print(f"   API calls: {stats['api_calls']} | cached pages: {stats['cache_hits']} | failed pages: {stats['errors']}")
+    if stats["errors"] == len(queries) * len(pages):
+        # Every page failed: let run_pipeline.py fall back to the existing CSV
+        print("⚠️ Warning: No results returned from SerpApi.")
+        sys.exit(1)
+    print(f"✅ Success! Added {added} new results to {output_file}")
+
+
+def benchmark(queries=8, pages=5):
+    """
+    Scrapes the local mock endpoint twice: the first run pays for every
+    page, the rerun is served entirely from the cache.
+    """
+    import tempfile
+    from knowledge_base.mock_serpapi_server import start_mock_server
+
+    server, base_url = start_mock_server(latency=0.2)
+    query_list = [f"AI governance topic {i}" for i in range(queries)]
+
+    with tempfile.TemporaryDirectory() as workdir:
+        output_file = os.path.join(workdir, "results.csv")
+        for label in ("cold", "rerun"):
+            scraper = ScholarScraper("mock-key", base_url=base_url, cache_dir=os.path.join(workdir, "cache"),
+                                     rate=20, burst=8, max_workers=8)
+            start = time.perf_counter()
+            added = scraper.scrape(query_list, range(1, pages + 1), output_file)
+            elapsed = time.perf_counter() - start
+            print(f"[{label}] {elapsed:.2f}s | API calls {scraper.stats['api_calls']} | "
+                  f"cache hits {scraper.stats['cache_hits']} | new rows {added}")
+        print(f"Rows in dataset: {len(pd.read_csv(output_file))} (sequential at 0.2s/page: {queries * pages * 0.2:.1f}s)")
+
+    server.shutdown()
+
 
 if __name__ == "__main__":
-    scrape_scholar()
+    parser = argparse.ArgumentParser(description="Scrape Google Scholar results via SerpApi")
+    parser.add_argument("--query", action="append", help="Search query (repeatable)")
+    parser.add_argument("--queries-file", help="Text file with one query per line")
+    parser.add_argument("--pages", type=int, default=PAGES, help="Pages per query")
+    parser.add_argument("--start-page", type=int, default=1)
+    parser.add_argument("--max-api-calls", type=int, help="Credit budget for this run")
+    parser.add_argument("--base-url", default=SERPAPI_BASE_URL)
+    parser.add_argument("--benchmark", action="store_true", help="Run against the local mock endpoint")
+    args = parser.parse_args()
+
+    if args.benchmark:
+        sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+        benchmark()
+    else:
+        queries = list(args.query or [])
+        if args.queries_file:
+            with open(args.queries_file, encoding="utf-8") as f:
+                queries += [line.strip() for line in f if line.strip()]
+        scrape_scholar(queries or QUERIES, range(args.start_page, args.start_page + args.pages),
+                       base_url=args.base_url, max_api_calls=args.max_api_calls)
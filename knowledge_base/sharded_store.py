@@ -0,0 +1,424 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+The sharded_store.py module splits the policy knowledge base across N local
+shard processes. Each shard owns its own index (a Chroma store in
+data/shards/shard_<i>, or an in-memory NumPy matrix for benchmarks), so
+ingesting into one shard does not lock readers out of the others.
+
+Chunks are assigned to a shard by a stable hash of their document, so every
+chunk of one PDF lands together. A query is embedded once in the parent, sent to every shard at the same time, and the
+per-shard top-k lists are merged by distance. A shard that misses its
+deadline is left out of that answer instead of holding it up.
+
+Usage:
+    python knowledge_base/sharded_store.py --import-db --shards 4   # re-partition the served knowledge base
+    python knowledge_base/sharded_store.py --benchmark              # latency from 1 to 8 shards
+"""
+
+import os
+import sys
+import time
+import atexit
+import hashlib
+import argparse
+import itertools
+import threading
+import multiprocessing
+from concurrent.futures import Future, wait
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from knowledge_base.embedding_snapshot import normalize_queries, top_k
+
+# --- CONFIGURATION ---
+DB_PATH = "data/chroma_db"
+COLLECTION_NAME = "policy_knowledge_base"   # written by ingest_policies.py
+SHARD_DIR = "data/shards"
+SHARD_COLLECTION = "policy_shard"
+N_SHARDS = 4
+BACKENDS = ("chroma", "memory")
+QUERY_TIMEOUT = 2.0         # seconds each shard gets to answer a query
+IMPORT_BATCH = 5000
+BENCHMARK_BLOCK = 50_000    # rows per deterministic block of the synthetic corpus
+
+
+def shard_of(key, n_shards):
+    digest = hashlib.sha256(str(key).encode("utf-8")).digest()
+    return int.from_bytes(digest[:8], "big") % n_shards
+
+
+def partition_key(chunk_id, metadata):
+    # Chunks of one document share their source file
+    return (metadata or {}).get("source") or chunk_id
+
+
+# -------------------------------
+# Shard process
+# -------------------------------
+
+class MemoryShard:
+    """
+    Exact search over unit vectors held in this process (benchmarks and
+    throwaway stores; nothing is persisted).
+    """
+    def __init__(self):
+        self.ids, self.documents, self.metadatas = [], [], []
+        self.blocks = []
+        self.embeddings = np.zeros((0, 0), dtype=np.float32)
+
+    def count(self):
+        return len(self.ids)
+
+    def add(self, ids, embeddings, documents, metadatas):
+        self.ids += list(ids)
+        self.documents += list(documents)
+        self.metadatas += list(metadatas)
+        self.blocks.append(normalize_queries(embeddings))
+
+    def add_synthetic(self, blocks, dim):
+        for block in blocks:
+            vectors = synthetic_block(block, dim)
+            start = block * BENCHMARK_BLOCK
+            self.add([f"c{i}" for i in range(start, start + len(vectors))], vectors,
+                     [""] * len(vectors), [{}] * len(vectors))
+
+    def query(self, query_embeddings, n_results):
+        if self.blocks:
+            self.embeddings = np.concatenate([self.embeddings.reshape(-1, self.blocks[0].shape[1])] + self.blocks)
+            self.blocks = []
+        if not self.ids:
+            return empty_result(len(query_embeddings))
+
+        indices, scores = top_k(normalize_queries(query_embeddings) @ self.embeddings.T, n_results)
+        return {
+            "ids": [[self.ids[i] for i in row] for row in indices],
+            "documents": [[self.documents[i] for i in row] for row in indices],
+            "metadatas": [[self.metadatas[i] for i in row] for row in indices],
+            # Squared L2 between unit vectors, as Chroma's "l2" space reports
+            "distances": [[float(2 - 2 * s) for s in row] for row in scores],
+        }
+
+
+class ChromaShard:
+    """
+    One persistent Chroma collection. Vectors arrive already embedded, so
+    the embedding model is loaded once in the parent, not once per shard.
+    """
+    def __init__(self, path, hnsw_config=None):
+        import chromadb
+        from knowledge_base.vector_store import hnsw_metadata
+
+        os.makedirs(path, exist_ok=True)
+        self.client = chromadb.PersistentClient(path=path)
+        self.collection = self.client.get_or_create_collection(
+            name=SHARD_COLLECTION,
+            embedding_function=None,
+            metadata=hnsw_metadata(hnsw_config)
+        )
+
+    def count(self):
+        return self.collection.count()
+
+    def add(self, ids, embeddings, documents, metadatas):
+        self.collection.upsert(ids=list(ids), embeddings=np.asarray(embeddings, dtype=np.float32),
+                               documents=list(documents), metadatas=list(metadatas))
+
+    def query(self, query_embeddings, n_results):
+        n_results = min(n_results, self.count())
+        if not n_results:
+            return empty_result(len(query_embeddings))
+        return self.collection.query(
+            query_embeddings=np.asarray(query_embeddings, dtype=np.float32),
+            n_results=n_results,
+            include=["documents", "metadatas", "distances"]
+        )
+
+
+def empty_result(n_queries):
+    return {key: [[] for _ in range(n_queries)] for key in ("ids", "documents", "metadatas", "distances")}
+
+
+def shard_worker(conn, backend, path, hnsw_config):
+    """
+    Serves (request_id, op, args) messages until "stop" or the parent goes
+    away. Every reply is (request_id, ok, payload).
+    """
+    shard = MemoryShard() if backend == "memory" else ChromaShard(path, hnsw_config)
+    while True:
+        try:
+            request_id, op, args = conn.recv()
+        except (EOFError, OSError):
+            return
+        if op == "stop":
+            conn.send((request_id, True, None))
+            return
+        try:
+            conn.send((request_id, True, getattr(shard, op)(*args)))
+        except Exception as e:
+            conn.send((request_id, False, f"{type(e).__name__}: {e}"))
+
+
+# -------------------------------
+# Coordinator
+# -------------------------------
+
+class ShardedKnowledgeBase:
+    """
+    Starts n_shards worker processes and routes writes to them by
+    document; queries fan out to all shards and are merged by distance.
+    """
+    def __init__(self, root=SHARD_DIR, n_shards=N_SHARDS, backend="chroma",
+                 embedding_fn=None, hnsw_config=None, timeout=QUERY_TIMEOUT):
+        if backend not in BACKENDS:
+            raise ValueError(f"Unknown shard backend '{backend}' (expected one of {BACKENDS})")
+        self.n_shards = n_shards
+        self.timeout = timeout
+        self.embedding_fn = embedding_fn
+        self.request_ids = itertools.count()
+        # Replies are matched to their request by id: one reader thread per
+        # shard resolves the waiting request's future, so concurrent callers
+        # (API threads) never consume each other's replies
+        self.futures = {}
+        self.futures_lock = threading.Lock()
+
+        # spawn: the parent may already hold model/Chroma threads that fork would copy half-locked
+        context = multiprocessing.get_context("spawn")
+        self.conns, self.processes, self.send_locks = [], [], []
+        for i in range(n_shards):
+            parent_conn, child_conn = context.Pipe()
+            process = context.Process(target=shard_worker, daemon=True,
+                                      args=(child_conn, backend, os.path.join(root, f"shard_{i}"), hnsw_config))
+            process.start()
+            child_conn.close()
+            self.conns.append(parent_conn)
+            self.processes.append(process)
+            self.send_locks.append(threading.Lock())
+            threading.Thread(target=self._read_replies, args=(i,), name=f"shard-{i}-reader", daemon=True).start()
+        atexit.register(self.close)
+        print(f">>> Sharded Knowledge Base: {n_shards} {backend} shards ({root})")
+
+    def _embed(self, texts):
+        if self.embedding_fn is None:
+            # Same MiniLM model Chroma used to embed the chunks at ingestion
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer("all-MiniLM-L6-v2")
+            self.embedding_fn = lambda texts: model.encode(texts, normalize_embeddings=True)
+        return np.asarray(self.embedding_fn(list(texts)), dtype=np.float32)
+
+    def _read_replies(self, shard):
+        conn = self.conns[shard]
+        while True:
+            try:
+                reply_id, ok, payload = conn.recv()
+            except (EOFError, OSError):
+                break
+            with self.futures_lock:
+                future = self.futures.pop((reply_id, shard), None)
+            # No future: the request already gave up on this shard
+            if future is not None:
+                future.set_result((ok, payload))
+
+        # Shard gone: fail whatever is still waiting on it
+        with self.futures_lock:
+            orphans = [key for key in self.futures if key[1] == shard]
+            futures = [self.futures.pop(key) for key in orphans]
+        for future in futures:
+            future.set_result((False, "shard process exited"))
+
+    def _call(self, shards, op, args_for, timeout=None):
+        """
+        Sends op to the given shards at once and collects their replies.
+        Returns ({shard: payload}, [shards that failed or missed the deadline]).
+        Safe to call from several threads at once.
+        """
+        request_id = next(self.request_ids)
+        futures, failed = {}, []
+        for shard in shards:
+            future = Future()
+            with self.futures_lock:
+                self.futures[(request_id, shard)] = future
+            try:
+                with self.send_locks[shard]:
+                    self.conns[shard].send((request_id, op, args_for(shard)))
+                futures[future] = shard
+            except (BrokenPipeError, OSError):
+                with self.futures_lock:
+                    self.futures.pop((request_id, shard), None)
+                print(f"⚠️  Shard {shard} is not running")
+                failed.append(shard)
+
+        done, not_done = wait(futures, timeout)
+        with self.futures_lock:
+            for future in not_done:
+                self.futures.pop((request_id, futures[future]), None)
+        failed += [futures[future] for future in not_done]
+
+        replies = {}
+        for future in done:
+            shard = futures[future]
+            ok, payload = future.result()
+            if ok:
+                replies[shard] = payload
+            else:
+                print(f"⚠️  Shard {shard} {op} failed: {payload}")
+                failed.append(shard)
+        return replies, sorted(failed)
+
+    def add_chunks(self, ids, documents, metadatas, embeddings=None):
+        """
+        Writes chunks to their shards (embedding them first if needed);
+        each shard ingests its slice in parallel with the others.
+        """
+        # Unit vectors: L2 distances from every shard then rank like cosine and merge cleanly
+        embeddings = normalize_queries(self._embed(documents) if embeddings is None else embeddings)
+        by_shard = {}
+        for i, (chunk_id, metadata) in enumerate(zip(ids, metadatas)):
+            shard = shard_of(partition_key(chunk_id, metadata), self.n_shards)
+            by_shard.setdefault(shard, []).append(i)
+
+        def args_for(shard):
+            rows = by_shard[shard]
+            return ([ids[i] for i in rows], embeddings[rows],
+                    [documents[i] for i in rows], [metadatas[i] for i in rows])
+
+        _, failed = self._call(list(by_shard), "add", args_for)
+        if failed:
+            raise RuntimeError(f"Ingestion failed on shards {failed}")
+
+    def add_policy(self, policy_text, policy_id, metadata):
+        print(f"Indexing Policy: {policy_id}")
+        self.add_chunks([policy_id], [policy_text], [metadata])
+
+    def query_embeddings(self, query_embeddings, n_results=2):
+        """
+        Scatter-gather top-k. Returns a Chroma-style result dict; shards that
+        timed out or failed for this query are listed under "missing_shards".
+        """
+        query_embeddings = normalize_queries(query_embeddings)
+        replies, missing = self._call(range(self.n_shards), "query",
+                                      lambda shard: (query_embeddings, n_results), self.timeout)
+        if missing:
+            print(f"⚠️  Shards {missing} did not answer within {self.timeout}s; results are partial.")
+
+        merged = empty_result(len(query_embeddings))
+        merged["missing_shards"] = missing
+        for q in range(len(query_embeddings)):
+            hits = [(distance, shard, j) for shard, reply in replies.items()
+                    for j, distance in enumerate(reply["distances"][q])]
+            for distance, shard, j in sorted(hits)[:n_results]:
+                for key in ("ids", "documents", "metadatas"):
+                    merged[key][q].append(replies[shard][key][q][j])
+                merged["distances"][q].append(distance)
+        return merged
+
+    def query_policy(self, query_text, n_results=2):
+        return self.query_embeddings(self._embed([query_text]), n_results)
+
+    def counts(self):
+        replies, _ = self._call(range(self.n_shards), "count", lambda shard: (), self.timeout)
+        return [replies.get(shard) for shard in range(self.n_shards)]
+
+    def close(self):
+        if not self.processes:
+            return
+        self._call(range(self.n_shards), "stop", lambda shard: (), timeout=5)
+        for process in self.processes:
+            process.join(timeout=5)
+            if process.is_alive():
+                process.terminate()
+        self.processes = []
+
+
+def import_collection(sharded, db_path=DB_PATH, collection_name=COLLECTION_NAME):
+    """
+    Re-partitions an existing Chroma collection into the shards, reusing its
+    stored embeddings (nothing is re-embedded).
+    """
+    import chromadb
+
+    collection = chromadb.PersistentClient(path=db_path).get_collection(collection_name)
+    total = collection.count()
+    print(f">>> Importing {total} chunks from '{collection_name}' into {sharded.n_shards} shards...")
+    for offset in range(0, total, IMPORT_BATCH):
+        page = collection.get(limit=IMPORT_BATCH, offset=offset, include=["embeddings", "documents", "metadatas"])
+        sharded.add_chunks(page["ids"], page["documents"], [m or {} for m in page["metadatas"]],
+                           embeddings=np.asarray(page["embeddings"], dtype=np.float32))
+    print(f"✅ Chunks per shard: {sharded.counts()}")
+
+
+# -------------------------------
+# Benchmark
+# -------------------------------
+
+def synthetic_block(block, dim, n_clusters=50):
+    """
+    One deterministic block of a clustered synthetic corpus. Blocks are
+    generated inside the shards, so the corpus never crosses a pipe and is
+    identical whatever the shard count.
+    """
+    centers = np.random.default_rng(0).normal(size=(n_clusters, dim)).astype(np.float32)
+    rng = np.random.default_rng(block + 1)
+    vectors = centers[rng.integers(0, n_clusters, BENCHMARK_BLOCK)]
+    vectors += 0.35 * rng.standard_normal((BENCHMARK_BLOCK, dim), dtype=np.float32)
+    return vectors
+
+
+def benchmark(n_chunks=2_000_000, dim=128, shard_counts=(1, 2, 4, 8), n_queries=50, k=10):
+    """
+    Query latency of the same corpus split over 1..8 in-memory shards.
+    Merged results are checked against the single-shard answer.
+    """
+    n_blocks = max(n_chunks // BENCHMARK_BLOCK, 1)
+    queries = synthetic_block(10**6, dim)[:n_queries]
+    print(f">>> {n_blocks * BENCHMARK_BLOCK:,} x {dim} synthetic chunks, {n_queries} queries, k={k}, "
+          f"{os.cpu_count()} CPUs")
+    print(f"{'shards':>6} {'load s':>8} {'p50 ms':>9} {'p99 ms':>9} {'same top-k':>11}")
+
+    reference = None
+    for n_shards in shard_counts:
+        sharded = ShardedKnowledgeBase(n_shards=n_shards, backend="memory", timeout=60)
+        start = time.perf_counter()
+        _, failed = sharded._call(range(n_shards), "add_synthetic",
+                                  lambda shard: (range(shard, n_blocks, n_shards), dim))
+        load = time.perf_counter() - start
+        if failed:
+            raise RuntimeError(f"Shards {failed} failed to load")
+        sharded.query_embeddings(queries[:1], k)
+
+        latencies, answers = [], []
+        for query in queries:
+            start = time.perf_counter()
+            answers.append(sharded.query_embeddings(query[None, :], k)["ids"][0])
+            latencies.append(time.perf_counter() - start)
+        sharded.close()
+
+        reference = reference or answers
+        same = np.mean([set(a) == set(b) for a, b in zip(answers, reference)])
+        latencies = np.array(latencies) * 1000
+        print(f"{n_shards:>6} {load:>8.1f} {np.percentile(latencies, 50):>9.2f} "
+              f"{np.percentile(latencies, 99):>9.2f} {same:>11.0%}")
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Sharded policy knowledge base")
+    parser.add_argument("--import-db", action="store_true",
+                        help=f"Re-partition the served knowledge base (the current version, or {DB_PATH})")
+    parser.add_argument("--shards", type=int, default=N_SHARDS)
+    parser.add_argument("--benchmark", action="store_true")
+    parser.add_argument("--chunks", type=int, default=2_000_000)
+    parser.add_argument("--dim", type=int, default=128)
+    parser.add_argument("--max-shards", type=int, default=8)
+    args = parser.parse_args()
+
+    if args.import_db:
+        from knowledge_base.index_versions import served_db_path
+        store = ShardedKnowledgeBase(n_shards=args.shards)
+        import_collection(store, served_db_path(DB_PATH))
+        store.close()
+    if args.benchmark:
+        counts = [n for n in (1, 2, 4, 8, 16) if n <= args.max_shards]
+        benchmark(n_chunks=args.chunks, dim=args.dim, shard_counts=counts)
@@ -1,13 +1,102 @@
 import os
-import chromadb
-from chromadb.utils import embedding_functions
+
+# "chroma" opens the persistent Chroma collection; "snapshot" serves queries
+# from the memory-mapped export (knowledge_base/embedding_snapshot.py), which
+# starts faster and shares its memory with the other API workers; "sharded"
+# splits the chunks over shard processes (knowledge_base/sharded_store.py).
+KB_MODE = os.getenv("POLICY_KB_MODE", "chroma")
+KB_SHARDS = int(os.getenv("POLICY_KB_SHARDS", "4"))
+# Optional compressed vectors for snapshot mode: "float16", "int8" or "pq"
+# (built with knowledge_base/compressed_vectors.py --build ...)
+KB_COMPRESSION = os.getenv("POLICY_KB_COMPRESSION") or None
+
+# HNSW index settings (Chroma's defaults). Higher M / construction_ef give a
+# better graph at the cost of build time and memory; search_ef trades query
+# latency for recall. Measure with knowledge_base/ann_benchmark.py.
+DEFAULT_HNSW_CONFIG = {
+    "space": "l2",          # "l2", "cosine" or "ip"
+    "M": 16,
+    "construction_ef": 100,
+    "search_ef": 10,
+}
+HNSW_SPACES = ("l2", "cosine", "ip")
+
+
+def hnsw_metadata(hnsw_config=None):
+    """
+    Merges hnsw_config over the defaults and returns it as Chroma
+    collection metadata ({"hnsw:space": ..., "hnsw:M": ..., ...}).
+    """
+    config = dict(DEFAULT_HNSW_CONFIG)
+    for key, value in (hnsw_config or {}).items():
+        if key not in DEFAULT_HNSW_CONFIG:
+            raise ValueError(f"Unknown HNSW setting '{key}' (expected one of {list(DEFAULT_HNSW_CONFIG)})")
+        config[key] = value
+    if config["space"] not in HNSW_SPACES:
+        raise ValueError(f"Unknown HNSW space '{config['space']}' (expected one of {HNSW_SPACES})")
+    return {f"hnsw:{key}": value for key, value in config.items()}
+
+
+def stale_hnsw_settings(existing, requested):
+    """
+    The settings an existing collection was built with that differ from the
+    requested metadata, as {"hnsw:M": 16, ...}. A setting missing from the
+    collection's metadata (or no metadata at all) means Chroma's default.
+    """
+    built = dict(hnsw_metadata())
+    built.update(existing or {})
+    return {k: built[k] for k, v in requested.items() if built[k] != v}
+
 
 class PolicyKnowledgeBase:
     """
     Implements the Vector Database for Retrieval-Augmented Generation (RAG).
     Stores policy documents as 'embeddings' for semantic search [Chapter 5.1].
     """
-    def __init__(self, db_path="./data/chroma_db"):
+    def __init__(self, db_path="./data/chroma_db", hnsw_config=None, mode=None, snapshot_dir=None,
+                 embedding_fn=None, compression=None, versions_dir=None, reload_interval=None,
+                 collection_name="gov_policies"):
+        self.mode = mode or KB_MODE
+        if self.mode == "snapshot":
+            self._open_snapshot(snapshot_dir, embedding_fn, compression or KB_COMPRESSION)
+            return
+        if self.mode == "sharded":
+            from knowledge_base.sharded_store import ShardedKnowledgeBase
+            self.shards = ShardedKnowledgeBase(n_shards=KB_SHARDS, embedding_fn=embedding_fn,
+                                               hnsw_config=hnsw_config)
+            return
+        if self.mode != "chroma":
+            raise ValueError(f"Unknown knowledge base mode '{self.mode}' (expected 'chroma', 'snapshot' or 'sharded')")
+
+        from knowledge_base.index_versions import VersionWatcher, current_version, VERSIONS_DIR, RELOAD_INTERVAL
+
+        self.hnsw_metadata = hnsw_metadata(hnsw_config)
+
+        # Versioned builds (knowledge_base/index_versions.py): once the alias
+        # exists it is served instead of db_path, and every rebuild is picked
+        # up live. rule_index is the version's compiled eligibility rules
+        # (None while unversioned: the Compliance Agent uses its own file)
+        self.version = None
+        self.rule_index = None
+        self.versions_dir = versions_dir or VERSIONS_DIR
+        self._version_embedding_fn = embedding_fn
+        info = current_version(self.versions_dir)
+        if info:
+            try:
+                self._switch_version(info)
+            except Exception as e:
+                print(f"⚠️  Could not open knowledge base version {info.get('version')} ({e}); "
+                      f"falling back to {db_path}")
+        if self.version is None:
+            self._open_collection(db_path, collection_name, embedding_fn)
+        self.watcher = VersionWatcher(self._switch_version, self.versions_dir,
+                                      reload_interval or RELOAD_INTERVAL)
+
+    def _open_collection(self, db_path, collection_name, embedding_fn):
+        # Unversioned mode: the collection in db_path, created if needed
+        import chromadb
+        from chromadb.utils import embedding_functions
+
         # Ensure the data directory exists
         os.makedirs(db_path, exist_ok=True)
         
@@ -16,21 +105,79 @@ class PolicyKnowledgeBase:
         
         # Use a lightweight CPU-friendly embedding model (MiniLM)
         # This converts text into numbers locally (No GPU needed)
-        self.embedding_fn = embedding_functions.SentenceTransformerEmbeddingFunction(
+        self.embedding_fn = embedding_fn or embedding_functions.SentenceTransformerEmbeddingFunction(
             model_name="all-MiniLM-L6-v2" 
         )
         
         # Create or get the collection (think of it as a 'table' of policies)
         self.collection = self.client.get_or_create_collection(
-            name="gov_policies",
-            embedding_function=self.embedding_fn
+            name=collection_name,
+            embedding_function=self.embedding_fn,
+            metadata=self.hnsw_metadata
         )
+        self._check_hnsw_settings()
         print(f">>> Knowledge Base loaded from {db_path}")
 
+    def _check_hnsw_settings(self):
+        # The index settings are fixed when the collection is created
+        stale = stale_hnsw_settings(self.collection.metadata, self.hnsw_metadata)
+        if self.collection.metadata is None:
+            print("⚠️  Collection has no HNSW metadata; assuming it was built with Chroma's defaults.")
+        if stale:
+            print(f"⚠️  Collection was built with {stale}; requested settings apply after a rebuild.")
+
+    def _switch_version(self, info):
+        """
+        Opens a versioned build and swaps it in, with its rule index. Queries
+        already running finish on the old collection; new ones use the new one.
+        """
+        import chromadb
+        from knowledge_base.index_versions import RULE_INDEX
+        from specialized_agents.eligibility_rules import RuleIndex
+
+        client = chromadb.PersistentClient(path=info["path"])
+        # Versions keep the embedding function they were ingested with
+        kwargs = {"embedding_function": self._version_embedding_fn} if self._version_embedding_fn else {}
+        collection = client.get_collection(info["collection"], **kwargs)
+        collection.query(query_texts=["warm-up"], n_results=1)   # load the index before serving
+        # Versions built before rule indexes were stored get an empty one (no fast path)
+        rule_index = RuleIndex.load(os.path.join(info["path"], RULE_INDEX))
+        self.client, self.collection, self.version, self.rule_index = client, collection, info["version"], rule_index
+        print(f">>> Knowledge Base switched to version {info['version']} ({info.get('chunks')} chunks, "
+              f"{len(rule_index)} policies with compiled rules)")
+        self._check_hnsw_settings()
+
+    def _open_snapshot(self, snapshot_dir, embedding_fn, compression):
+        # Read-only mode: no Chroma client, no private copy of the index
+        from knowledge_base.embedding_snapshot import EmbeddingSnapshot, SNAPSHOT_DIR
+
+        snapshot_dir = snapshot_dir or SNAPSHOT_DIR
+        self.snapshot = EmbeddingSnapshot(snapshot_dir)
+        self.searcher = self.snapshot
+        if compression:
+            from knowledge_base.compressed_vectors import CompressedSnapshot
+            self.searcher = CompressedSnapshot(self.snapshot, compression)
+
+        if embedding_fn is None:
+            # Same MiniLM model Chroma used to embed the chunks at ingestion
+            from sentence_transformers import SentenceTransformer
+            model = SentenceTransformer("all-MiniLM-L6-v2")
+            embedding_fn = lambda texts: model.encode(texts, normalize_embeddings=True)
+        self.embedding_fn = embedding_fn
+        print(f">>> Knowledge Base snapshot mapped from {snapshot_dir} ({len(self.snapshot)} chunks"
+              f"{', ' + compression + ' vectors' if compression else ''})")
+
     def add_policy(self, policy_text, policy_id, metadata):
         """
         Ingests a policy document into the vector database.
         """
+        if self.mode == "snapshot":
+            raise RuntimeError("The snapshot knowledge base is read-only; ingest into Chroma and re-export.")
+        if self.mode == "sharded":
+            return self.shards.add_policy(policy_text, policy_id, metadata)
+        if self.version is not None:
+            raise RuntimeError(f"Serving the read-only versioned build {self.version}; add the policy to "
+                               "the policy folder and run knowledge_base/index_versions.py --build.")
         print(f"Indexing Policy: {policy_id}")
         self.collection.upsert(
             documents=[policy_text],
@@ -42,6 +189,11 @@ class PolicyKnowledgeBase:
         """
         Finds the most relevant policies for a user's question.
         """
+        if self.mode == "snapshot":
+            return self.searcher.search(self.embedding_fn([query_text]), n_results=n_results)
+        if self.mode == "sharded":
+            return self.shards.query_policy(query_text, n_results=n_results)
+
         results = self.collection.query(
             query_texts=[query_text],
             n_results=n_results
@@ -0,0 +1,361 @@
+import os
+import io
+import json
+import glob
+import time
+import hashlib
+import argparse
+import datetime
+import tempfile
+import subprocess
+import contextlib
+
+import numpy as np
+
+# End-to-end performance suite, runnable offline:
+#   corpus    - synthetic policy PDFs (knowledge_base/generate_mock_pdf.py)
+#   ingestion - PDF -> chunks -> Chroma, documents/s and chunks/s
+#   query     - single-query retrieval latency (p50/p99)
+#   rules     - eligibility-rule extraction accuracy against the corpus ground truth
+#   pii       - PII masking throughput and leak rate on the injected PII
+#   api       - Flask API latency through the test client, on the synthetic corpus
+# Results are written to data/benchmarks/ as JSON and diffed against the previous run.
+
+BENCHMARK_DIR = "data/benchmarks"
+COLLECTION_NAME = "benchmark_policies"
+SECTIONS = ["ingestion", "query", "rules", "pii", "api"]
+
+QUERIES = [
+    "How do I get financial help for a house?",
+    "Am I eligible for a scholarship if my family earns $40,000?",
+    "What documents do I need for the old age pension?",
+    "Can the city install surveillance cameras on my street?",
+    "Who can apply for an interest-free loan for a small business?",
+    "Is there a subsidy for smallholder farmers?",
+    "How long must I be a resident to get health cover?",
+    "Is biometric identification allowed in public spaces?",
+]
+
+
+def make_hashing_embedding_function(dim=384):
+    """
+    Deterministic bag-of-words feature hashing. Keeps the ingestion and
+    query benchmarks offline (no model download) while exercising the
+    same Chroma write/index/search path as a real embedding model.
+    """
+    from chromadb.api.types import EmbeddingFunction
+
+    class HashingEmbeddingFunction(EmbeddingFunction):
+        def __init__(self, dim=dim):
+            self.dim = dim
+
+        def __call__(self, input):
+            vectors = np.zeros((len(input), self.dim), dtype=np.float32)
+            for row, text in enumerate(input):
+                for token in text.lower().split():
+                    h = int.from_bytes(hashlib.blake2b(token.encode(), digest_size=8).digest(), "little")
+                    vectors[row, h % self.dim] += 1.0 if (h >> 63) else -1.0
+            norms = np.linalg.norm(vectors, axis=1, keepdims=True)
+            return list(vectors / np.maximum(norms, 1e-12))
+
+        @staticmethod
+        def name():
+            return "aigov_hashing"
+
+        def get_config(self):
+            return {"dim": self.dim}
+
+        @staticmethod
+        def build_from_config(config):
+            return HashingEmbeddingFunction(config["dim"])
+
+    return HashingEmbeddingFunction()
+
+
+def latency_stats(seconds):
+    ms = np.array(seconds) * 1000
+    return {
+        "count": len(ms),
+        "p50_ms": round(float(np.percentile(ms, 50)), 3),
+        "p99_ms": round(float(np.percentile(ms, 99)), 3),
+        "mean_ms": round(float(ms.mean()), 3),
+    }
+
+
+@contextlib.contextmanager
+def quiet():
+    # The ingestion and agent modules print per document/request
+    with contextlib.redirect_stdout(io.StringIO()):
+        yield
+
+
+# -------------------------------
+# Sections
+# -------------------------------
+
+def bench_corpus(workdir, n_docs, seed):
+    from knowledge_base.generate_mock_pdf import generate_corpus
+
+    folder = os.path.join(workdir, "policies")
+    start = time.perf_counter()
+    with quiet():
+        manifest = generate_corpus(n_docs, folder=folder, seed=seed)
+    elapsed = time.perf_counter() - start
+
+    size = sum(os.path.getsize(p) for p in glob.glob(os.path.join(folder, "*.pdf")))
+    return folder, manifest, {
+        "documents": n_docs,
+        "pdf_mb": round(size / 1e6, 2),
+        "injected_pii": sum(len(p["pii"]) for p in manifest),
+        "seconds": round(elapsed, 3),
+    }
+
+
+def bench_ingestion(ctx):
+    from knowledge_base.ingest_policies import ingest_policies
+
+    start = time.perf_counter()
+    with quiet():
+        summary = ingest_policies(ctx["folder"], ctx["db_path"], COLLECTION_NAME, ctx["embedding_function"])
+    elapsed = time.perf_counter() - start
+
+    return {
+        **summary,
+        "seconds": round(elapsed, 3),
+        "documents_per_s": round(summary["success"] / elapsed, 2),
+        "chunks_per_s": round(summary["chunks"] / elapsed, 2),
+        "mb_text_per_s": round(summary["characters"] / 1e6 / elapsed, 3),
+    }
+
+
+def bench_query(ctx, n_queries):
+    import chromadb
+
+    client = chromadb.PersistentClient(path=ctx["db_path"])
+    kwargs = {"embedding_function": ctx["embedding_function"]} if ctx["embedding_function"] else {}
+    collection = client.get_collection(COLLECTION_NAME, **kwargs)
+
+    # One warm-up query loads the index and the embedding model
+    collection.query(query_texts=[QUERIES[0]], n_results=2)
+    latencies = []
+    for i in range(n_queries):
+        start = time.perf_counter()
+        collection.query(query_texts=[QUERIES[i % len(QUERIES)]], n_results=2)
+        latencies.append(time.perf_counter() - start)
+
+    return {"collection_size": collection.count(), **latency_stats(latencies)}
+
+
+def bench_rules(ctx):
+    from specialized_agents.eligibility_rules import extract_rules, load_policy_texts
+
+    texts = load_policy_texts(ctx["db_path"], COLLECTION_NAME)
+    start = time.perf_counter()
+    rules = {policy_id: extract_rules(text) for policy_id, text in texts.items()}
+    elapsed = time.perf_counter() - start
+
+    income = residency = 0
+    for policy in ctx["manifest"]:
+        found = rules.get(policy["filename"], {})
+        income += found.get("max_income", {}).get("value") == policy["max_income"]
+        residency += found.get("min_residency_years") == policy["min_residency_years"]
+
+    n = len(ctx["manifest"])
+    return {
+        "policies": len(texts),
+        "income_accuracy": round(income / n, 3),
+        "residency_accuracy": round(residency / n, 3),
+        "ms_per_policy": round(elapsed / max(len(texts), 1) * 1000, 3),
+    }
+
+
+def bench_pii(ctx, n_texts):
+    from data_governance.pii_masking import PIIMasker
+
+    people = [pii for policy in ctx["manifest"] for pii in policy["pii"]]
+    if not people:
+        return {"skipped": "corpus has no injected PII"}
+    texts = [
+        f"My name is {p['name']}, living in {p['city']}. Contact me at {p['phone']} or {p['email']}. "
+        "I want to apply for a housing subsidy."
+        for p in (people[i % len(people)] for i in range(n_texts))
+    ]
+
+    with quiet():
+        masker = PIIMasker()
+    masker.mask_text(texts[0])
+
+    start = time.perf_counter()
+    masked = [masker.mask_text(text) for text in texts]
+    elapsed = time.perf_counter() - start
+
+    leaked = sum(
+        any(value in out for value in (p["name"], p["phone"], p["email"]))
+        for p, out in zip((people[i % len(people)] for i in range(n_texts)), masked)
+    )
+    return {
+        "texts": n_texts,
+        "texts_per_s": round(n_texts / elapsed, 2),
+        "kchars_per_s": round(sum(map(len, texts)) / 1e3 / elapsed, 2),
+        "leak_rate": round(leaked / n_texts, 3),
+    }
+
+
+def bench_api(ctx, n_requests):
+    # The API runs on the synthetic corpus with hashing embeddings, never on
+    # data/chroma_db or the downloaded model; an LLM is not called.
+    from data_governance.audit_log import AuditLog
+    from knowledge_base.vector_store import PolicyKnowledgeBase
+    from specialized_agents.eligibility_rules import RuleIndex, extract_rules, load_policy_texts
+
+    if not os.path.exists(ctx["db_path"]):
+        return {"skipped": "no synthetic knowledge base (ingestion did not run)"}
+    if ctx["embedding_function"] is None:
+        return {"skipped": "needs --embeddings hash to run offline"}
+
+    with quiet():
+        from agent_orchestrator.orchestrator import AIOrchestrator
+        from interface.api_server import create_app
+
+        knowledge_base = PolicyKnowledgeBase(ctx["db_path"], mode="chroma", collection_name=COLLECTION_NAME,
+                                             embedding_fn=ctx["embedding_function"],
+                                             versions_dir=os.path.join(ctx["workdir"], "versions"))
+        brain = AIOrchestrator(knowledge_base=knowledge_base,
+                               audit_log=AuditLog(os.path.join(ctx["workdir"], "audit")))
+        brain.llm = brain.compliance_agent.llm = None
+        # Rule index of the synthetic corpus, not data/processed/rule_index.json
+        texts = load_policy_texts(ctx["db_path"], COLLECTION_NAME)
+        brain.compliance_agent.rule_index = RuleIndex({pid: extract_rules(text) for pid, text in texts.items()})
+    client = create_app(brain).test_client()
+
+    health = []
+    for _ in range(n_requests):
+        start = time.perf_counter()
+        client.get("/api/health")
+        health.append(time.perf_counter() - start)
+
+    submit, errors = [], 0
+    for i in range(n_requests):
+        start = time.perf_counter()
+        with quiet():
+            response = client.post("/api/submit_request", json={"text": QUERIES[i % len(QUERIES)]})
+        submit.append(time.perf_counter() - start)
+        errors += response.status_code != 200
+
+    return {
+        "health": latency_stats(health),
+        "submit_request": {**latency_stats(submit), "errors": errors},
+    }
+
+
+# -------------------------------
+# Reporting
+# -------------------------------
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True,
+                              text=True, check=True).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def flatten(results, prefix=""):
+    flat = {}
+    for key, value in results.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten(value, name + "."))
+        elif isinstance(value, (int, float)) and not isinstance(value, bool):
+            flat[name] = value
+    return flat
+
+
+def previous_result(output_dir, exclude):
+    files = sorted(f for f in glob.glob(os.path.join(output_dir, "benchmark_*.json"))
+                   if os.path.abspath(f) != os.path.abspath(exclude))
+    if not files:
+        return None
+    with open(files[-1], encoding="utf-8") as f:
+        return json.load(f)
+
+
+def format_diff(current, previous):
+    now = flatten(current["results"])
+    before = flatten(previous["results"]) if previous else {}
+    lines = [f"   {'Metric':<42} {'Now':>12} {'Before':>12} {'Change':>8}"]
+    for name, value in now.items():
+        old = before.get(name)
+        change = f"{(value - old) / old:+.0%}" if old else ""
+        lines.append(f"   {name:<42} {value:>12} {'' if old is None else old:>12} {change:>8}")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="End-to-end AI-Gov benchmark suite")
+    parser.add_argument("--docs", type=int, default=50, help="Synthetic policies to generate")
+    parser.add_argument("--queries", type=int, default=200)
+    parser.add_argument("--pii-texts", type=int, default=200)
+    parser.add_argument("--api-requests", type=int, default=50)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--embeddings", choices=["hash", "model"], default="hash",
+                        help="'hash' is offline; 'model' uses Chroma's default MiniLM model")
+    parser.add_argument("--only", nargs="+", choices=SECTIONS, default=SECTIONS)
+    parser.add_argument("--output-dir", default=BENCHMARK_DIR)
+    args = parser.parse_args()
+
+    stamp = datetime.datetime.now().strftime("%Y%m%d_%H%M%S")
+    report = {
+        "timestamp": stamp,
+        "commit": git_commit(),
+        "config": {k: v for k, v in vars(args).items() if k != "output_dir"},
+        "results": {},
+    }
+
+    with tempfile.TemporaryDirectory() as workdir:
+        print(f">>> Generating {args.docs} synthetic policies...")
+        folder, manifest, report["results"]["corpus"] = bench_corpus(workdir, args.docs, args.seed)
+        ctx = {
+            "folder": folder,
+            "manifest": manifest,
+            "db_path": os.path.join(workdir, "chroma_db"),
+            "embedding_function": make_hashing_embedding_function() if args.embeddings == "hash" else None,
+            "workdir": workdir,
+        }
+
+        runs = {
+            "ingestion": lambda: bench_ingestion(ctx),
+            "query": lambda: bench_query(ctx, args.queries),
+            "rules": lambda: bench_rules(ctx),
+            "pii": lambda: bench_pii(ctx, args.pii_texts),
+            "api": lambda: bench_api(ctx, args.api_requests),
+        }
+        # query, rules and api read the collection that ingestion writes
+        sections = [name for name in SECTIONS if name in args.only]
+        if {"query", "rules", "api"} & set(sections) and "ingestion" not in sections:
+            sections.insert(0, "ingestion")
+
+        for name in sections:
+            print(f">>> Benchmark: {name}")
+            try:
+                report["results"][name] = runs[name]()
+            except ImportError as e:
+                print(f"   ⚠️  Skipped ({e})")
+                report["results"][name] = {"skipped": str(e)}
+            except Exception as e:
+                print(f"   ❌ Failed: {type(e).__name__}: {e}")
+                report["results"][name] = {"error": f"{type(e).__name__}: {e}"}
+
+    os.makedirs(args.output_dir, exist_ok=True)
+    output = os.path.join(args.output_dir, f"benchmark_{stamp}.json")
+    with open(output, "w", encoding="utf-8") as f:
+        json.dump(report, f, indent=2)
+
+    previous = previous_result(args.output_dir, exclude=output)
+    print(f"\n>>> Results (vs {previous['timestamp'] if previous else 'no previous run'}):")
+    print(format_diff(report, previous))
+    print(f"\n✅ Saved to {output}")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,9 +1,12 @@
 import os
 import sys
-import subprocess
 import shutil
+import argparse
 from pathlib import Path
 
+from agent_orchestrator.pipeline_dag import Stage, PipelineRunner, run_script
+from agent_orchestrator.profiling import count_rows, count_files, format_summary
+
 # Try to load dotenv
 try:
     from dotenv import load_dotenv
@@ -11,26 +14,29 @@ try:
 except ImportError:
     pass
 
+SCHOLAR_CSV = "data/raw/google_scholar_organic_results.csv"
+CONCEPTS_TABLE = "data/processed/search_results_concepts.arrow"
+CONCEPTS_EXCEL = "data/processed/search_results_processed_concepts_v3.xlsx"
+POLICY_FOLDER = "data/raw_policies"
+KB_ALIAS = "data/chroma_versions/CURRENT"
+SNAPSHOT_DIR = "data/snapshots/policy_embeddings"
+GRAPH_OUTPUTS = [
+    "data/processed/network_graph.html",
+    "data/processed/cooccurence_network.gexf",
+    "data/processed/network_statistics.csv",
+    "data/processed/node_statistics.csv",
+]
+
 def print_step(message):
     print(f"\n\033[0;36m>>> {message}\033[0m")
 
-def run_command(command):
-    """Runs a command and stops the pipeline if it fails."""
-    try:
-        if command[0] == "python":
-            command[0] = sys.executable
-        subprocess.run(command, check=True, shell=False)
-    except subprocess.CalledProcessError:
-        print(f"\n\033[0;31m❌ Error occurred while running: {' '.join(command)}\033[0m")
-        sys.exit(1)
-
 def run_scraper_with_fallback():
     """
     Attempts to scrape. If it fails (API error/expired key), 
     it falls back to local data instead of crashing.
     """
-    cmd = [sys.executable, "knowledge_base/scrape_google_scholar.py"]
-    csv_path = Path("data/raw/google_scholar_organic_results.csv")
+    script = "knowledge_base/scrape_google_scholar.py"
+    csv_path = Path(SCHOLAR_CSV)
     
     # Check if we even have an API key configured
     api_key = os.getenv("SERPAPI_KEY") or os.getenv("SERPAPI_API_KEY")
@@ -40,11 +46,11 @@ def run_scraper_with_fallback():
             raise Exception("No API Key configured in .env")
 
         print("   [Attempting to scrape via SerpApi...]")
-        # check=True will raise CalledProcessError if the script exits with status 1
-        subprocess.run(cmd, check=True, shell=False)
+        # run_script raises RuntimeError if the script exits with status 1
+        run_script(script)
         print("   [Success] Fresh data acquired.")
 
-    except (subprocess.CalledProcessError, Exception) as e:
+    except Exception as e:
         # SCRAPER FAILED. Now we check for the safety net.
         print(f"\n\033[0;33m⚠️  Scraping Failed or Skipped (Reason: {e})\033[0m")
         
@@ -53,13 +59,12 @@ def run_scraper_with_fallback():
             print("   Continuing pipeline using cached data...")
             return # This counts as "Success" because we have data to work with
         else:
-            # NO API + NO DATA = CRASH
+            # NO API + NO DATA = FAIL (everything downstream is blocked)
             print("\n\033[0;31m❌ CRITICAL FAILURE: Scraper failed and no local cache found.\033[0m")
             print("   Please fix your API key or restore a backup CSV file.")
-            sys.exit(1)
+            raise RuntimeError("Scraper failed and no local cache found")
 
 def copy_assets():
-    print_step("Copying outputs to app/assets...")
     dest_dir = Path("app/assets")
     dest_dir.mkdir(parents=True, exist_ok=True)
     
@@ -67,6 +72,7 @@ def copy_assets():
         "data/processed/network_graph.html": "network_graph.html",
         "data/processed/cooccurence_network.gexf": "cooccurence_network.gexf",
         "data/processed/network_statistics.csv": "network_statistics.csv",
+        "data/processed/node_statistics.csv": "node_statistics.csv",
         "data/processed/keyword_stats.json": "keyword_stats.json"
     }
     
@@ -83,31 +89,61 @@ def copy_assets():
         print("   [+] Moved generated 'lib' to app/assets/lib")
 
 
+def build_stages():
+    """
+    The pipeline as a DAG. The graph branch and the PDF download/ingestion
+    branch only share the scrape step, so they run in parallel.
+    """
+    return [
+        Stage("scrape", run_scraper_with_fallback, "Step 1: Scraping Google Scholar",
+              outputs=[SCHOLAR_CSV], always_run=True, items=lambda: count_rows(SCHOLAR_CSV)),
+        Stage("preprocess", "data_governance/preprocess_results.py", "Step 2: Preprocessing Results",
+              inputs=[SCHOLAR_CSV], after=["scrape"]),
+        Stage("retrieve_keywords", "knowledge_base/retrieve_pdfs_keywords.py", "Step 3: Retrieving Keywords",
+              after=["preprocess"]),
+        Stage("extract_keywords", "specialized_agents/extract_keywords.py", "Step 4: Extracting Keywords",
+              after=["retrieve_keywords"]),
+        Stage("network_graph", "specialized_agents/graph_analytics.py", "Step 5: Generating Network Graph",
+              inputs=[CONCEPTS_TABLE, CONCEPTS_EXCEL], outputs=GRAPH_OUTPUTS, after=["extract_keywords"],
+              items=lambda: count_rows("data/processed/network_statistics.csv")),
+        Stage("download_pdfs", "knowledge_base/retrieve_pdfs.py", "Step 6a: Downloading PDFs",
+              inputs=[SCHOLAR_CSV], outputs=[POLICY_FOLDER], after=["scrape"],
+              items=lambda: count_files(POLICY_FOLDER, ".pdf")),
+        # A new knowledge base version (chunks and compiled eligibility
+        # rules); the alias only flips once it is complete
+        Stage("ingest", "knowledge_base/index_versions.py", "Step 6b: Building a new Vector DB version",
+              args=["--build", "--policy-folder", POLICY_FOLDER],
+              inputs=[POLICY_FOLDER], outputs=[KB_ALIAS], after=["download_pdfs"],
+              items=lambda: count_files(POLICY_FOLDER, ".pdf")),
+        Stage("snapshot", "knowledge_base/embedding_snapshot.py", "Step 6c: Exporting Embedding Snapshot",
+              inputs=[KB_ALIAS], outputs=[SNAPSHOT_DIR], after=["ingest"]),
+        Stage("copy_assets", copy_assets, "Copying outputs to app/assets",
+              inputs=GRAPH_OUTPUTS, outputs=["app/assets/network_graph.html"], after=["network_graph"]),
+    ]
+
+
 def main():
+    parser = argparse.ArgumentParser(description="Run the AI-Gov data pipeline.")
+    parser.add_argument("--force", action="store_true", help="Ignore the stage cache and rerun everything.")
+    parser.add_argument("--jobs", type=int, default=4, help="Maximum number of stages run in parallel.")
+    parser.add_argument("--profile", action="store_true",
+                        help="Also write a cProfile dump per stage to data/processed/profiles/.")
+    args = parser.parse_args()
+
     print_step("Starting AI-Gov Framework Pipeline (Resilient Mode)...")
 
-    # 1. SPECIAL STEP: Scrape with Fallback
-    print_step("Step 1: Scraping Google Scholar")
-    run_scraper_with_fallback()
-
-    # 2. STANDARD STEPS: Processing
-    # These steps operate on the data (whether fresh or cached)
-    steps = [
-        ("Step 2: Preprocessing Results",   ["python", "data_governance/preprocess_results.py"]),
-        ("Step 3: Retrieving Keywords",     ["python", "knowledge_base/retrieve_pdfs_keywords.py"]),
-        ("Step 4: Extracting Keywords",     ["python", "specialized_agents/extract_keywords.py"]),
-        ("Step 5: Generating Network Graph",["python", "specialized_agents/save_network.py"]),
-        ("Step 6a: Downloading PDFs",       ["python", "knowledge_base/retrieve_pdfs.py"]),
-        ("Step 6b: Ingesting into Vector DB",["python", "knowledge_base/ingest_policies.py"]),
-    ]
+    runner = PipelineRunner(build_stages(), max_workers=args.jobs, profile=args.profile)
+    report = runner.run(force=args.force)
+    print()
+    print(format_summary(report, runner.previous_report))
+    if report["profile_dir"]:
+        print(f"   [Profile] cProfile dumps in {report['profile_dir']}")
 
-    for title, cmd in steps:
-        print_step(title)
-        run_command(cmd)
+    if not report["success"]:
+        print("\n\033[0;31m❌ Pipeline finished with failed stages.\033[0m")
+        sys.exit(1)
 
-    # 3. Finalize
-    copy_assets()
     print("\n\033[0;32m>>> Pipeline Completed Successfully! 🚀\033[0m")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    main()
@@ -1,19 +1,79 @@
 import json
+import logging
+import threading
+
+from specialized_agents.eligibility_rules import RuleIndex, RULE_INDEX_FILE, extract_facts
+
+logger = logging.getLogger(__name__)
+
+DECISION_PROMPT = (
+    "You check citizen requests against government policies. Reply with JSON only: "
+    '{"status": "LIKELY_ELIGIBLE" | "NOT_ELIGIBLE" | "NEEDS_INFORMATION" | "PENDING_REVIEW", '
+    '"reason": "<one sentence>", "confidence": <0..1>, "next_step": "<what the citizen should do>"}'
+)
 
 class ComplianceAgent:
     """
     The 'Expert' that evaluates if a request meets regulations [Chapter 4.1].
+    Requests covered by the compiled rule index are decided on the fast path;
+    everything else goes to the (slow) policy-reading path, which asks the
+    LLM when one is configured. When the knowledge base serves a versioned
+    build, the rule index compiled with that version is used, so the rules
+    always match the policies being retrieved.
     """
-    def __init__(self):
-        print(">>> Compliance Agent Activated.")
+    def __init__(self, rule_index_path=RULE_INDEX_FILE, llm=None, knowledge_base=None):
+        self.rule_index = RuleIndex.load(rule_index_path)
+        self.knowledge_base = knowledge_base
+        self.llm = llm
+        self.stats = {"total": 0, "fast_path": 0}
+        self._stats_lock = threading.Lock()
+        print(f">>> Compliance Agent Activated ({len(self.current_rule_index())} policies with compiled rules).")
+
+    def fallback_decision(self, reason):
+        # Used when the evaluation times out or fails: default to safety
+        return {
+            "status": "PENDING_REVIEW",
+            "reason": reason,
+            "confidence": 0.0,
+            "next_step": "Human Verification Required"
+        }
+
+    def current_rule_index(self):
+        # Switched by the knowledge base together with the collection
+        versioned = getattr(self.knowledge_base, "rule_index", None)
+        return versioned if versioned is not None else self.rule_index
+
+    def fast_path_ratio(self):
+        return self.stats["fast_path"] / self.stats["total"] if self.stats["total"] else 0.0
 
-    def evaluate(self, request_text, policy_context):
+    def evaluate(self, request_text, policy_context, policy_ids=()):
         """
         Compares the User's Request vs. The Official Policy.
         Returns a structured decision.
         """
-        print(f"   [ComplianceAgent] Evaluating request against {len(policy_context)} policies...")
-        
+        logger.debug("[ComplianceAgent] Evaluating request against %d policies...", len(policy_context))
+
+        rule_index = self.current_rule_index()
+        decision = None
+        if policy_ids and len(rule_index):
+            decision = rule_index.evaluate(policy_ids, extract_facts(request_text))
+
+        with self._stats_lock:
+            self.stats["total"] += 1
+            if decision is not None:
+                self.stats["fast_path"] += 1
+
+        if decision is not None:
+            return decision
+
+        return self._evaluate_slow(request_text, policy_context)
+
+    def _evaluate_slow(self, request_text, policy_context):
+        if self.llm is not None and policy_context:
+            decision = self._evaluate_llm(request_text, policy_context)
+            if decision is not None:
+                return decision
+
         # MOCK LLM LOGIC (Replace with real LLM API call in production)
         # Logic: If we found a policy, we assume we need to check it.
         
@@ -34,4 +94,24 @@ class ComplianceAgent:
             "next_step": "Human Verification Required"
         }
         
-        return decision
\ No newline at end of file
+        return decision
+
+    def _evaluate_llm(self, request_text, policy_context):
+        """
+        Returns the LLM's decision, or None if the call fails or the reply
+        is not a usable JSON decision (the mock logic is used instead).
+        """
+        policies = "\n\n".join(policy_context)
+        try:
+            reply = self.llm.complete(f"Policies:\n{policies}\n\nRequest: {request_text}",
+                                      system=DECISION_PROMPT)
+            decision = json.loads(reply[reply.find("{"):reply.rfind("}") + 1])
+        except Exception as e:
+            logger.warning("[ComplianceAgent] LLM decision unavailable: %s", e)
+            return None
+
+        if not isinstance(decision, dict) or "status" not in decision:
+            return None
+        decision.setdefault("confidence", 0.5)
+        decision["decided_by"] = "llm"
+        return decision
@@ -0,0 +1,307 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+The eligibility_rules.py module gives the Compliance Agent a fast path.
+Offline, it extracts structured eligibility rules (income thresholds,
+residency years, required documents) from the ingested policy chunks and
+stores them in a rule index keyed by policy ID. At request time the index
+is compiled into plain tuples, so a decision is a few comparisons.
+"""
+
+import os
+import re
+import sys
+import json
+import time
+import operator
+
+# --- CONFIGURATION ---
+DB_PATH = "data/chroma_db"
+COLLECTION_NAME = "policy_knowledge_base"
+RULE_INDEX_FILE = "data/processed/rule_index.json"
+
+_AMOUNT = r"(?:rs\.?|inr|usd|\$|₹)?\s*(\d[\d,]*(?:\.\d+)?)\s*(k|thousand|lakhs?|million)?\b"
+_MULTIPLIERS = {"k": 1e3, "thousand": 1e3, "lakh": 1e5, "lakhs": 1e5, "million": 1e6}
+
+# Policy-side patterns
+INCOME_RULE = re.compile(
+    r"income[^.\n]{0,60}?\b(less than|below|under|lower than|not exceed(?:ing)?|up to|at most|"
+    r"more than|above|greater than|at least|minimum of)\s*" + _AMOUNT,
+    re.IGNORECASE,
+)
+RESIDENCY_RULE = re.compile(
+    r"resident[^.\n]{0,60}?\b(?:at least|minimum of|not less than|more than)\s+(\d+)\s+years?",
+    re.IGNORECASE,
+)
+DOCUMENTS_HEADING = re.compile(
+    r"(documentation required|documents required|required documents|documents to be submitted)",
+    re.IGNORECASE,
+)
+BULLET = re.compile(r"^\s*(?:[-•*]|\(?[a-z0-9]\))\s*(.+)$", re.IGNORECASE)
+
+# Request-side patterns. An income counts only with a currency marker, a
+# unit or a grouped amount ("40,000"), so years ("in 2024") and durations
+# ("3 years ago") are not read as income; ages and "years ago" are not
+# read as residency.
+INCOME_FACT = re.compile(
+    r"\b(?:income|earn(?:s|ed|ing)?|salary)\b[^.\n]{0,40}?"
+    r"(?:(?:\brs\.?|\binr|\busd|\$|₹)\s*(\d[\d,]*(?:\.\d+)?)"
+    r"|(?<![\d,.])(\d{1,3}(?:,\d{2,3})+(?:\.\d+)?|\d+(?:\.\d+)?(?=\s*(?:k|thousand|lakhs?|million)\b)))"
+    r"\s*(k|thousand|lakhs?|million)?\b",
+    re.IGNORECASE,
+)
+_NOT_RESIDENCY = r"(?!\s+(?:old|of age|ago|back)\b)"
+RESIDENCY_FACT = re.compile(
+    r"\b(?:lived|living|resident|residing|stayed|been here)\b[^.\n]{0,40}?(?<!\bage )(?<!\baged )\b(\d+)\s+years?\b"
+    + _NOT_RESIDENCY +
+    r"|\b(\d+)\s+years?\b" + _NOT_RESIDENCY + r"[^.\n]{0,30}?\b(?:resident|in the state|here)\b",
+    re.IGNORECASE,
+)
+
+_UPPER_BOUND = {"less than": "<", "below": "<", "under": "<", "lower than": "<",
+                "not exceed": "<=", "not exceeding": "<=", "up to": "<=", "at most": "<="}
+_LOWER_BOUND = {"more than": ">", "above": ">", "greater than": ">",
+                "at least": ">=", "minimum of": ">="}
+
+
+def parse_amount(number, unit):
+    value = float(number.replace(",", ""))
+    if unit:
+        value *= _MULTIPLIERS[unit.lower()]
+    return value
+
+
+# -------------------------------
+# Offline extraction
+# -------------------------------
+
+def extract_rules(text):
+    """
+    Pulls eligibility rules out of one policy's text.
+    Returns a dict with only the rule types that were found.
+    """
+    rules = {}
+
+    for match in INCOME_RULE.finditer(text):
+        phrase = match.group(1).lower()
+        value = parse_amount(match.group(2), match.group(3))
+        if phrase in _UPPER_BOUND:
+            # Keep the strictest ceiling if a policy states several
+            op = _UPPER_BOUND[phrase]
+            current = rules.get("max_income")
+            if current is None or value < current["value"]:
+                rules["max_income"] = {"op": op, "value": value}
+        else:
+            op = _LOWER_BOUND[phrase]
+            current = rules.get("min_income")
+            if current is None or value > current["value"]:
+                rules["min_income"] = {"op": op, "value": value}
+
+    years = [int(m.group(1)) for m in RESIDENCY_RULE.finditer(text)]
+    if years:
+        rules["min_residency_years"] = max(years)
+
+    documents = extract_documents(text)
+    if documents:
+        rules["required_documents"] = documents
+
+    return rules
+
+
+def extract_documents(text):
+    documents = []
+    lines = text.splitlines()
+
+    for i, line in enumerate(lines):
+        if not DOCUMENTS_HEADING.search(line):
+            continue
+        for item in lines[i + 1:]:
+            if not item.strip():
+                continue
+            bullet = BULLET.match(item)
+            if not bullet:
+                break
+            name = bullet.group(1).strip().rstrip(".;")
+            if name and name not in documents:
+                documents.append(name)
+
+    return documents
+
+
+def load_policy_texts(db_path=DB_PATH, collection_name=COLLECTION_NAME, page_size=1000):
+    """
+    Reassembles each ingested policy from its chunks (ordered by chunk_index).
+    Chunks overlap, which only matters for duplicates and those are removed.
+    """
+    import chromadb
+
+    client = chromadb.PersistentClient(path=db_path)
+    collection = client.get_or_create_collection(name=collection_name)
+
+    chunks = {}
+    offset = 0
+    while True:
+        page = collection.get(include=["documents", "metadatas"], limit=page_size, offset=offset)
+        if not page["ids"]:
+            break
+        for document, metadata in zip(page["documents"], page["metadatas"]):
+            source = (metadata or {}).get("source", "unknown")
+            chunks.setdefault(source, []).append(((metadata or {}).get("chunk_index", 0), document))
+        offset += len(page["ids"])
+
+    return {source: "\n".join(doc for _, doc in sorted(parts)) for source, parts in chunks.items()}
+
+
+def build_rule_index(db_path=DB_PATH, collection_name=COLLECTION_NAME, output_file=RULE_INDEX_FILE):
+    print(f">>> Extracting eligibility rules from '{collection_name}' in {db_path}...")
+    index = {}
+    for policy_id, text in load_policy_texts(db_path, collection_name).items():
+        rules = extract_rules(text)
+        if rules:
+            index[policy_id] = rules
+
+    os.makedirs(os.path.dirname(output_file), exist_ok=True)
+    tmp_path = output_file + ".tmp"
+    with open(tmp_path, "w", encoding="utf-8") as f:
+        json.dump(index, f, indent=2, ensure_ascii=False)
+    os.replace(tmp_path, output_file)
+
+    print(f"✅ Rule index with {len(index)} policies saved to {output_file}")
+    return index
+
+
+# -------------------------------
+# Request-time evaluation
+# -------------------------------
+
+_COMPARE = {"<": operator.lt, "<=": operator.le, ">": operator.gt, ">=": operator.ge}
+
+
+def extract_facts(request_text):
+    """
+    Income and residency stated in a request. A fact with conflicting
+    candidates is left out and named in facts["ambiguous"], so the rule
+    index defers to the slow path instead of guessing.
+    """
+    candidates = {
+        "income": {parse_amount(m.group(1) or m.group(2), m.group(3)) for m in INCOME_FACT.finditer(request_text)},
+        "residency_years": {int(m.group(1) or m.group(2)) for m in RESIDENCY_FACT.finditer(request_text)},
+    }
+    facts = {}
+    for name, values in candidates.items():
+        if len(values) == 1:
+            facts[name] = values.pop()
+        elif values:
+            facts.setdefault("ambiguous", []).append(name)
+    return facts
+
+
+class RuleIndex:
+    """
+    Rule index compiled for evaluation: one tuple of checks per policy,
+    each check being (fact name, comparator, threshold, description).
+    """
+    def __init__(self, index):
+        self.checks = {}
+        self.documents = {}
+        for policy_id, rules in index.items():
+            checks = []
+            for key in ("max_income", "min_income"):
+                if key in rules:
+                    op, value = rules[key]["op"], rules[key]["value"]
+                    checks.append(("income", _COMPARE[op], value, f"annual income {op} {value:,.0f}"))
+            if "min_residency_years" in rules:
+                years = rules["min_residency_years"]
+                checks.append(("residency_years", _COMPARE[">="], years,
+                               f"resident for at least {years} years"))
+            self.checks[policy_id] = tuple(checks)
+            self.documents[policy_id] = tuple(rules.get("required_documents", ()))
+
+    @classmethod
+    def load(cls, path=RULE_INDEX_FILE):
+        if not os.path.exists(path):
+            return cls({})
+        with open(path, encoding="utf-8") as f:
+            return cls(json.load(f))
+
+    def __len__(self):
+        return len(self.checks)
+
+    def evaluate(self, policy_ids, facts):
+        """
+        Decides against the first retrieved policy that has rules.
+        Returns None when no retrieved policy has rules, or when a fact it
+        checks was ambiguous in the request (slow path needed).
+        """
+        for policy_id in policy_ids:
+            if policy_id not in self.checks:
+                continue
+
+            checks = self.checks[policy_id]
+            documents = self.documents[policy_id]
+            if any(check[0] in facts.get("ambiguous", ()) for check in checks):
+                return None
+            failed, missing = [], []
+            for fact, compare, threshold, description in checks:
+                if fact not in facts:
+                    missing.append(description)
+                elif not compare(facts[fact], threshold):
+                    failed.append(description)
+
+            if failed:
+                status, confidence = "NOT_ELIGIBLE", 0.9
+                reason = f"Policy {policy_id} requires: {'; '.join(failed)}."
+                next_step = "Human Verification Required"
+            elif missing:
+                status, confidence = "NEEDS_INFORMATION", 0.7
+                reason = f"Policy {policy_id} requires: {'; '.join(missing)}."
+                next_step = "Please provide: " + "; ".join(missing)
+            else:
+                status, confidence = "LIKELY_ELIGIBLE", 0.8
+                reason = f"Request meets the stated criteria of policy {policy_id}."
+                next_step = "Submit required documents" if documents else "Human Verification Required"
+
+            return {
+                "status": status,
+                "reason": reason,
+                "confidence": confidence,
+                "next_step": next_step,
+                "policy_id": policy_id,
+                "required_documents": list(documents),
+                "decided_by": "rule_index",
+            }
+
+        return None
+
+
+def benchmark(n=100_000):
+    """
+    Times fast-path decisions on the mock housing order's rules.
+    """
+    index = RuleIndex({"GO_Housing_Subsidy_2025.pdf": extract_rules(
+        "- The applicant must be a resident of the state for at least 3 years.\n"
+        "- Annual family income must be less than $45,000.\n"
+        "2. DOCUMENTATION REQUIRED:\n"
+        "- Valid Government ID (Driver's License / Voter ID).\n"
+        "- Income Certificate issued by a Gazetted Officer.\n"
+    )})
+    request = "I earn $38,000 a year and have lived here for 5 years. I need a housing subsidy."
+    policy_ids = ["GO_Housing_Subsidy_2025.pdf"]
+
+    start = time.perf_counter()
+    for _ in range(n):
+        index.evaluate(policy_ids, extract_facts(request))
+    per_decision = (time.perf_counter() - start) / n * 1e6
+
+    print(f"Fast-path decision: {per_decision:.1f} µs (fact extraction + rule checks)")
+    print(index.evaluate(policy_ids, extract_facts(request)))
+
+
+if __name__ == "__main__":
+    if "--benchmark" in sys.argv:
+        benchmark()
+    else:
+        sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+        from knowledge_base.index_versions import served_db_path
+        build_rule_index(served_db_path(DB_PATH))
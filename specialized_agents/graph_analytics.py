@@ -0,0 +1,434 @@
+#!/usr/bin/env python
+# -*- coding: utf-8 -*-
+
+"""
+The graph_analytics.py module maintains the keyword co-occurrence network
+incrementally. Each run only applies the documents that were added, changed
+or removed since the last one to a persisted count table; statistics are
+computed with sparse linear algebra and the CSV, GEXF and HTML outputs are
+streamed straight to disk (no NetworkX/PyVis graph).
+"""
+
+import os
+import sys
+import json
+import datetime
+from collections import Counter
+from itertools import combinations
+from xml.sax.saxutils import quoteattr
+
+import numpy as np
+import pandas as pd
+from scipy import sparse
+from scipy.sparse.linalg import eigsh, ArpackNoConvergence
+
+# Add parent directory to path so we can import our other modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data_governance.table_store import read_table
+
+
+# --- CONFIGURATION ---
+OUTPUT_DIR = 'data/processed'
+STATE_FILE = os.path.join(OUTPUT_DIR, 'cooccurrence_state.json')
+
+# Level-of-detail views for the browser: (label, max nodes, max edges)
+LOD_LEVELS = [
+    ('Overview', 50, 150),
+    ('Detailed', 200, 800),
+    ('Full', 1000, 5000),
+]
+
+
+def main():
+    data = read_table('search_results_concepts', columns=['title', 'concepts'])
+
+    state = load_state()
+    changes = update_cooccurrence(state, data)
+    save_state(state)
+    print(f"Co-occurrence counts updated: {changes['added']} added, {changes['changed']} changed, "
+          f"{changes['removed']} removed documents ({len(state['documents'])} total).")
+
+    labels, adjacency = build_adjacency(state)
+    stats = compute_statistics(labels, adjacency)
+
+    write_edge_csv(state, os.path.join(OUTPUT_DIR, 'network_statistics.csv'))
+    write_node_csv(labels, stats, os.path.join(OUTPUT_DIR, 'node_statistics.csv'))
+    write_gexf(state, labels, stats, os.path.join(OUTPUT_DIR, 'cooccurence_network.gexf'))
+    write_lod_html(state, labels, stats, os.path.join(OUTPUT_DIR, 'network_graph.html'))
+
+    print(f"Network outputs ({len(labels)} nodes, {len(state['edges'])} edges) "
+          f"saved to: {OUTPUT_DIR}")
+
+
+# -------------------------------
+# Incremental co-occurrence counts
+# -------------------------------
+
+def load_state(filepath=STATE_FILE):
+    """
+    The persisted counts: {'documents': {document id: concepts}, 'nodes':
+    {term: documents}, 'edges': {"a\tb": weight}}. A state in any other
+    format is rebuilt from scratch.
+    """
+    if os.path.exists(filepath):
+        with open(filepath, encoding='utf-8') as f:
+            state = json.load(f)
+        if isinstance(state.get('documents'), dict):
+            return state
+
+    return {'documents': {}, 'nodes': {}, 'edges': {}}
+
+
+def save_state(state, filepath=STATE_FILE):
+    os.makedirs(os.path.dirname(filepath), exist_ok=True)
+
+    # Write-then-rename so an interrupted run never leaves a truncated state
+    tmp_path = filepath + '.tmp'
+    with open(tmp_path, 'w', encoding='utf-8') as f:
+        json.dump(state, f, ensure_ascii=False)
+    os.replace(tmp_path, filepath)
+
+
+def document_ids(titles):
+    """
+    One id per row: the title, numbered from the second row that shares it
+    ("title", "title\x001", ...), so a document keeps its id when its
+    concepts are re-extracted.
+    """
+    seen = Counter()
+    ids = []
+    for title in titles:
+        title = '' if pd.isna(title) else str(title)
+        ids.append(title if not seen[title] else f"{title}\x00{seen[title]}")
+        seen[title] += 1
+    return ids
+
+
+def split_concepts(concepts):
+    # Same normalisation as save_network.py
+    return [x.strip().replace(' ', '') for x in str(concepts).split(',')]
+
+
+def apply_document(state, concepts, sign):
+    """
+    Adds (sign=1) or subtracts (sign=-1) one document's keyword pairs.
+    An edge weight is the sum over documents of count(a) * count(b), which
+    matches the dot product of the one-hot matrix used by save_network.py.
+    """
+    nodes = state['nodes']
+    edges = state['edges']
+    counts = Counter(split_concepts(concepts))
+
+    for term in counts:
+        nodes[term] = nodes.get(term, 0) + sign
+        if not nodes[term]:
+            del nodes[term]
+
+    for a, b in combinations(sorted(counts), 2):
+        edge = f"{a}\t{b}"
+        edges[edge] = edges.get(edge, 0) + sign * counts[a] * counts[b]
+        if not edges[edge]:
+            del edges[edge]
+
+
+def update_cooccurrence(state, data):
+    """
+    Brings the counts in line with `data`: documents that are new are added,
+    documents whose concepts changed are subtracted and re-added, and
+    documents no longer in the table are subtracted.
+    Returns the number of added, changed and removed documents.
+    """
+    titles = data['title'] if 'title' in data else pd.Series('', index=data.index)
+    current = {doc_id: str(concepts) for doc_id, concepts in zip(document_ids(titles), data['concepts'])
+               if str(concepts) != 'nan'}
+    documents = state['documents']
+    changes = {'added': 0, 'changed': 0, 'removed': 0}
+
+    for doc_id in [doc_id for doc_id in documents if doc_id not in current]:
+        apply_document(state, documents.pop(doc_id), -1)
+        changes['removed'] += 1
+
+    for doc_id, concepts in current.items():
+        old = documents.get(doc_id)
+        if old == concepts:
+            continue
+        if old is None:
+            changes['added'] += 1
+        else:
+            apply_document(state, old, -1)
+            changes['changed'] += 1
+        apply_document(state, concepts, 1)
+        documents[doc_id] = concepts
+
+    return changes
+
+
+# -------------------------------
+# Sparse statistics
+# -------------------------------
+
+def build_adjacency(state):
+    """
+    Returns the node labels and a symmetric CSR weight matrix.
+    Only nodes that take part in at least one edge are kept.
+    """
+    pairs = [edge.split('\t') for edge in state['edges']]
+    labels = sorted({term for pair in pairs for term in pair})
+    index = {label: i for i, label in enumerate(labels)}
+
+    rows = np.fromiter((index[a] for a, _ in pairs), dtype=np.int64, count=len(pairs))
+    cols = np.fromiter((index[b] for _, b in pairs), dtype=np.int64, count=len(pairs))
+    weights = np.fromiter(state['edges'].values(), dtype=np.float64, count=len(pairs))
+
+    n = len(labels)
+    upper = sparse.coo_matrix((weights, (rows, cols)), shape=(n, n))
+    adjacency = (upper + upper.T).tocsr()
+
+    return labels, adjacency
+
+
+def compute_statistics(labels, adjacency):
+    n = len(labels)
+    if n == 0:
+        return {key: np.zeros(0) for key in
+                ('degree', 'weighted_degree', 'degree_centrality', 'eigenvector_centrality')}
+
+    degree = np.diff(adjacency.indptr).astype(np.int64)
+    weighted_degree = np.asarray(adjacency.sum(axis=1)).ravel()
+    degree_centrality = degree / (n - 1) if n > 1 else np.zeros(n)
+
+    return {
+        'degree': degree,
+        'weighted_degree': weighted_degree,
+        'degree_centrality': degree_centrality,
+        'eigenvector_centrality': eigenvector_centrality(adjacency),
+    }
+
+
+def eigenvector_centrality(adjacency, max_iter=1000, tol=1e-6):
+    """
+    Leading eigenvector of the weighted adjacency matrix, scaled like
+    networkx.eigenvector_centrality (unit Euclidean norm, non-negative).
+    """
+    n = adjacency.shape[0]
+    if n < 3:
+        vector = np.ones(n)
+    else:
+        try:
+            _, vectors = eigsh(adjacency, k=1, which='LA', maxiter=max_iter, tol=tol)
+            vector = vectors[:, 0]
+        except ArpackNoConvergence:
+            vector = power_iteration(adjacency, max_iter, tol)
+
+    vector = np.abs(vector)
+    norm = np.linalg.norm(vector)
+    return vector / norm if norm else vector
+
+
+def power_iteration(adjacency, max_iter, tol):
+    n = adjacency.shape[0]
+    vector = np.full(n, 1.0 / n)
+    for _ in range(max_iter):
+        previous = vector
+        # Shifting by the identity keeps the iteration stable on bipartite parts
+        vector = adjacency @ vector + vector
+        vector /= np.linalg.norm(vector)
+        if np.abs(vector - previous).sum() < n * tol:
+            break
+
+    return vector
+
+
+# -------------------------------
+# Streaming writers
+# -------------------------------
+
+def iter_edges(state):
+    for edge, weight in state['edges'].items():
+        source, target = edge.split('\t')
+        yield source, target, weight
+
+
+def write_edge_csv(state, filepath):
+    # Gephi edge-table layout, as previously exported to network_statistics.csv
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write('Source,Target,Type,Id,Label,Weight\n')
+        for i, (source, target, weight) in enumerate(iter_edges(state)):
+            f.write(f"{csv_field(source)},{csv_field(target)},Undirected,{i},,{weight}\n")
+
+
+def write_node_csv(labels, stats, filepath):
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write('Id,Label,Degree,WeightedDegree,DegreeCentrality,EigenvectorCentrality\n')
+        for i, label in enumerate(labels):
+            f.write(
+                f"{csv_field(label)},{csv_field(label)},{stats['degree'][i]},"
+                f"{stats['weighted_degree'][i]:g},{stats['degree_centrality'][i]:.6f},"
+                f"{stats['eigenvector_centrality'][i]:.6f}\n"
+            )
+
+
+def csv_field(value):
+    if any(c in value for c in ',"\n'):
+        return '"' + value.replace('"', '""') + '"'
+    return value
+
+
+def write_gexf(state, labels, stats, filepath):
+    attributes = ['degree', 'weighted_degree', 'degree_centrality', 'eigenvector_centrality']
+    types = ['integer', 'double', 'double', 'double']
+
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write("<?xml version='1.0' encoding='utf-8'?>\n")
+        f.write('<gexf xmlns="http://www.gexf.net/1.2draft" '
+                'xmlns:xsi="http://www.w3.org/2001/XMLSchema-instance" '
+                'xsi:schemaLocation="http://www.gexf.net/1.2draft '
+                'http://www.gexf.net/1.2draft/gexf.xsd" version="1.2">\n')
+        f.write(f'  <meta lastmodifieddate="{datetime.date.today().isoformat()}">\n')
+        f.write('    <creator>AI-Gov graph_analytics</creator>\n')
+        f.write('  </meta>\n')
+        f.write('  <graph defaultedgetype="undirected" mode="static" name="">\n')
+
+        f.write('    <attributes class="node" mode="static">\n')
+        for i, (name, kind) in enumerate(zip(attributes, types)):
+            f.write(f'      <attribute id="{i}" title="{name}" type="{kind}" />\n')
+        f.write('    </attributes>\n')
+
+        f.write('    <nodes>\n')
+        for i, label in enumerate(labels):
+            f.write(f'      <node id={quoteattr(label)} label={quoteattr(label)}>\n')
+            f.write('        <attvalues>\n')
+            for j, name in enumerate(attributes):
+                f.write(f'          <attvalue for="{j}" value="{stats[name][i]:g}" />\n')
+            f.write('        </attvalues>\n')
+            f.write('      </node>\n')
+        f.write('    </nodes>\n')
+
+        f.write('    <edges>\n')
+        for i, (source, target, weight) in enumerate(iter_edges(state)):
+            f.write(f'      <edge source={quoteattr(source)} target={quoteattr(target)} '
+                    f'id="{i}" weight="{weight}" />\n')
+        f.write('    </edges>\n')
+        f.write('  </graph>\n')
+        f.write('</gexf>\n')
+
+
+# -------------------------------
+# Level-of-detail HTML view
+# -------------------------------
+
+def build_lod_levels(state, labels, stats, levels=LOD_LEVELS):
+    """
+    Keeps the strongest nodes (by weighted degree) and, among them, the
+    heaviest edges. Each level is small enough for vis-network to render.
+    """
+    order = np.argsort(-stats['weighted_degree'], kind='stable')
+    edges = sorted(iter_edges(state), key=lambda e: -e[2])
+    views = []
+
+    for name, max_nodes, max_edges in levels:
+        keep = order[:max_nodes]
+        kept = {labels[i] for i in keep}
+        scale = stats['weighted_degree'][keep].max() if len(keep) else 1.0
+
+        nodes = [{
+            'id': labels[i],
+            'label': labels[i],
+            'value': float(stats['weighted_degree'][i]),
+            'title': (f"{labels[i]}<br>degree: {stats['degree'][i]}"
+                      f"<br>weighted degree: {stats['weighted_degree'][i]:g}"),
+            'size': float(8 + 30 * np.sqrt(stats['weighted_degree'][i] / scale)),
+        } for i in keep]
+
+        view_edges = []
+        for source, target, weight in edges:
+            if source in kept and target in kept:
+                view_edges.append({'from': source, 'to': target, 'value': weight,
+                                   'title': f"weight: {weight}"})
+                if len(view_edges) >= max_edges:
+                    break
+
+        views.append({'name': name, 'nodes': nodes, 'edges': view_edges})
+        if max_nodes >= len(labels):
+            break
+
+    return views
+
+
+HTML_TEMPLATE = """<html>
+    <head>
+        <meta charset="utf-8">
+        <link rel="stylesheet" href="https://cdnjs.cloudflare.com/ajax/libs/vis-network/9.1.2/dist/dist/vis-network.min.css" crossorigin="anonymous" referrerpolicy="no-referrer" />
+        <script src="https://cdnjs.cloudflare.com/ajax/libs/vis-network/9.1.2/dist/vis-network.min.js" crossorigin="anonymous" referrerpolicy="no-referrer"></script>
+        <style>
+            body {{ margin: 0; font-family: sans-serif; }}
+            #controls {{ padding: 6px 10px; }}
+            #mynetwork {{ width: 100%; height: 760px; background-color: white; }}
+        </style>
+    </head>
+    <body>
+        <div id="controls">
+            <label for="lod">Level of detail:</label>
+            <select id="lod"></select>
+            <span id="summary"></span>
+        </div>
+        <div id="mynetwork"></div>
+        <script type="text/javascript">
+            var levels = {levels};
+            var totals = {totals};
+            var container = document.getElementById("mynetwork");
+            var select = document.getElementById("lod");
+            var options = {{
+                nodes: {{ shape: "dot", font: {{ size: 14 }} }},
+                edges: {{ color: {{ opacity: 0.4 }}, smooth: false,
+                          scaling: {{ min: 1, max: 8 }} }},
+                physics: {{ solver: "forceAtlas2Based",
+                            stabilization: {{ iterations: 150 }} }},
+                interaction: {{ hideEdgesOnDrag: true, tooltipDelay: 100 }}
+            }};
+            var network = null;
+
+            function draw(i) {{
+                var level = levels[i];
+                if (network) {{ network.destroy(); }}
+                network = new vis.Network(container, {{
+                    nodes: new vis.DataSet(level.nodes),
+                    edges: new vis.DataSet(level.edges)
+                }}, options);
+                // Freeze the layout once settled so large levels stay responsive
+                network.once("stabilizationIterationsDone", function () {{
+                    network.setOptions({{ physics: false }});
+                }});
+                document.getElementById("summary").textContent =
+                    level.nodes.length + " of " + totals.nodes + " nodes, " +
+                    level.edges.length + " of " + totals.edges + " edges";
+            }}
+
+            levels.forEach(function (level, i) {{
+                var option = document.createElement("option");
+                option.value = i;
+                option.textContent = level.name;
+                select.appendChild(option);
+            }});
+            select.addEventListener("change", function () {{ draw(+select.value); }});
+            draw(0);
+        </script>
+    </body>
+</html>
+"""
+
+
+def write_lod_html(state, labels, stats, filepath, levels=LOD_LEVELS):
+    views = build_lod_levels(state, labels, stats, levels)
+    totals = {'nodes': len(labels), 'edges': len(state['edges'])}
+
+    # Escape '</' so keyword text can never close the script tag
+    payload = json.dumps(views, ensure_ascii=False).replace('</', '<\\/')
+
+    with open(filepath, 'w', encoding='utf-8') as f:
+        f.write(HTML_TEMPLATE.format(levels=payload, totals=json.dumps(totals)))
+
+
+if __name__ == '__main__':
+    main()
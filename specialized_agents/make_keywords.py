@@ -1,20 +1,72 @@
-import pandas as pd, json
-
-df = pd.read_excel('data/processed/search_results_processed_concepts_v3.xlsx')
-
-allc = []
-for x in df['concepts'].dropna():
-    for c in str(x).split(','):
-        allc.append(c.strip())
-
-cnt = pd.Series(allc).value_counts().head(30)
-
-out = {
-    'top_keywords': cnt.index.tolist(),
-    'top_counts': cnt.tolist()
-}
-
-with open('app/assets/keyword_stats.json', 'w', encoding='utf-8') as f:
-    json.dump(out, f, ensure_ascii=False, indent=2)
-
-print("keyword_stats.json generated successfully!")
+import pandas as pd, numpy as np, pyarrow as pa, json, os, sys, time
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+from data_governance.table_store import read_table
+
+OUTPUT_FILE = 'app/assets/keyword_stats.json'
+
+
+def count_concepts(concepts, top=30):
+    # split -> explode -> value_counts on Arrow strings stays in native code
+    # and keeps the first-seen order for ties, like the loop it replaces
+    text = concepts.dropna().astype(str).astype(pd.ArrowDtype(pa.string()))
+    terms = text.str.split(',').explode().str.strip()
+    counts = terms.value_counts().head(top)
+    counts.index = counts.index.astype(object)
+    return counts
+
+
+def count_concepts_loop(concepts, top=30):
+    # Previous implementation, kept as the reference for benchmark()
+    allc = []
+    for x in concepts.dropna():
+        for c in str(x).split(','):
+            allc.append(c.strip())
+
+    return pd.Series(allc).value_counts().head(top)
+
+
+def benchmark(n_rows=1_000_000, seed=0):
+    rng = np.random.default_rng(seed)
+    vocab = np.array([f"concept {i}" for i in range(500)])
+    concepts = pd.Series(vocab[rng.integers(0, len(vocab), n_rows)], dtype=object)
+    for _ in range(4):
+        concepts = concepts + ', ' + vocab[rng.integers(0, len(vocab), n_rows)]
+    concepts[rng.random(n_rows) < 0.1] = np.nan
+
+    start = time.perf_counter()
+    expected = count_concepts_loop(concepts)
+    loop_time = time.perf_counter() - start
+
+    start = time.perf_counter()
+    result = count_concepts(concepts)
+    vectorized_time = time.perf_counter() - start
+
+    assert expected.index.tolist() == result.index.tolist()
+    assert expected.tolist() == result.tolist()
+
+    print(f"Rows: {n_rows:,} | Loop: {loop_time:.2f}s | Vectorized: {vectorized_time:.2f}s "
+          f"({loop_time / vectorized_time:.1f}x faster, outputs identical)")
+
+
+def main():
+    df = read_table('search_results_concepts', columns=['concepts'])
+
+    cnt = count_concepts(df['concepts'])
+
+    out = {
+        'top_keywords': cnt.index.tolist(),
+        'top_counts': cnt.tolist()
+    }
+
+    with open(OUTPUT_FILE, 'w', encoding='utf-8') as f:
+        json.dump(out, f, ensure_ascii=False, indent=2)
+
+    print("keyword_stats.json generated successfully!")
+
+
+if __name__ == '__main__':
+    if '--benchmark' in sys.argv:
+        benchmark()
+    else:
+        main()
@@ -0,0 +1,95 @@
+import re
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (factor, weight, pattern). Sensitive domains follow the high-risk areas
+# of the EU AI Act: biometrics, essential services, health, law enforcement.
+RISK_FACTORS = [
+    ("biometric_or_surveillance", 0.35, re.compile(
+        r"\b(biometric|facial recognition|face recognition|surveillance|fingerprint|cctv)\b", re.I)),
+    ("health_data", 0.25, re.compile(
+        r"\b(medical|health|disability|diagnos\w*|hospital|mental)\b", re.I)),
+    ("law_enforcement", 0.25, re.compile(
+        r"\b(police|criminal|arrest|court|conviction|offence|offense)\b", re.I)),
+    ("vulnerable_person", 0.2, re.compile(
+        r"\b(child|children|minor|elderly|refugee|asylum|immigra\w*)\b", re.I)),
+    ("essential_service_decision", 0.2, re.compile(
+        r"\b(subsidy|benefit|welfare|loan|credit|eviction|pension|housing|scholarship)\b", re.I)),
+]
+
+# Masked PII left in the request by the Privacy Guard, e.g. <PERSON>
+PII_TAG = re.compile(r"<(PERSON|PHONE_NUMBER|EMAIL_ADDRESS|LOCATION|US_DRIVER_LICENSE)>")
+
+# Wording in the retrieved policies that signals a restricted activity
+POLICY_RESTRICTION = re.compile(
+    r"\b(prohibited|not permitted|shall not|unacceptable risk|banned|restricted)\b", re.I)
+
+RISK_LEVELS = [(0.6, "HIGH"), (0.3, "MEDIUM"), (0.0, "LOW")]
+
+
+class RiskAgent:
+    """
+    The 'Auditor' that scores how risky it is to act on a request [Chapter 4.1].
+    Rule-based and fast: it scans the masked request and the retrieved policies
+    for sensitive domains, personal data and restrictive policy language.
+    """
+    def __init__(self):
+        print(">>> Risk Agent Activated.")
+
+    def evaluate(self, request_text, policy_context, policy_ids=()):
+        """
+        Returns a structured risk assessment for the request.
+        """
+        logger.debug("[RiskAgent] Assessing request against %d policies...", len(policy_context))
+
+        factors = []
+        score = 0.0
+
+        for name, weight, pattern in RISK_FACTORS:
+            if pattern.search(request_text):
+                factors.append(name)
+                score += weight
+
+        pii = sorted(set(PII_TAG.findall(request_text)))
+        if pii:
+            factors.append("personal_data:" + ",".join(pii))
+            score += 0.15
+
+        if any(POLICY_RESTRICTION.search(policy) for policy in policy_context):
+            factors.append("policy_restriction")
+            score += 0.3
+
+        if not policy_context:
+            # Nothing to ground a decision in
+            factors.append("no_policy_grounding")
+            score += 0.2
+
+        score = round(min(score, 1.0), 2)
+        level = next(label for threshold, label in RISK_LEVELS if score >= threshold)
+
+        return {
+            "risk_level": level,
+            "score": score,
+            "factors": factors,
+            "requires_human_review": level != "LOW",
+        }
+
+    def fallback_decision(self, reason):
+        # If the assessment is unavailable, assume the worst
+        return {
+            "risk_level": "UNKNOWN",
+            "score": None,
+            "factors": [],
+            "requires_human_review": True,
+            "reason": reason,
+        }
+
+
+# --- Self-Test Block ---
+if __name__ == "__main__":
+    agent = RiskAgent()
+    print(agent.evaluate(
+        request_text="My name is <PERSON>. Can the city use facial recognition on my street?",
+        policy_context=["Real-time remote biometric identification in public spaces is prohibited."],
+    ))
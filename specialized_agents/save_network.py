@@ -5,16 +5,23 @@
 Generate an interactive HTML network graph using PyVis.
 """
 
+import os
+import sys
 import numpy as np
 import pandas as pd
 import networkx as nx
 from pyvis.network import Network
 
+# Add parent directory to path so we can import our other modules
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data_governance.table_store import read_table
+
 
 def write_to_html():
 
-    # Load the Excel file from project root
-    data = pd.read_excel('data/processed/search_results_processed_concepts_v3.xlsx')
+    # Load the concepts table from project root
+    data = read_table('search_results_concepts', columns=['concepts'])
 
     # Prepare concept lists
     ls = [x for x in data.concepts.tolist() if str(x) != 'nan']
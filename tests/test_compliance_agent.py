@@ -0,0 +1,28 @@
+import os
+import sys
+from types import SimpleNamespace
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from specialized_agents.compliance_agent import ComplianceAgent
+from specialized_agents.eligibility_rules import RuleIndex, extract_rules
+
+RULES_V1 = {"housing.pdf": extract_rules("- Annual family income must be less than $45,000.\n")}
+RULES_V2 = {"housing.pdf": extract_rules("- Annual family income must be less than $20,000.\n")}
+
+
+def test_rules_follow_the_served_knowledge_base_version(tmp_path):
+    kb = SimpleNamespace(rule_index=RuleIndex(RULES_V1))
+    agent = ComplianceAgent(rule_index_path=str(tmp_path / "missing.json"), knowledge_base=kb)
+    request = "My annual income is $30,000."
+
+    assert agent.evaluate(request, ["..."], ["housing.pdf"])["status"] == "LIKELY_ELIGIBLE"
+
+    kb.rule_index = RuleIndex(RULES_V2)   # what PolicyKnowledgeBase._switch_version does
+    assert agent.evaluate(request, ["..."], ["housing.pdf"])["status"] == "NOT_ELIGIBLE"
+
+
+def test_unversioned_knowledge_base_uses_the_rule_index_file(tmp_path):
+    agent = ComplianceAgent(rule_index_path=str(tmp_path / "missing.json"),
+                            knowledge_base=SimpleNamespace(rule_index=None))
+    assert len(agent.current_rule_index()) == 0
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from knowledge_base.compressed_vectors import PQIndex
+
+
+def test_pq_builds_on_a_corpus_smaller_than_the_codebook():
+    rng = np.random.default_rng(0)
+    vectors = rng.normal(size=(40, 384)).astype(np.float32)
+    vectors /= np.linalg.norm(vectors, axis=1, keepdims=True)
+
+    index = PQIndex.build(vectors)
+
+    assert index.codebooks.shape == (96, 40, 4)
+    scores = index.scores(vectors[:5])
+    assert scores.shape == (5, 40)
+    assert list(scores.argmax(axis=1)) == [0, 1, 2, 3, 4]
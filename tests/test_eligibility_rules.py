@@ -0,0 +1,45 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from specialized_agents.eligibility_rules import RuleIndex, extract_facts, extract_rules
+
+HOUSING_RULES = extract_rules(
+    "- The applicant must be a resident of the state for at least 3 years.\n"
+    "- Annual family income must be less than $45,000.\n"
+)
+
+
+def test_age_and_year_are_not_read_as_residency_or_income():
+    facts = extract_facts("I am 35 years old and a resident here. My income in 2024 was $60,000")
+    assert facts == {"income": 60000.0}
+
+
+def test_duration_is_not_read_as_income_or_residency():
+    assert extract_facts("I learned about this 3 years ago and want to know if I can apply for a subsidy.") == {}
+    assert extract_facts("I learned about this 3 years ago and have lived here since.") == {}
+
+
+def test_stated_facts_are_extracted():
+    facts = extract_facts("I earn $38,000 a year and have lived here for 5 years.")
+    assert facts == {"income": 38000.0, "residency_years": 5}
+    assert extract_facts("My salary is 3.5 lakh")["income"] == 350000.0
+
+
+def test_misread_sentence_does_not_claim_eligibility():
+    index = RuleIndex({"housing.pdf": HOUSING_RULES})
+    decision = index.evaluate(["housing.pdf"], extract_facts(
+        "I am 35 years old and a resident here. My income in 2024 was $60,000"))
+    assert decision["status"] == "NOT_ELIGIBLE"
+
+    decision = index.evaluate(["housing.pdf"], extract_facts(
+        "I learned about this 3 years ago and want to know if I can apply."))
+    assert decision["status"] == "NEEDS_INFORMATION"
+
+
+def test_conflicting_candidates_go_to_the_slow_path():
+    facts = extract_facts("I earn $30,000 from my job and my wife earns $20,000. I have lived here 6 years.")
+    assert facts["ambiguous"] == ["income"]
+    assert "income" not in facts
+    assert RuleIndex({"housing.pdf": HOUSING_RULES}).evaluate(["housing.pdf"], facts) is None
@@ -0,0 +1,42 @@
+import os
+import sys
+import threading
+
+import numpy as np
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+chromadb = pytest.importorskip("chromadb")
+
+from knowledge_base.embedding_snapshot import EmbeddingSnapshot, export_snapshot, COLLECTION_NAME
+
+
+def test_readers_always_find_a_snapshot_during_re_export(tmp_path):
+    db_path, snapshot_dir = str(tmp_path / "db"), str(tmp_path / "snapshots" / "policy_embeddings")
+    collection = chromadb.PersistentClient(path=db_path).create_collection(COLLECTION_NAME, embedding_function=None)
+    vectors = np.random.default_rng(0).normal(size=(50, 16)).astype(np.float32)
+    collection.add(ids=[str(i) for i in range(50)], embeddings=vectors.tolist(),
+                   documents=[f"chunk {i}" for i in range(50)], metadatas=[{"source": "a.pdf"}] * 50)
+    export_snapshot(db_path, COLLECTION_NAME, snapshot_dir, compressions=[])
+
+    errors, stop = [], threading.Event()
+
+    def read():
+        while not stop.is_set():
+            try:
+                assert len(EmbeddingSnapshot(snapshot_dir)) == 50
+            except Exception as e:
+                errors.append(e)
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    for _ in range(5):
+        export_snapshot(db_path, COLLECTION_NAME, snapshot_dir, compressions=[])
+    stop.set()
+    reader.join()
+
+    assert errors == []
+    assert os.path.islink(snapshot_dir)
+    # Current and previous export are kept, older ones collected
+    assert len([name for name in os.listdir(tmp_path / "snapshots") if not name.startswith(".")]) == 3
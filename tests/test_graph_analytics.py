@@ -0,0 +1,43 @@
+import os
+import sys
+
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from specialized_agents.graph_analytics import update_cooccurrence
+
+
+def empty_state():
+    return {'documents': {}, 'nodes': {}, 'edges': {}}
+
+
+def counts_from_scratch(data):
+    state = empty_state()
+    update_cooccurrence(state, data)
+    return state['nodes'], state['edges']
+
+
+def test_changed_and_removed_documents_are_subtracted():
+    before = pd.DataFrame({'title': ['A', 'B', 'C'],
+                           'concepts': ['housing, income', 'income, tax', 'tax, housing']})
+    after = pd.DataFrame({'title': ['A', 'B', 'D'],
+                          'concepts': ['housing, subsidy', 'income, tax', 'subsidy, tax']})
+    state = empty_state()
+    update_cooccurrence(state, before)
+
+    changes = update_cooccurrence(state, after)
+
+    assert changes == {'added': 1, 'changed': 1, 'removed': 1}
+    assert (state['nodes'], state['edges']) == counts_from_scratch(after)
+    assert 'housing\tincome' not in state['edges']
+
+
+def test_duplicate_titles_are_separate_documents():
+    data = pd.DataFrame({'title': ['Report', 'Report'], 'concepts': ['a, b', 'a, b']})
+    state = empty_state()
+    update_cooccurrence(state, data)
+    assert state['edges'] == {'a\tb': 2}
+
+    assert update_cooccurrence(state, data.iloc[:1]) == {'added': 0, 'changed': 0, 'removed': 1}
+    assert state['edges'] == {'a\tb': 1}
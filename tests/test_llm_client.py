@@ -0,0 +1,41 @@
+import os
+import sys
+
+import pytest
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent_orchestrator.llm_client import LLMClient
+
+LLM_VARS = ("LLM_BASE_URL", "LLM_BACKEND", "LLM_PROVIDER", "LLM_MODEL", "LLM_API_KEY", "OPENAI_API_KEY")
+
+
+@pytest.fixture(autouse=True)
+def clean_env(monkeypatch):
+    for name in LLM_VARS:
+        monkeypatch.delenv(name, raising=False)
+
+
+def test_openai_key_alone_does_not_enable_openai(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    assert LLMClient.from_env() is None
+
+
+def test_explicit_openai_backend_uses_openai_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("LLM_PROVIDER", "openai")
+    client = LLMClient.from_env()
+    assert client.base_url == "https://api.openai.com"
+    assert client.session.headers["Authorization"] == "Bearer sk-test"
+
+
+def test_custom_base_url_never_gets_openai_key(monkeypatch):
+    monkeypatch.setenv("OPENAI_API_KEY", "sk-test")
+    monkeypatch.setenv("LLM_BACKEND", "openai")
+    monkeypatch.setenv("LLM_BASE_URL", "http://localhost:11434")
+    client = LLMClient.from_env()
+    assert client.base_url == "http://localhost:11434"
+    assert "Authorization" not in client.session.headers
+
+    monkeypatch.setenv("LLM_API_KEY", "local-key")
+    assert LLMClient.from_env().session.headers["Authorization"] == "Bearer local-key"
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import numpy as np
+import pandas as pd
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from specialized_agents.make_keywords import count_concepts, count_concepts_loop
+
+
+def test_count_concepts_matches_loop_on_edge_cases():
+    concepts = pd.Series([
+        'AI, ethics, AI',           # repeated within one row
+        'ai ,  Ethics',             # case and whitespace differences
+        'A.I., e-government,,',     # punctuation and empty terms
+        np.nan,
+        '',
+        'policy',
+        'policy, AI',
+    ], dtype=object)
+
+    expected = count_concepts_loop(concepts)
+    result = count_concepts(concepts)
+
+    assert result.index.tolist() == expected.index.tolist()
+    assert result.tolist() == expected.tolist()
+
+
+def test_count_concepts_keeps_first_seen_order_for_ties_and_top():
+    concepts = pd.Series(['b, a', 'c, a', 'b, c'], dtype=object)
+    assert count_concepts(concepts, top=2).index.tolist() == count_concepts_loop(concepts, top=2).index.tolist()
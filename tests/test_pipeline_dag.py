@@ -0,0 +1,60 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from agent_orchestrator.pipeline_dag import PipelineRunner, Stage, code_digest
+
+
+def write(path, text):
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    with open(path, "w") as f:
+        f.write(text)
+
+
+def test_code_digest_follows_local_imports(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    write("pkg/__init__.py", "")
+    write("pkg/helpers.py", "THRESHOLD = 1\n")
+    write("pkg/deep.py", "from pkg.helpers import THRESHOLD\n")
+    write("scripts/stage.py", "import json\n\ndef main():\n    from pkg import deep\n")
+
+    before = code_digest("scripts/stage.py")
+    write("pkg/helpers.py", "THRESHOLD = 2\n")
+    assert code_digest("scripts/stage.py") != before
+
+
+def test_stage_args_reach_only_their_script(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    script = "import sys, json\njson.dump(sys.argv[1:], open(sys.argv[0] + '.argv', 'w'))\n"
+    write("a.py", script)
+    write("b.py", script)
+    write("c.py", script)
+    stages = [Stage("a", "a.py", args=["--first"]), Stage("b", "b.py", args=["--second", "x"]),
+              Stage("c", "c.py")]
+    runner = PipelineRunner(stages, cache_file=str(tmp_path / "cache.json"),
+                            report_file=str(tmp_path / "report.json"), max_workers=3)
+    argv = list(sys.argv)
+    report = runner.run()
+
+    assert report["success"], report
+    assert sys.argv == argv
+    read = lambda name: open(f"{name}.py.argv").read()
+    assert (read("a"), read("b"), read("c")) == ('["--first"]', '["--second", "x"]', "[]")
+
+
+def test_parallel_script_stages_keep_main_module(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    script = ("import sys, time\nstart = time.time()\ntime.sleep(0.5)\n"
+              "open(sys.argv[0] + '.times', 'w').write(f'{start} {time.time()}')\n")
+    write("a.py", script)
+    write("b.py", script)
+    runner = PipelineRunner([Stage("a", "a.py"), Stage("b", "b.py")], cache_file=str(tmp_path / "cache.json"),
+                            report_file=str(tmp_path / "report.json"), max_workers=2)
+    main = sys.modules["__main__"]
+    report = runner.run()
+
+    assert report["success"], report
+    assert sys.modules["__main__"] is main
+    (a_start, a_end), (b_start, b_end) = (map(float, open(f"{name}.py.times").read().split()) for name in "ab")
+    assert a_start < b_end and b_start < a_end   # the two stages overlapped
@@ -0,0 +1,63 @@
+import os
+import socket
+import subprocess
+import sys
+import time
+
+import pandas as pd
+import requests
+
+ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
+sys.path.append(ROOT)
+
+from knowledge_base.mock_serpapi_server import RESULTS_PER_QUERY, SHARED_TITLES
+from knowledge_base.scrape_google_scholar import ScholarScraper
+
+
+def free_port():
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def start_server(port):
+    process = subprocess.Popen([sys.executable, os.path.join(ROOT, "knowledge_base", "mock_serpapi_server.py"), str(port)],
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    base_url = f"http://127.0.0.1:{port}"
+    for _ in range(100):
+        try:
+            requests.get(f"{base_url}/search.json", timeout=1)
+            return process, base_url
+        except requests.ConnectionError:
+            time.sleep(0.1)
+    process.kill()
+    raise RuntimeError("mock SerpApi server did not start")
+
+
+def test_rerun_hits_cache_and_duplicates_are_dropped(tmp_path):
+    process, base_url = start_server(free_port())
+    queries = ["ai governance", "public sector ai"]
+    pages = range(1, 4)  # 3 x 20 covers every result of each query
+    output_file = str(tmp_path / "results.csv")
+
+    def scrape():
+        scraper = ScholarScraper("mock-key", base_url=base_url, cache_dir=str(tmp_path / "cache"),
+                                 rate=50, burst=10, results_per_page=20)
+        added = scraper.scrape(queries, pages, output_file)
+        return scraper.stats, added
+
+    try:
+        cold, added = scrape()
+        rerun, readded = scrape()
+    finally:
+        process.kill()
+        process.wait()
+
+    assert cold == {"api_calls": 6, "cache_hits": 0, "errors": 0}
+    assert rerun == {"api_calls": 0, "cache_hits": 6, "errors": 0}
+
+    # Every query returns the shared titles; each is kept once
+    rows = pd.read_csv(output_file)
+    assert added == len(rows) == len(queries) * RESULTS_PER_QUERY - len(SHARED_TITLES)
+    assert rows["link"].is_unique
+    assert readded == 0
@@ -0,0 +1,32 @@
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from knowledge_base.sharded_store import ShardedKnowledgeBase
+
+
+def test_concurrent_queries_get_their_own_complete_answers():
+    vectors = np.random.default_rng(0).normal(size=(400, 16)).astype(np.float32)
+    ids = [f"c{i}" for i in range(len(vectors))]
+    store = ShardedKnowledgeBase(n_shards=4, backend="memory", timeout=30)
+    try:
+        store.add_chunks(ids, [""] * len(ids), [{"source": f"doc{i}.pdf"} for i in range(len(ids))],
+                         embeddings=vectors)
+
+        def query(i):
+            result = store.query_embeddings(vectors[i], n_results=3)
+            return i, result["ids"][0], result["missing_shards"]
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            answers = list(pool.map(query, [i % len(ids) for i in range(240)]))
+    finally:
+        store.close()
+
+    for i, found, missing in answers:
+        assert missing == []
+        assert len(found) == 3
+        assert found[0] == ids[i]
@@ -0,0 +1,21 @@
+import os
+import sys
+
+import pandas as pd
+import pyarrow as pa
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from data_governance.table_store import read_table, write_table
+
+
+def test_read_table_returns_arrow_or_pandas(tmp_path):
+    df = pd.DataFrame({'title': ['a', 'b'], 'concepts': ['x, y', None]})
+    write_table(df, 'search_results_concepts', str(tmp_path))
+
+    table = read_table('search_results_concepts', str(tmp_path), columns=['concepts'], as_pandas=False)
+    assert isinstance(table, pa.Table)
+    assert table.column('concepts').to_pylist() == ['x, y', None]
+
+    frame = read_table('search_results_concepts', str(tmp_path))
+    assert frame['title'].tolist() == ['a', 'b']
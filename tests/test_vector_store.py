@@ -0,0 +1,21 @@
+import os
+import sys
+
+sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
+
+from knowledge_base.vector_store import hnsw_metadata, stale_hnsw_settings
+
+
+def test_missing_metadata_counts_as_chroma_defaults():
+    assert stale_hnsw_settings(None, hnsw_metadata()) == {}
+    assert stale_hnsw_settings(None, hnsw_metadata({"M": 32, "space": "cosine"})) == {"hnsw:M": 16, "hnsw:space": "l2"}
+
+
+def test_missing_keys_compare_against_defaults():
+    existing = {"hnsw:space": "cosine"}
+    assert stale_hnsw_settings(existing, hnsw_metadata({"space": "cosine", "search_ef": 50})) == {"hnsw:search_ef": 10}
+
+
+def test_matching_collection_is_not_stale():
+    config = {"space": "ip", "M": 32, "construction_ef": 200, "search_ef": 100}
+    assert stale_hnsw_settings(hnsw_metadata(config), hnsw_metadata(config)) == {}